@@ -1,54 +1,948 @@
 #!/usr/bin/env python3
 
-import curses as cu
-import tkinter as tk
 import sys
+import re
 import math
 import time
+import queue
+import threading
+import os
+import marshal
+import bisect
+import string
+import importlib
+from array import array
+from collections import namedtuple
+from itertools import islice, groupby
+from operator import itemgetter
+
+# Backends and the heavier modules are imported on first use, see ezUI.require: a TUI
+# process never loads Tk, building or loading trees loads neither backend.
+cu = None          # curses
+tk = None          # tkinter
+asyncio = None
+inspect = None
+futures = None     # concurrent.futures
+ET = None          # xml.etree.ElementTree
+hashlib = None
+zlib = None
+socket = None
+select = None
+pickle = None
 
 class ezUI:
-    VERSION = "0.0.6"
+    VERSION = "0.0.7"
     # Mode constants for GUI and TUI
     class mode:
         GUI = 0
         TUI = 1
 
-    # Virtual DOM element node
+    MODULES = {"cu": "curses", "tk": "tkinter", "asyncio": "asyncio", "inspect": "inspect",
+               "futures": "concurrent.futures", "ET": "xml.etree.ElementTree", "hashlib": "hashlib",
+               "zlib": "zlib", "socket": "socket", "select": "select",
+               "pickle": "pickle"}
+
+    @staticmethod
+    def require(*names):
+        # Import the lazily loaded modules named (module globals above). curses stays None
+        # where it isn't available (Windows without windows-curses), start_ui reports that.
+        module_globals = globals()
+        for name in names:
+            if module_globals[name] is None:
+                try:
+                    module_globals[name] = importlib.import_module(ezUI.MODULES[name])
+                except ImportError:
+                    if name != "cu":
+                        raise
+
+    # Attribute dict that tells its element when a value changes
+    class Attributes(dict):
+        __slots__ = ("owner",)
+
+        def __init__(self, owner, values=None):
+            super().__init__(values or {})
+            self.owner = owner
+
+        def __setitem__(self, key, value):
+            had, old = key in self, self.get(key)
+            if had and old == value and type(old) is type(value):
+                return  # no-op, nothing to reparse or tell listeners
+            super().__setitem__(key, value)
+            try:
+                self.owner._attribute_changed(key, old)
+            except ValueError:
+                # keep the element consistent, bad values never land
+                if had:
+                    super().__setitem__(key, old)
+                else:
+                    super().__delitem__(key)
+                raise
+
+        def __delitem__(self, key):
+            old = self[key]
+            super().__delitem__(key)
+            self.owner._attribute_changed(key, old)
+
+        def pop(self, key, *default):
+            had = key in self
+            value = super().pop(key, *default)
+            if had:
+                self.owner._attribute_changed(key, value)
+            return value
+
+        def setdefault(self, key, default=None):
+            if key not in self:
+                self[key] = default
+            return self[key]
+
+        def update(self, *args, **kwargs):
+            for key, value in dict(*args, **kwargs).items():
+                self[key] = value
+
+        def clear(self):
+            old = dict(self)
+            super().clear()
+            for key, value in old.items():
+                self.owner._attribute_changed(key, value)
+
+    # Compiled ezBind="(key)" accessor, shared by GUI and TUI
+    class Binding:
+        LIMIT = 1024    # compiled bindings kept
+        _compiled = {}  # (ezBind, ezFormat) -> Binding, least recently used first. Bindings are immutable so they are shared
+        _lock = threading.Lock()
+
+        def __init__(self, source, fmt=None):
+            self.source = source
+            self.key = source.strip("()")
+            self.fmt = fmt
+
+        @classmethod
+        def compile(cls, source, fmt=None):
+            key = (source, fmt)
+            with cls._lock:
+                binding = cls._compiled.pop(key, None)
+                if binding is None:
+                    binding = cls(source, fmt)
+                    while len(cls._compiled) >= cls.LIMIT:
+                        del cls._compiled[next(iter(cls._compiled))]
+                cls._compiled[key] = binding  # now the most recent
+            return binding
+
+        def __bool__(self):
+            return self.key != ""
+
+        def get(self, data, default=None):
+            return data.get(self.key, default)
+
+        def set(self, data, value):
+            data.update(self.key, value)
+
+        def format(self, value):
+            if self.fmt:
+                return self.fmt.format(value)
+            return "" if value is None else str(value)
+
+        def text(self, data, default=""):
+            return self.format(data.get(self.key, default))
+
+    # Typed attributes, parsed once per element instead of on every frame
+    class Schema:
+        # Parsed values shared by every tag. None means "not set" for the optional numbers,
+        # border is None when unset because GUI and TUI use different defaults.
+        Props = namedtuple("Props", [
+            "width", "height", "x", "y", "padx", "pady", "side", "visibility",
+            "background", "foreground", "bg_rgb", "fg_rgb",
+            "border", "overflow", "scroll_left", "scroll_top", "modal", "debounce", "prebuild", "pixels",
+            "chart_min", "chart_max", "points",
+        ])
+
+        # Parsers, plain functions used while building the tables below
+        def _int(value):
+            return int(value)
+
+        def _choice(*allowed):
+            def parse(value):
+                value = str(value).lower()
+                if value not in allowed:
+                    raise ValueError("expected one of {}".format(", ".join(allowed)))
+                return value
+            return parse
+
+        def _bool(value):
+            return str(value).lower() != "false"
+
+        def _float(value):
+            return float(value)
+
+        # attribute -> (field, parser)
+        COMMON = {
+            "width": ("width", _int),
+            "height": ("height", _int),
+            "x": ("x", _int),
+            "y": ("y", _int),
+            "padx": ("padx", _int),
+            "pady": ("pady", _int),
+            "pack": ("side", _choice("top", "bottom", "left", "right")),
+            "visibility": ("visibility", _choice("visible", "hidden", "collapsed")),
+            "ezPrebuild": ("prebuild", _bool),
+        }
+        FRAME = {
+            "border": ("border", _bool),
+            "overflow": ("overflow", _choice("visible", "hidden")),
+            "scrollLeft": ("scroll_left", _int),
+            "scrollTop": ("scroll_top", _int),
+            "ezModal": ("modal", _choice("none", "clear", "opaque")),
+        }
+        TEXTBOX = {
+            "ezDebounce": ("debounce", _int),
+        }
+        CANVAS = {
+            "ezPixels": ("pixels", _choice("half", "braille")),  # TUI pixels per cell: 1x2 or 2x4
+        }
+        CHART = {
+            "ezMin": ("chart_min", _float),  # fixed value range, by default the shown samples'
+            "ezMax": ("chart_max", _float),
+            "ezPoints": ("points", _int),    # show the newest n samples only
+        }
+        TAGS = {
+            "frame": dict(COMMON, **FRAME),
+            "textbox": dict(COMMON, **TEXTBOX),
+            "canvas": dict(COMMON, **CANVAS),
+            "image": dict(COMMON, **CANVAS),
+            "chart": dict(COMMON, **CANVAS, **CHART),
+        }
+        COLORS = ("background", "bg", "foreground", "fg")
+        DEFAULTS = Props(
+            width=None, height=None, x=None, y=None, padx=0, pady=0, side="top", visibility="visible",
+            background=None, foreground=None, bg_rgb=None, fg_rgb=None,
+            border=None, overflow="visible", scroll_left=0, scroll_top=0, modal="none", debounce=None,
+            prebuild=False, pixels="half", chart_min=None, chart_max=None, points=None,
+        )
+        KEYS = set(COMMON) | set(FRAME) | set(TEXTBOX) | set(CANVAS) | set(CHART) | set(COLORS)  # attributes that need a re-parse when changed
+
+        LIMIT = 4096  # Props kept
+        _cache = {}   # identical attribute sets share one Props, least recently used first
+        _lock = threading.Lock()
+
+        @staticmethod
+        def hex_to_rgb(value):
+            if isinstance(value, str) and value.startswith("#") and len(value) == 7:
+                try:
+                    return (int(value[1:3], 16), int(value[3:5], 16), int(value[5:7], 16))
+                except ValueError:
+                    pass
+            return None  # named colors are left to tkinter, TUI falls back to its default
+
+        @classmethod
+        def parse(cls, tag, attributes):
+            fields = cls.TAGS.get(tag, cls.COMMON)
+            keys = cls.KEYS
+            relevant = tuple((name, value) for name, value in attributes.items() if name in keys)
+            try:
+                key = (tag, relevant)
+                with cls._lock:
+                    props = cls._cache.pop(key, None)
+                    if props is not None:
+                        cls._cache[key] = props  # now the most recent
+                        return props
+            except TypeError:
+                key = None  # unhashable values, parse without caching
+
+            values = {}
+            for name, value in relevant:
+                if name not in fields:
+                    continue
+                field, parser = fields[name]
+                try:
+                    values[field] = parser(value)
+                except (TypeError, ValueError) as e:
+                    raise ValueError("<{} name={!r}> bad {}={!r}: {}".format(
+                        tag, attributes.get("name"), name, value, e)) from None
+
+            background = attributes.get("background") or attributes.get("bg")
+            foreground = attributes.get("foreground") or attributes.get("fg")
+            if background or foreground:
+                values.update(background=background, foreground=foreground,
+                              bg_rgb=cls.hex_to_rgb(background), fg_rgb=cls.hex_to_rgb(foreground))
+
+            props = cls.DEFAULTS._replace(**values) if values else cls.DEFAULTS
+            if key is not None:
+                with cls._lock:
+                    cls._cache[key] = props
+                    while len(cls._cache) > cls.LIMIT:
+                        del cls._cache[next(iter(cls._cache))]
+            return props
+
+    # Virtual DOM element node. Slotted and lazy so trees of 100k+ elements stay small:
+    # tags are lowercased and interned, attribute storage and the child list are only
+    # created when something is put in them, and identical attribute sets share one props.
     class Element:
+        __slots__ = ("tag", "tag_id", "_attributes", "props", "_binding", "parent", "canvas",
+                     "_children", "widget", "_var", "x", "y", "width", "height", "_tree", "_scene")
+
+        TAG_IDS = {}  # interned tag -> small int
+        TAGS = []     # tag id -> interned tag
+        _EMPTY = ()   # shared children of every leaf
+
+        @classmethod
+        def intern_tag(cls, tag):
+            tag = sys.intern(tag.lower())
+            if tag not in cls.TAG_IDS:
+                cls.TAG_IDS[tag] = len(cls.TAGS)
+                cls.TAGS.append(tag)
+            return tag
+
         def __init__(self, tag, attributes=None, parent=None, canvas=None):
-            self.tag = tag
-            self.attributes = attributes or {}
-            self.visibility = (attributes or {}).get("visibility", "visible").lower()
-            self.size = {
-            "width": int(attributes.get("width", -1)) if attributes and "width" in attributes else -1,
-            "height": int(attributes.get("height", -1)) if attributes and "height" in attributes else -1,
-        }
+            self.tag = tag = ezUI.Element.intern_tag(tag)
+            self.tag_id = ezUI.Element.TAG_IDS[tag]
+            self._binding = None  # compiled from ezBind on first use
+            if attributes:
+                self.attributes = attributes  # parsed into self.props, raises ValueError on bad values
+            else:
+                self._attributes = None
+                self.props = ezUI.Schema.DEFAULTS
             self.parent = parent
             self.canvas = canvas
-            self.children = []
+            self._children = None
             self.widget = None
             self._var = None  # Holds StringVar if bound
-            self.layout = {
-                "side": (attributes or {}).get("pack", "top").lower(),
-                "padx": int(attributes.get("padx", 0)) if attributes else 0,
-                "pady": int(attributes.get("pady", 0)) if attributes else 0,
+            self.x = self.y = self.width = self.height = None  # set by the TUI layout
+            self._tree = None  # ezUI.Tree this element is indexed in, if any
+            self._scene = None  # ezUI.Scene of a canvas element, made on first use
+
+        @property
+        def attributes(self):
+            if self._attributes is None:
+                self._attributes = ezUI.Attributes(self)
+            return self._attributes
+
+        @attributes.setter
+        def attributes(self, values):
+            attributes = ezUI.Attributes(self, values)
+            self.props = ezUI.Schema.parse(self.tag, attributes)
+            self._attributes = attributes
+            self._binding = None
+
+        def attr_items(self):
+            return self._attributes.items() if self._attributes is not None else ()
+
+        def attr(self, name, default=None):
+            # Read an attribute without creating storage for attribute-less elements
+            attributes = self._attributes
+            if attributes is None:
+                return default
+            return attributes.get(name, default)
+
+        @property
+        def children(self):
+            return self._children if self._children is not None else ezUI.Element._EMPTY
+
+        @property
+        def scene(self):
+            # Retained items drawn by a canvas element, see ezUI.Scene
+            if self._scene is None:
+                self._scene = ezUI.Scene()
+            return self._scene
+
+        @property
+        def visibility(self):
+            return self.props.visibility
+
+        @visibility.setter
+        def visibility(self, value):
+            self.attributes["visibility"] = value
+
+        @property
+        def size(self):
+            props = self.props
+            return {
+                "width": props.width if props.width is not None else -1,
+                "height": props.height if props.height is not None else -1,
             }
 
+        @property
+        def layout(self):
+            props = self.props
+            return {"side": props.side, "padx": props.padx, "pady": props.pady}
+
+        def invalidate(self):
+            # Re-parse after changing attributes behind our back (dict.__setitem__ etc.)
+            self.props = ezUI.Schema.parse(self.tag, self._attributes or {})
+            self._binding = None
+
+        @property
+        def binding(self):
+            # Empty binding (falsy, key "") when there is no ezBind
+            if self._binding is None:
+                self._binding = ezUI.Binding.compile(self.attr("ezBind", ""), self.attr("ezFormat"))
+            return self._binding
+
+        def _attribute_changed(self, key, old=None):
+            if key in ezUI.Schema.KEYS:
+                self.props = ezUI.Schema.parse(self.tag, self._attributes)
+            if key in ("ezBind", "ezFormat"):
+                self._binding = None
+            if self._tree is not None:
+                self._tree.attribute_changed(self, key, old)
+
+        def __repr__(self):
+            name = self.attr("name")
+            return "<{} name={!r}>".format(self.tag, name) if name else "<{}>".format(self.tag)
+
+        # Tree mutation. Inside a live tree each call emits a change event so the
+        # backends can update just the affected widgets / layout.
         def add_child(self, child):
+            self.insert_child(len(self.children), child)
+
+        def insert_child(self, index, child):
+            if child.parent is not None and child in child.parent.children:
+                child.parent.remove_child(child)
             child.parent = self
-            self.children.append(child)
+            if self._children is None:
+                self._children = []
+            self._children.insert(index, child)
+            if self._tree is not None:
+                self._tree.attach(child)
+                self._tree.emit("insert", self, child)
+
+        def remove_child(self, child):
+            self._take_child(child)
+            child.parent = None
+            if child._tree is not None:
+                tree = child._tree
+                tree.detach(child)
+                tree.emit("remove", self, child)
+
+        def move_child(self, child, index):
+            self._take_child(child)
+            self._children.insert(index, child)
+            if self._tree is not None:
+                self._tree.version += 1
+                self._tree.emit("move", self, child)
+
+        def _take_child(self, child):
+            # Out of the child list, same error whether there is no list yet or child isn't in it
+            try:
+                self._children.remove(child)
+            except (AttributeError, ValueError):
+                raise ValueError("{!r} is not a child of {!r}".format(child, self)) from None
+
+        def replace(self, element):
+            # Put element where this one is, returns the index it went to
+            parent = self.parent
+            index = parent.children.index(self)
+            parent.remove_child(self)
+            parent.insert_child(index, element)
+            return index
+
+        def set(self, name, value):
+            self.attributes[name] = value
+
+        def set_attributes(self, **values):
+            self.attributes.update(values)
+
+        def remove_attribute(self, name):
+            self.attributes.pop(name, None)
+
+    # Live index of an element tree: name, tag and class lookups kept up to date as the
+    # tree changes, plus a cache of query() results keyed on version counters.
+    class Tree:
+        # compound selector: tag, #name, .class, [attr] or [attr=value], e.g. "frame.panel button[text=OK]"
+        _TOKEN = re.compile(r"([#.]?)([\w-]+)|\[([\w-]+)(?:=([^\]]*))?\]|(\*)")
+
+        def __init__(self, root):
+            self.root = root
+            self.version = 0       # bumped when elements, names or classes change
+            self.attr_version = 0  # bumped on any attribute change
+            self.names = {}        # name -> element
+            self.tags = {}         # tag -> {element: None}, dicts keep insertion order
+            self.classes = {}      # class -> {element: None}
+            self._queries = {}     # selector -> (versions, result)
+            self._selectors = {}   # selector -> parsed form
+            self.listeners = []    # fn(event, element, detail) for "insert", "remove", "move", "attribute"
+            self.attach(root)
+
+        def subscribe(self, listener):
+            self.listeners.append(listener)
+
+        def unsubscribe(self, listener):
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+        def emit(self, event, element, detail):
+            # insert/remove/move: element is the parent, detail the child. attribute: detail is the key.
+            for listener in list(self.listeners):
+                listener(event, element, detail)
+
+        @staticmethod
+        def _walk(element):
+            stack = [element]
+            while stack:
+                el = stack.pop()
+                yield el
+                stack.extend(reversed(el.children))
+
+        def attach(self, element):
+            for el in self._walk(element):
+                el._tree = self
+                self.tags.setdefault(el.tag, {})[el] = None
+                name = el.attr("name")
+                if name:
+                    self.names[name] = el
+                for cls in str(el.attr("class", "")).split():
+                    self.classes.setdefault(cls, {})[el] = None
+            self.version += 1
+
+        def detach(self, element):
+            for el in self._walk(element):
+                el._tree = None
+                self.tags.get(el.tag, {}).pop(el, None)
+                name = el.attr("name")
+                if name and self.names.get(name) is el:
+                    del self.names[name]
+                for cls in str(el.attr("class", "")).split():
+                    self.classes.get(cls, {}).pop(el, None)
+            self.version += 1
+
+        def attribute_changed(self, element, key, old):
+            self.attr_version += 1
+            if key == "name":
+                if old and self.names.get(old) is element:
+                    del self.names[old]
+                name = element.attr("name")
+                if name:
+                    self.names[name] = element
+                self.version += 1
+            elif key == "class":
+                for cls in str(old or "").split():
+                    self.classes.get(cls, {}).pop(element, None)
+                for cls in str(element.attr("class", "")).split():
+                    self.classes.setdefault(cls, {})[element] = None
+                self.version += 1
+            self.emit("attribute", element, key)
+
+        def _parse(self, selector):
+            parsed = self._selectors.get(selector)
+            if parsed is None:
+                parsed = []
+                for part in selector.split():
+                    compound = {"tag": None, "name": None, "classes": [], "attrs": []}
+                    pos = 0
+                    while pos < len(part):
+                        m = self._TOKEN.match(part, pos)
+                        if not m:
+                            raise ValueError("Bad selector: {!r}".format(selector))
+                        prefix, word, attr, value, star = m.groups()
+                        if attr:
+                            compound["attrs"].append((attr, value))
+                        elif prefix == "#":
+                            compound["name"] = word
+                        elif prefix == ".":
+                            compound["classes"].append(word)
+                        elif word:
+                            compound["tag"] = word.lower()
+                        pos = m.end()
+                    parsed.append(compound)
+                self._selectors[selector] = parsed
+            return parsed
+
+        @staticmethod
+        def _matches(el, compound):
+            if compound["tag"] and el.tag != compound["tag"]:
+                return False
+            if compound["name"] and el.attr("name") != compound["name"]:
+                return False
+            if compound["classes"]:
+                classes = str(el.attr("class", "")).split()
+                if any(cls not in classes for cls in compound["classes"]):
+                    return False
+            for attr, value in compound["attrs"]:
+                current = el.attr(attr)
+                if current is None or (value is not None and str(current) != value):
+                    return False
+            return True
+
+        def _candidates(self, compound):
+            # start from the smallest index that applies
+            if compound["name"]:
+                el = self.names.get(compound["name"])
+                return [el] if el is not None else []
+            if compound["classes"]:
+                return list(self.classes.get(compound["classes"][0], ()))
+            if compound["tag"]:
+                return list(self.tags.get(compound["tag"], ()))
+            return list(self._walk(self.root))
+
+        @staticmethod
+        def _in_document_order(elements):
+            # Sort by the path of child positions from the root. Each parent's children are
+            # numbered once, so this only touches the parents of the results.
+            positions = {}  # parent -> {child: index}
+
+            def path(el):
+                key = []
+                while el.parent is not None:
+                    parent = el.parent
+                    index = positions.get(parent)
+                    if index is None:
+                        index = positions[parent] = {child: i for i, child in enumerate(parent.children)}
+                    key.append(index[el])
+                    el = parent
+                key.reverse()
+                return key
+            return sorted(elements, key=path)
+
+        def query(self, selector):
+            parsed = self._parse(selector)
+            uses_attrs = any(compound["attrs"] for compound in parsed)
+            versions = (self.version, self.attr_version if uses_attrs else 0)
+            cached = self._queries.get(selector)
+            if cached is not None and cached[0] == versions:
+                return list(cached[1])
+
+            result = []
+            last = parsed[-1]
+            for el in self._candidates(last):
+                if not self._matches(el, last):
+                    continue
+                # descendant combinators, match the remaining compounds up the parent chain
+                ancestor = el.parent
+                remaining = len(parsed) - 2
+                while remaining >= 0 and ancestor is not None:
+                    if self._matches(ancestor, parsed[remaining]):
+                        remaining -= 1
+                    ancestor = ancestor.parent
+                if remaining < 0:
+                    result.append(el)
+            if len(result) > 1 and (last["classes"] or last["tag"]):
+                result = self._in_document_order(result)  # the indexes keep insertion order
+
+            self._queries[selector] = (versions, result)
+            return list(result)
+
+    # Markup loader. A file is parsed once into a flat list of nodes and cached as
+    # __ezcache__/<file>.<hash>.ezc next to it, so later starts skip the XML parser.
+    #   row = ezUI.Template.load("row.ezml")
+    #   for i in range(10000): table.add_child(row.instantiate())
+    class Template:
+        FORMAT = 1  # bump when the cached layout changes
+        MAGIC = "ezUI-template-{}-py{}.{}".format(FORMAT, *sys.version_info[:2])  # marshal is per python version
+        LIMIT = 64    # loaded templates kept
+        _loaded = {}  # file hash -> Template, least recently used first
+        _lock = threading.Lock()
+
+        def __init__(self, nodes):
+            # nodes: (tag, attributes, child count) in document order. Props are parsed
+            # here once, so every instance shares them instead of parsing again.
+            self.nodes = []
+            for tag, attributes, count in nodes:
+                tag = ezUI.Element.intern_tag(tag)
+                self.nodes.append((tag, attributes, ezUI.Schema.parse(tag, attributes), count))
+
+        @staticmethod
+        def compile(text):
+            # XML markup -> [(tag, attributes, child count)]. Text inside a tag becomes its "text".
+            ezUI.require("ET")
+            nodes = []
+
+            def visit(node):
+                attributes = dict(node.attrib)
+                text = (node.text or "").strip()
+                if text and "text" not in attributes:
+                    attributes["text"] = text
+                nodes.append((node.tag, attributes, len(node)))
+                for child in node:
+                    visit(child)
+
+            visit(ET.fromstring(text))
+            return nodes
+
+        @classmethod
+        def from_string(cls, text):
+            return cls(cls.compile(text))
+
+        @classmethod
+        def load(cls, path, cache=True):
+            with open(path, "rb") as f:
+                source = f.read()
+            ezUI.require("hashlib")
+            digest = hashlib.sha1(source).hexdigest()
+            if cache:
+                with cls._lock:
+                    template = cls._loaded.pop(digest, None)
+                    if template is not None:
+                        cls._loaded[digest] = template  # now the most recent
+                        return template
+
+            folder, filename = os.path.split(os.path.abspath(path))
+            cached = os.path.join(folder, "__ezcache__", "{}.{}.ezc".format(filename, digest[:16]))
+            nodes = None
+            if cache:
+                try:
+                    with open(cached, "rb") as f:
+                        magic, nodes = marshal.load(f)
+                    if magic != cls.MAGIC:
+                        nodes = None
+                except (OSError, EOFError, ValueError, TypeError):
+                    nodes = None
+            if nodes is None:
+                nodes = cls.compile(source)
+                if cache:
+                    try:
+                        os.makedirs(os.path.dirname(cached), exist_ok=True)
+                        temp = "{}.{}.tmp".format(cached, os.getpid())
+                        with open(temp, "wb") as f:
+                            marshal.dump((cls.MAGIC, nodes), f)
+                        os.replace(temp, cached)
+                    except OSError:
+                        pass  # read-only install, just parse next time
+            template = cls(nodes)
+            if cache:
+                with cls._lock:
+                    cls._loaded[digest] = template
+                    while len(cls._loaded) > cls.LIMIT:
+                        del cls._loaded[next(iter(cls._loaded))]
+            return template
+
+        def instantiate(self):
+            # Fresh element tree, cheap enough to stamp out thousands of rows
+            Element = ezUI.Element
+            Attributes = ezUI.Attributes
+            root = None
+            stack = []  # [parent, children still to come]
+            for tag, attributes, props, count in self.nodes:
+                element = Element(tag)
+                if attributes:
+                    element._attributes = Attributes(element, attributes)
+                    element.props = props
+                if stack:
+                    top = stack[-1]
+                    parent = top[0]
+                    element.parent = parent
+                    parent._children.append(element)
+                    top[1] -= 1
+                    if top[1] == 0:
+                        stack.pop()
+                else:
+                    root = element
+                if count:
+                    element._children = []
+                    stack.append([element, count])
+            return root
+
+    # ezFor="item in (rows)": the element is a template, one copy of it is kept in the tree for
+    # every item of the rows list. Attributes can use the item with str.format fields, e.g.
+    # text="{item[name]}", and ezKey="{item[id]}" keeps a row's elements (and widgets) when the list
+    # is reordered. Synced once a frame when the rows key changes, see UIApp.update_repeaters.
+    class Repeater:
+        _FOR = re.compile(r"^\s*(\w+)\s+in\s+\(?\s*([^()\s]+?)\s*\)?\s*$")
+        _FIELD_ROOT = re.compile(r"[^.\[]*")  # "item" of "item[name]" or "item.name"
+        POOL = 64  # removed copies kept for reuse
+
+        def __init__(self, app, element):
+            match = ezUI.Repeater._FOR.match(str(element.attr("ezFor")))
+            if not match:
+                raise ValueError("{} bad ezFor={!r}: expected 'item in (key)'".format(element, element.attr("ezFor")))
+            self.app = app
+            self.var, self.key = match.groups()
+            self.parent = parent = element.parent
+            index = parent.children.index(element)
+            self.anchor = parent.children[index - 1] if index else None  # copies go right after this
+            parent.remove_child(element)
+
+            # Split the template into the static part (parsed once, see Template) and the fields filled per item
+            nodes = []
+            self.fields = []  # (node index, attribute, format string)
+            for el in ezUI.Tree._walk(element):
+                static = {}
+                for name, value in el.attr_items():
+                    if name == "ezFor":
+                        continue
+                    if name != "ezFormat" and self.uses(value, self.var):  # ezFormat formats the bound value
+                        self.fields.append((len(nodes), name, value))
+                    else:
+                        static[name] = value
+                nodes.append((el.tag, static, len(el.children)))
+            self.template = ezUI.Template(nodes)
+            self.key_format = next((fmt for index, name, fmt in self.fields if index == 0 and name == "ezKey"), None)
+            self.copies = []  # (key, root, elements in template order)
+            self.pool = []
+            self.version = None
+            self.sync()
+
+        @staticmethod
+        def uses(value, var):
+            # True for strings with a {var...} format field, other braces are left alone
+            if not isinstance(value, str) or "{" not in value:
+                return False
+            try:
+                return any(field is not None and ezUI.Repeater._FIELD_ROOT.match(field).group() == var
+                           for _, field, _, _ in string.Formatter().parse(value))
+            except ValueError:
+                return False  # not a format string, e.g. a single "{"
+
+        def _take(self):
+            if self.pool:
+                return self.pool.pop()
+            root = self.template.instantiate()
+            return root, list(ezUI.Tree._walk(root))
+
+        def _fill(self, elements, item):
+            scope = {self.var: item}
+            for index, name, fmt in self.fields:
+                value = fmt.format(**scope)
+                element = elements[index]
+                if element.attr(name) != value:
+                    element.attributes[name] = value
+
+        def sync(self, force=False):
+            data = self.app.data
+            version = data.version(self.key)
+            if version == self.version and not force:
+                return
+            self.version = version
+            items = list(data.get(self.key) or ())
+            parent = self.parent
+
+            # Key every item, repeated keys get a counter so they stay unique
+            keys = []
+            seen = {}
+            for index, item in enumerate(items):
+                if self.key_format is not None:
+                    key = self.key_format.format(**{self.var: item})
+                else:
+                    try:
+                        hash(item)
+                        key = item
+                    except TypeError:
+                        key = index
+                seen[key] = seen.get(key, -1) + 1
+                keys.append((key, seen[key]))
+
+            old = {key: (root, elements) for key, root, elements in self.copies}
+            copies = []
+            for key, item in zip(keys, items):
+                root, elements = old.pop(key, None) or self._take()
+                self._fill(elements, item)
+                copies.append((key, root, elements))
+            for root, elements in old.values():
+                parent.remove_child(root)
+                self.pool.append((root, elements))  # the newest are reused first, their widgets are still parked
+            del self.pool[:-ezUI.Repeater.POOL]
+
+            # Copies already in place that form the longest run in the right order stay, the rest move
+            present = {id(root): i for i, (_, root, _) in enumerate(copies) if root.parent is parent}
+            order = [present[id(child)] for child in parent.children if id(child) in present]
+            stay = ezUI.Repeater.longest_increasing(order)
+
+            children = parent.children
+            for i, (_, root, _) in enumerate(copies):
+                if i in stay:
+                    continue
+                if i:
+                    position = children.index(copies[i - 1][1]) + 1
+                elif self.anchor is not None and self.anchor.parent is parent:
+                    position = children.index(self.anchor) + 1
+                else:
+                    position = 0
+                if root.parent is parent:
+                    if children.index(root) < position:
+                        position -= 1  # taken out before it is put back
+                    parent.move_child(root, position)
+                else:
+                    parent.insert_child(position, root)
+                children = parent.children
+            self.copies = copies
+
+        @staticmethod
+        def longest_increasing(sequence):
+            # Values of one longest increasing subsequence of distinct ints, O(n log n)
+            tails, previous = [], {}
+            for value in sequence:
+                i = bisect.bisect_left(tails, value)
+                previous[value] = tails[i - 1] if i else None
+                if i == len(tails):
+                    tails.append(value)
+                else:
+                    tails[i] = value
+            result = set()
+            value = tails[-1] if tails else None
+            while value is not None:
+                result.add(value)
+                value = previous[value]
+            return result
 
     # Data store for reactive binding
     class DataModel:
         def __init__(self):
             self.data = {}
             self._bindings = {}
+            self._computed = {}    # key -> (fn, deps or None for automatic capture)
+            self._cache = {}       # key -> last computed value
+            self._dependents = {}  # dep key -> set of computed keys reading it
+            self._tracking = []    # dependency sets being captured, innermost last
+            self._versions = {}    # key -> change counter, lets callers cache on what they read
+            self.revision = 0      # bumped with any of them
+            self._watchers = {}    # key -> [fn(key, edits)]
+            self._recorders = []   # TUI.Recorder, told about every bind and update
+
+        # A value that is only produced when somebody reads it, see apply_edits
+        class Lazy:
+            __slots__ = ("fn",)
+
+            def __init__(self, fn):
+                self.fn = fn
 
         def bind(self, key, value):
             self.data[key] = value
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self.revision += 1
+            for recorder in self._recorders:
+                recorder.data("bind", key, value)
+            self._invalidate(key)
+            self._watched(key, None)
 
         def update(self, key, value):
+            if key in self._computed:
+                raise ValueError("'{}' is a computed key and can't be updated".format(key))
             self.data[key] = value
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self.revision += 1
+            for recorder in self._recorders:
+                recorder.data("update", key, value)
+            self._notify(key, value)
+            self._invalidate(key)
+            self._watched(key, None)
+
+        def apply_edits(self, key, edits, materialize):
+            # key changed by edits, e.g. [("insert", "3.0", "text"), ("delete", "1.4", "1.9")] from a
+            # textbox. The full value is only built (materialize()) when it is read.
+            self.data[key] = ezUI.DataModel.Lazy(materialize)
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self.revision += 1
+            for recorder in self._recorders:
+                recorder.data("update", key, self.get(key))  # a recording needs the value itself
+            if key in self._bindings:
+                self._notify(key, self.get(key))
+            self._invalidate(key)
+            self._watched(key, edits)
+
+        def watch(self, key, fn):
+            # fn(key, edits) after key changes, edits is None unless the change came with edits
+            self._watchers.setdefault(key, []).append(fn)
+
+        def unwatch(self, key, fn):
+            if fn in self._watchers.get(key, ()):
+                self._watchers[key].remove(fn)
+
+        def _watched(self, key, edits):
+            for fn in list(self._watchers.get(key, ())):
+                fn(key, edits)
+
+        def version(self, key):
+            return self._versions.get(key, 0)
+
+        def _notify(self, key, value):
             if key in self._bindings:
                 binding = self._bindings[key]
                 if callable(binding):     # For dropdowns or custom objects
@@ -57,7 +951,63 @@ class ezUI:
                     binding.set(value)   # For StringVar
                     
         def get(self, key, default=None):
-            return self.data.get(key, default)
+            if self._tracking:
+                self._tracking[-1].add(key)
+            if key in self._computed:
+                return self._evaluate(key)
+            value = self.data.get(key, default)
+            if type(value) is ezUI.DataModel.Lazy:
+                value = self.data[key] = value.fn()
+            return value
+
+        # Derived value, cached until one of its deps is updated.
+        # Without deps, the keys fn reads through data.get are captured automatically.
+        #   data.computed("total", lambda d: sum(d.get("prices")), deps=["prices"])
+        def computed(self, key, fn, deps=None):
+            if key in self._computed:
+                # Registered again: the old fn's deps (given or captured) shouldn't invalidate it any more
+                for dependents in self._dependents.values():
+                    dependents.discard(key)
+            self._computed[key] = (fn, list(deps) if deps is not None else None)
+            self._cache.pop(key, None)
+            if deps is not None:
+                for dep in deps:
+                    self._dependents.setdefault(dep, set()).add(key)
+            if key in self._bindings:
+                self._notify(key, self._evaluate(key))
+
+        def _evaluate(self, key):
+            if key in self._cache:
+                return self._cache[key]
+            fn, deps = self._computed[key]
+            captured = set()  # always push, so reads in here don't leak into an outer capture
+            self._tracking.append(captured)
+            try:
+                value = fn(self)
+            finally:
+                self._tracking.pop()
+            if deps is None:
+                captured.discard(key)
+                for dep in captured:
+                    self._dependents.setdefault(dep, set()).add(key)
+            self._cache[key] = value
+            return value
+
+        def _invalidate(self, key):
+            # Drop every stale cache entry first, then refresh bound widgets
+            stale = []
+            pending = [key]
+            while pending:
+                for dependent in self._dependents.get(pending.pop(), ()):
+                    if dependent in self._cache:
+                        del self._cache[dependent]
+                        self._versions[dependent] = self._versions.get(dependent, 0) + 1
+                        self.revision += 1
+                        stale.append(dependent)
+                        pending.append(dependent)
+            for dependent in stale:
+                if dependent in self._bindings:
+                    self._notify(dependent, self._evaluate(dependent))
             
     #app options
     class Options:
@@ -84,16 +1034,258 @@ class ezUI:
         def all(self):
             return self._options
 
+    # Worker pools for ezAsync handlers, results come back on the UI thread
+    class Executor:
+        def __init__(self, app, max_threads=4, max_processes=None):
+            self.app = app
+            self.max_threads = max_threads
+            self.max_processes = max_processes
+            self._threads = None  # pools are only created on first use
+            self._processes = None
+            self._posted = queue.SimpleQueue()  # (fn, args) to run on the UI thread
+            self._running = {}  # element -> (future, cancel event)
+
+        def submit(self, element, handler):
+            attrs = element.attributes
+            mode = attrs.get("ezAsync", "false").lower()
+            busy_key = attrs.get("ezBusy", "").strip("()")
+
+            self.cancel(element)  # one job per element, newest wins
+
+            cancel_event = threading.Event()
+            if mode == "process":
+                # Processes can't see the UI, they get ezArgs and return a value
+                if self._processes is None:
+                    ezUI.require("futures")
+                    self._processes = futures.ProcessPoolExecutor(max_workers=self.max_processes)
+                args_key = attrs.get("ezArgs", "").strip("()")
+                args = self.app.data.get(args_key) if args_key else None
+                future = self._processes.submit(handler, args)
+            else:
+                if self._threads is None:
+                    ezUI.require("futures")
+                    self._threads = futures.ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="ezUI")
+                system = self.app.system(self.app)
+                system._job = (element, cancel_event)  # cancelled() answers for this job, not a newer one
+                future = self._threads.submit(handler, element, system, self.app.data)
+
+            self._running[element] = (future, cancel_event)
+            if busy_key:
+                self.app.data.update(busy_key, True)
+            future.add_done_callback(lambda f, e=element: self.post(self._finished, e, f))
+            return future
+
+        def _finished(self, element, future):
+            attrs = element.attributes
+            current = self._running.get(element)
+            if current is None or current[0] is not future:
+                return  # superseded by a newer job for this element
+            del self._running[element]
+            busy_key = attrs.get("ezBusy", "").strip("()")
+            if busy_key:
+                self.app.data.update(busy_key, False)
+
+            if future.cancelled() or current[1].is_set():
+                return
+            error = future.exception()
+            if error is not None:
+                print("Async handler failed:", repr(error))
+                return
+            result_key = attrs.get("ezResult", "").strip("()")
+            if result_key:
+                self.app.data.update(result_key, future.result())
+
+        def cancel(self, element):
+            job = self._running.get(element)
+            if not job:
+                return False
+            future, cancel_event = job
+            cancel_event.set()  # running jobs poll system.cancelled(element)
+            future.cancel()
+            return True
+
+        def cancelled(self, element):
+            job = self._running.get(element)
+            return job is not None and job[1].is_set()
+
+        def busy(self, element=None):
+            if element is None:
+                return bool(self._running)
+            return element in self._running
+
+        def post(self, fn, *args):
+            # Safe from any thread
+            self._posted.put((fn, args))
+
+        def pump(self):
+            # Called once per frame on the UI thread, returns how many callbacks ran
+            count = 0
+            while True:
+                try:
+                    fn, args = self._posted.get_nowait()
+                except queue.Empty:
+                    return count
+                count += 1
+                try:
+                    fn(*args)
+                except Exception as e:
+                    print("Posted callback failed:", repr(e))
+
+        def shutdown(self):
+            for element in list(self._running):
+                self.cancel(element)
+            if self._threads is not None:
+                self._threads.shutdown(wait=False, cancel_futures=True)
+            if self._processes is not None:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+
+    # Frame clock for loops driven by timers. Frames are kept on a fixed grid (deadline += interval,
+    # so slow timers don't add up to drift), frames that couldn't start on time are dropped instead
+    # of run back to back, and idle frames wait idle_interval instead.
+    class FramePacer:
+        def __init__(self, fps=60, idle_fps=10, clock=time.perf_counter):
+            self.interval = 1.0 / fps
+            self.idle_interval = 1.0 / idle_fps
+            self.clock = clock
+            self.deadline = None  # when the next frame is due
+            self.idle = False
+            self.frames = 0      # frames that did work
+            self.idle_frames = 0
+            self.overruns = 0    # frames that finished after the next one was due
+            self.dropped = 0     # frames skipped because of overruns
+            self.fps = 0.0       # frames with work per second, over the last second
+            self._counted = 0
+            self._since = clock()
+
+        def wake(self):
+            # Something happened while idle, run the next frame right away
+            if self.idle:
+                self.idle = False
+                self.deadline = None
+
+        def end_frame(self, busy=True):
+            # Call after a frame's work, returns seconds to wait before the next one
+            now = self.clock()
+            if busy:
+                self.frames += 1
+                self._counted += 1
+            else:
+                self.idle_frames += 1
+            if now - self._since >= 1.0:
+                self.fps = self._counted / (now - self._since)
+                self._counted = 0
+                self._since = now
+
+            if not busy:
+                self.idle = True
+                self.deadline = now + self.idle_interval
+                return self.idle_interval
+            if self.idle or self.deadline is None:
+                self.idle = False
+                self.deadline = now
+            self.deadline += self.interval
+            late = now - self.deadline
+            if late > 0:
+                # Stay on the grid: skip the frames we're already too late for
+                self.overruns += 1
+                missed = int(late // self.interval) + 1
+                self.dropped += missed
+                self.deadline += missed * self.interval
+            return self.deadline - now
+
+        def stats(self):
+            return {"fps": round(self.fps, 1), "frames": self.frames, "idle_frames": self.idle_frames,
+                    "overruns": self.overruns, "dropped": self.dropped}
+
     # Shared controller for all interfaces (GUI/TUI)
     class UIApp:
         def __init__(self, root_element, data_model, opts):
             self.root_element = root_element
             self.data = data_model
             self.options = opts
-            self.named_elements = {}  # Lookup table for named elements
+            # Trees already indexed by another app (e.g. another session) are shared
+            self.tree = root_element._tree or ezUI.Tree(root_element)
+            self.named_elements = self.tree.names  # Lookup table for named elements, kept current by the tree
+            self.loop = None  # asyncio loop when started with start_ui_async
+            self.started = time.perf_counter()
+            self.first_paint = None  # seconds from start to the first frame on screen
+            self.tasks = set()  # Running tasks spawned by async handlers
+            self.loop_task = None  # the async user_loop call still running, if any
+            self.backend = None  # the GUI or TUI driving this app
+            self.executor = ezUI.Executor(self, opts.get("worker_threads", 4), opts.get("worker_processes", None))
+            self.repeaters = self._make_repeaters()
+
+        def _make_repeaters(self):
+            repeaters = []
+            for element in self.tree.query("[ezFor]"):
+                if element._tree is self.tree:  # not inside a template taken out by an outer ezFor
+                    repeaters.append(ezUI.Repeater(self, element))
+            return repeaters
+
+        def update_repeaters(self):
+            # Once a frame: bring ezFor copies in line with their lists
+            for repeater in self.repeaters:
+                repeater.sync()
+
+        def painted(self):
+            if self.first_paint is None:
+                self.first_paint = time.perf_counter() - self.started
+
+        def call_handler(self, handler, element):
+            # ezAsync="true"/"thread"/"process" moves the handler off the UI thread
+            if element.attr("ezAsync", "false").lower() in ("true", "thread", "process"):
+                return self.executor.submit(element, handler)
+            # ezClick handlers may be plain functions or async def coroutines
+            return self.schedule(handler(element, self.system(self), self.data))
+
+        def schedule(self, result):
+            if result is None:
+                return None  # plain handlers and loops, the usual case
+            ezUI.require("inspect", "asyncio")
+            if not inspect.isawaitable(result):
+                return result
+            if self.loop is None:
+                # No event loop running (plain start_ui), finish it right here
+                return asyncio.run(result)
+            task = asyncio.ensure_future(result, loop=self.loop)
+            self.tasks.add(task)
+            task.add_done_callback(self._task_done)
+            return task
+
+        def run_loop(self, user_loop, system):
+            # One user_loop call a frame. Under an event loop an async user_loop runs as a task,
+            # and frames that come while it is still running skip their call
+            if self.loop_task is not None and not self.loop_task.done():
+                return None
+            result = user_loop(system, self.data)
+            if self.loop is not None and result is not None:
+                ezUI.require("inspect")
+                if inspect.isawaitable(result):
+                    self.loop_task = self.schedule(result)
+                    return None
+            return self.schedule(result)
+
+        def _task_done(self, task):
+            self.tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                print("Async handler failed:", repr(task.exception()))
+
+        def set_root(self, root_element):
+            if root_element is not self.root_element:
+                old = self.tree
+                self.root_element = root_element
+                self.tree = root_element._tree or ezUI.Tree(root_element)
+                self.named_elements = self.tree.names
+                self.repeaters = self._make_repeaters()
+                if old is not self.tree:
+                    # Backends listen to the app's tree, whichever it is
+                    for listener in list(old.listeners):
+                        old.unsubscribe(listener)
+                        self.tree.subscribe(listener)
 
         def register_element(self, element):
-            name = element.attributes.get("name")
+            # Elements in the tree are indexed automatically, this covers detached ones
+            name = element.attr("name")
             if name:
                 self.named_elements[name] = element
         
@@ -107,9 +1299,48 @@ class ezUI:
             def __init__(self, app):
                 self.app = app
                 self.options = app.options  # Allow direct access: system.options.get(...)
+                self._job = None  # (element, cancel event) when handed to an ezAsync thread handler
             
             def get_element_by_name(self, name):
                 return self.app.named_elements.get(name)
+
+            def render(self, root_element=None):
+                # Apply tree changes now (GUI: only the widgets that changed), or swap in a new tree
+                self.app.backend.render(root_element)
+
+            def query(self, selector):
+                # e.g. system.query("frame.panel label[ezBind]"), results are cached until the tree changes
+                return self.app.tree.query(selector)
+
+            def query_one(self, selector):
+                result = self.app.tree.query(selector)
+                return result[0] if result else None
+
+            def post(self, fn, *args):
+                # Run fn(*args) on the UI thread next frame, use this from ezAsync handlers
+                self.app.executor.post(fn, *args)
+
+            def cancel(self, element):
+                return self.app.executor.cancel(element)
+
+            def cancelled(self, element=None):
+                # In an ezAsync thread handler this is about its own job, also once a newer job for the
+                # same element took over or the job was cancelled and cleaned up
+                if self._job is not None and element in (None, self._job[0]):
+                    return self._job[1].is_set()
+                return self.app.executor.cancelled(element)
+
+            def busy(self, element=None):
+                return self.app.executor.busy(element)
+
+            def frame_stats(self):
+                # {"fps", "frames", "idle_frames", "overruns", "dropped"} for backends with a frame pacer,
+                # plus "first_paint_ms" once the first frame is on screen
+                pacer = getattr(self.app.backend, "pacer", None)
+                stats = pacer.stats() if pacer is not None else {}
+                if self.app.first_paint is not None:
+                    stats["first_paint_ms"] = round(self.app.first_paint * 1000, 1)
+                return stats
             
             def get_version(self):
                 print("Version: {}".format(ezUI.VERSION))
@@ -134,10 +1365,14 @@ class ezUI:
 
     # GUI renderer using tkinter
     class GUI:
-        def __init__(self, root_element, data_model, opts, user_function=None, user_loop=None):
+        def __init__(self, root_element, data_model, opts, user_function=None, user_loop=None, autorun=True):
             options = opts
+            self.user_function = user_function
             self.user_loop = user_loop
+            self.running = False
+            ezUI.require("tk")
             self.app = ezUI.UIApp(root_element, data_model, options)
+            self.app.backend = self
             self.root = tk.Tk()
 
             title = self.app.options.get("title", "ezUI App")
@@ -198,80 +1433,210 @@ class ezUI:
                 self.full_screen_parent = self.root
                 parent_for_build = self.root
 
+            self.active_modal_element = None
+            self.modal_backdrop = None
+            self._nodes = {}    # element -> Node for everything built
+            self._changed = {}  # element -> children touched since the last flush
+            self._restyle = {}  # element -> widget options set since the last frame
+            self._parked = {}   # removed or collapsed element -> (Node, parked at), widgets kept unpacked for reuse
+            self.pacer = ezUI.FramePacer(self.app.options.get("fps", 60), self.app.options.get("idle_fps", 10))
+            self._after = None  # pending frame timer
+            self._scenes = {}   # canvas element -> (tk canvas, scene id -> tk item id)
+            self._photos = {}   # (image, width, height, background) -> PhotoImage, see _show_image
+            self._charts = {}   # chart element -> (tk canvas, line item, what it was drawn from)
             self.build(parent_for_build, root_element)
+            self._rendered = self.snapshot(root_element)  # what render() diffs against
+            self.app.tree.subscribe(self._on_change)
             print("GUI started")
-            self.app.cleanup = self.root.destroy  # Clean exit for tkinter
+            self.app.cleanup = self.cleanup  # Clean exit for tkinter
 
-            if callable(user_function):
-                user_function(self.app.system(self.app), self.app.data)
-            if callable(self.user_loop):
-                self._start_loop()
+            if autorun:
+                self.run()
+
+        def _start(self):
+            self.running = True
+            if callable(self.user_function):
+                self.app.schedule(self.user_function(self.app.system(self.app), self.app.data))
+
+        def run(self):
+            self._start()
+            self._start_loop()
 
             self.root.mainloop()
 
+        async def run_async(self):
+            # Cooperative version of run(): pump tk ourselves instead of mainloop
+            ezUI.require("asyncio")
+            self._start()
+            while self.running:
+                start = time.perf_counter()
+                visible = self._visible()
+                busy = self._frame(visible)
+                busy = self._background(visible, start + self.pacer.interval / 2) or busy
+                try:
+                    self.root.update()
+                except tk.TclError:
+                    break  # window was destroyed
+                self.app.painted()
+                await asyncio.sleep(self.pacer.end_frame(busy and visible))  # lets other tasks run
+            self.running = False
+
+        def cleanup(self):
+            self.running = False
+            self.app.executor.shutdown()
+            try:
+                self.root.destroy()
+            except tk.TclError:
+                pass
+
         def _start_loop(self):
-            def loop():
-                self.user_loop(self.app.system(self.app), self.app.data)
-                self.root.after(16, loop)  # ~60 FPS
-            loop()
+            self._tick()
+            self.root.after_idle(self.app.painted)  # after tk's own idle redraws
+
+        def _tick(self):
+            # One frame. Runs at the "fps" option while there is work (user_loop, worker results,
+            # tree changes), at "idle_fps" when there is none or the window is minimized.
+            self._after = None
+            start = time.perf_counter()
+            visible = self._visible()
+            busy = self._frame(visible)
+            busy = self._background(visible, start + self.pacer.interval / 2) or busy
+            delay = self.pacer.end_frame(busy and visible)
+            try:
+                self._after = self.root.after(max(1, int(delay * 1000)), self._tick)
+            except tk.TclError:
+                pass  # window was destroyed
+
+        def wake(self):
+            # Cut an idle wait short, e.g. after a click handler changed something
+            if self.pacer.idle and self._after is not None:
+                self.pacer.wake()
+                try:
+                    self.root.after_cancel(self._after)
+                    self._after = self.root.after_idle(self._tick)
+                except tk.TclError:
+                    pass
 
-        def build(self, parent, element):
-            if element.visibility == "collapsed":
+        def _frame(self, visible):
+            # Worker results, user_loop and tree updates. The frame was busy if it changed something:
+            # the data model, the tree, a scene or chart, or a user_loop that returned True.
+            data, tree = self.app.data, self.app.tree
+            before = (data.revision, tree, tree.version, tree.attr_version)
+            busy = self.app.executor.pump() > 0
+            if callable(self.user_loop) and visible:
+                busy = self.app.run_loop(self.user_loop, self.app.system(self.app)) is True or busy
+            busy = self._apply_changes() or busy
+            tree = self.app.tree
+            return busy or before != (data.revision, tree, tree.version, tree.attr_version)
+
+        def _apply_changes(self):
+            self.app.update_repeaters()
+            busy = bool(self._changed)
+            self.flush_changes()
+            busy = self._apply_styles() or busy
+            busy = self._sync_charts() or busy
+            return self._sync_scenes() or busy
+
+        def _sync_scenes(self):
+            # Send every canvas scene's changes of this frame to tk in one go
+            busy = False
+            for element in self.app.tree.tags.get("canvas", ()):
+                scene = element._scene
+                widget = element.widget
+                if scene is None or widget is None:
+                    continue
+                synced = self._scenes.get(element)
+                if synced is None or synced[0] is not widget:  # rebuilt or scene made after the build
+                    self._scenes[element] = (widget, scene.draw(widget))
+                    busy = True
+                elif scene.pending:
+                    scene.sync(widget, synced[1])
+                    busy = True
+            return busy
+
+        def _show_image(self, element, widget):
+            # PhotoImages are shared by every label showing the same picture at the same size
+            props = element.props
+            try:
+                image = ezUI.Image.of(element, self.app.data)
+            except (OSError, ValueError) as e:
+                print("Warning: Failed to load image:", e)
+                widget.configure(image="", text=element.attr("text", ""))
+                widget.image = None
+                return
+            width, height = image.fit(props.width, props.height)
+            bg = props.bg_rgb or (0, 0, 255)
+
+            def make():
+                photo = tk.PhotoImage(width=width, height=height)
+                photo.put(" ".join("{" + " ".join("#%02x%02x%02x" % pixel for pixel in row) + "}"
+                                   for row in image.scaled(width, height, bg)))
+                return photo
+            widget.image = ezUI.Image._cached(self._photos, (image, width, height, bg), make)  # tk drops unreferenced images
+            widget.configure(image=widget.image)
+
+        def _sync_charts(self):
+            # Series can grow from any thread, their charts are redrawn here once a frame
+            busy = False
+            for element in self.app.tree.tags.get("chart", ()):
+                busy = self._sync_chart(element) or busy
+            return busy
+
+        def _sync_chart(self, element):
+            synced = self._charts.get(element)
+            series = element.binding.get(self.app.data)
+            if synced is None or synced[0] is not element.widget or not isinstance(series, ezUI.Series):
+                return False
+            widget, line, drawn = synced
+            props = element.props
+            width = props.width if props.width is not None else 200
+            height = props.height if props.height is not None else 100
+            key = (series, series.version, width, height, props)
+            if key == drawn:
+                return False
+            coords = []
+            for x, (top, bottom) in enumerate(series.plot(width, height, props.chart_min, props.chart_max, props.points)):
+                coords += (x, top, x, bottom + 1)
+            widget.coords(line, *(coords if len(coords) >= 4 else (0, 0, 0, 0)))
+            self._charts[element] = (widget, line, key)
+            return True
+
+        def _visible(self):
+            try:
+                return self.root.state() not in ("iconic", "withdrawn")
+            except tk.TclError:
+                return False
+
+        def build(self, parent, element, prebuild=False):
+            # prebuild: build a collapsed element anyway and leave it unplaced, see _prebuild
+            if element.visibility == "collapsed" and not prebuild:
                 return  # skip entirely
 
-            tag = element.tag.lower()
+            tag = element.tag
+            props = element.props
             widget_class = getattr(tk, tag.capitalize(), None)
             widget = None
 
             widget_args = {
-                k: int(v) if k in ("width", "height") and int(v) > 0 else v
+                k: v
                 for k, v in element.attributes.items()
-                if not k.startswith("ez") and k not in ["name", "pack", "padx", "pady", "x", "y"]
+                if not k.startswith("ez") and k not in ["name", "pack", "padx", "pady", "x", "y", "width", "height", "visibility"]
             }
 
-            if "width" in element.attributes and int(element.attributes["width"]) > 0:
-                widget_args["width"] = int(element.attributes["width"])
-            if "height" in element.attributes and int(element.attributes["height"]) > 0:
-                widget_args["height"] = int(element.attributes["height"])
+            if props.width is not None and props.width > 0:
+                widget_args["width"] = props.width
+            if props.height is not None and props.height > 0:
+                widget_args["height"] = props.height
 
             if tag == 'window':
+                # Modal frames are built with everything else and shown on top, see _show_modal
                 widget = parent
-                
-                # --- Modal Enforcement Begins Here ---
-                modal = None
-                for child in element.children:
-                    if child.tag.lower() == "frame" and child.attributes.get("visibility", "visible") != "collapsed":
-                        modal_type = child.attributes.get("ezModal", "None")
-                        if modal_type in ["Clear", "Opaque"]:
-                            modal = child
-                            self.active_modal_element = child
-                            break
-
-                if modal:
-                    # Destroy all existing widgets except root
-                    for el in self.app.elements.values():
-                        w = el.widget
-                        if w and w != self.full_screen_parent:
-                            w.destroy()
-                    self.app.elements = {}
-
-                    # Optional: draw gray overlay
-                    if modal.attributes.get("ezModal") == "Opaque":
-                        backdrop = tk.Frame(widget, bg="#333333")
-                        backdrop.place(x=0, y=0, relwidth=1, relheight=1)
-                        self.modal_backdrop = backdrop
-
-                    # Build modal subtree only
-                    self.build(widget, modal)
-                    return  # stop here; modal handles layout
-                else:
-                    self.active_modal_element = None
 
             elif tag == 'frame':
-                overflow = element.attributes.get("overflow", "visible").lower()
-                border = element.attributes.get("border", "true").lower() != "false"
-                scroll_x = int(element.attributes.get("scrollLeft", 0))
-                scroll_y = int(element.attributes.get("scrollTop", 0))
+                overflow = props.overflow
+                border = props.border is not False  # GUI frames have a border unless border="false"
+                scroll_x = props.scroll_left
+                scroll_y = props.scroll_top
 
                 if overflow == "hidden":
                     canvas = tk.Canvas(parent, borderwidth=0, highlightthickness=1 if border else 0, highlightbackground="black")
@@ -309,17 +1674,30 @@ class ezUI:
                 height = int(widget_args.get("height", 5))
                 width = int(widget_args.get("width", 40))
                 widget = tk.Text(parent, height=height, width=width)
-                if 'ezBind' in element.attributes:
-                    key = element.attributes['ezBind'].strip("()")
-                    widget.insert('1.0', self.app.data.get(key, ''))
-
-                    def on_text_change(event, key=key, widget=widget):
-                        self.app.data.update(key, widget.get("1.0", "end-1c"))
-
-                    widget.bind("<KeyRelease>", on_text_change)
+                binding = element.binding
+                if binding:
+                    widget.insert('1.0', binding.text(self.app.data))
+                    delay = props.debounce if props.debounce is not None else self.app.options.get("text_debounce", 150)
+                    ezUI.GUI.TextTracker(self.app.data, widget, binding.key, delay)
+
+            elif tag == 'image':
+                bg = props.background or "#0000ff"
+                widget = tk.Label(parent, background=bg, foreground=props.foreground or "#ffffff", borderwidth=0)
+                self._show_image(element, widget)
+                if element.binding:
+                    self.app.bind_updater(element.binding.key,
+                                          lambda value, element=element, widget=widget: self._show_image(element, widget))
+
+            elif tag == 'chart':
+                width = props.width if props.width is not None else 200
+                height = props.height if props.height is not None else 100
+                widget = tk.Canvas(parent, width=width, height=height, background=props.background or "#000000",
+                                   highlightthickness=0)
+                line = widget.create_line(0, 0, 0, 0, fill=props.foreground or "#00ff00")
+                self._charts[element] = (widget, line, None)  # plotted by _sync_charts
 
             elif tag == 'optionmenu':
-                key = element.attributes['ezBind'].strip("()")
+                key = element.binding.key
                 dropdown_data = self.app.data.get(key, {"options": {}, "selected_index": 0})
                 var = tk.StringVar()
                 options = dropdown_data.get("options", {})
@@ -360,10 +1738,11 @@ class ezUI:
                 update_dropdown(dropdown_data)
 
             elif widget_class:
-                if tag == 'entry' and 'ezBind' in element.attributes:
-                    key = element.attributes['ezBind'].strip("()")
+                binding = element.binding
+                if tag == 'entry' and binding:
+                    key = binding.key
                     var = tk.StringVar()
-                    var.set(self.app.data.get(key, ''))
+                    var.set(binding.get(self.app.data, ''))
 
                     def on_change(*args):
                         self.app.data.update(key, var.get())
@@ -373,18 +1752,18 @@ class ezUI:
                     element._var = var
                     widget_args["textvariable"] = var
 
-                elif tag == 'label' and 'ezBind' in element.attributes:
-                    key = element.attributes['ezBind'].strip("()")
+                elif tag == 'label' and binding:
+                    key = binding.key
                     var = tk.StringVar()
-                    var.set(self.app.data.get(key, ''))
-                    self.app.data._bindings[key] = var
+                    var.set(binding.text(self.app.data))
+                    self.app.bind_updater(key, lambda value, var=var, binding=binding: var.set(binding.format(value)))
                     element._var = var                    
                     widget_args["textvariable"] = var
 
-                elif tag == 'checkbutton' and 'ezBind' in element.attributes:
-                    key = element.attributes['ezBind'].strip("()")
+                elif tag == 'checkbutton' and binding:
+                    key = binding.key
                     var = tk.BooleanVar()
-                    var.set(bool(self.app.data.get(key, False)))
+                    var.set(bool(binding.get(self.app.data, False)))
 
                     def on_check(*args):
                         self.app.data.update(key, var.get())
@@ -400,8 +1779,8 @@ class ezUI:
                     widget_args.pop("foreground", None)
                     widget_args.pop("fg", None)
                     
-                    bg = element.attributes.get("background") or element.attributes.get("bg") or "#0000ff"
-                    fg = element.attributes.get("foreground") or element.attributes.get("fg") or "#ffffff"
+                    bg = props.background or "#0000ff"
+                    fg = props.foreground or "#ffffff"
 
                     #widget_args["background"] = bg
                     #widget_args["foreground"] = fg
@@ -413,8 +1792,8 @@ class ezUI:
                     except Exception as e:
                         print("Warning: Failed to set colors:", e)
 
-                elif tag == 'radiobutton' and 'ezBind' in element.attributes and 'value' in element.attributes:
-                    key = element.attributes['ezBind'].strip("()")
+                elif tag == 'radiobutton' and binding and 'value' in element.attributes:
+                    key = binding.key
                     value = element.attributes["value"]
                     var = self.app.data._bindings.get(key)
                     if not var:
@@ -435,8 +1814,8 @@ class ezUI:
                     widget_args.pop("foreground", None)
                     widget_args.pop("fg", None)
                     
-                    bg = element.attributes.get("background") or element.attributes.get("bg") or "#0000ff"
-                    fg = element.attributes.get("foreground") or element.attributes.get("fg") or "#ffffff"
+                    bg = props.background or "#0000ff"
+                    fg = props.foreground or "#ffffff"
 
                     #widget_args["background"] = bg
                     #widget_args["foreground"] = fg
@@ -448,18 +1827,20 @@ class ezUI:
                         print("Warning: Failed to set colors:", e)
                     
                 elif tag == 'canvas':
-                    width = int(element.attributes.get("width", 200))
-                    height = int(element.attributes.get("height", 100))
+                    width = props.width if props.width is not None else 200
+                    height = props.height if props.height is not None else 100
                     widget = tk.Canvas(parent, width=width, height=height)
                     if 'init' in element.attributes:
                         fn = self.app.data.get(element.attributes['init'])
                         if callable(fn):
                             fn(widget)
+                    if element._scene is not None:
+                        self._scenes[element] = (widget, element._scene.draw(widget))
 
                 if widget is None and widget_class:
                     widget = widget_class(parent, **widget_args)
-                    bg = element.attributes.get("background") or element.attributes.get("bg")
-                    fg = element.attributes.get("foreground") or element.attributes.get("fg")
+                    bg = props.background
+                    fg = props.foreground
 
                     if not bg:
                         if tag in ('textbox', 'entry'):
@@ -482,55 +1863,558 @@ class ezUI:
                     handler_name = element.attributes['ezClick']
                     handler = self.app.data.get(handler_name)
                     if handler and hasattr(widget, "config"):
-                        widget.config(command=lambda e=element: handler(e, self.app.system(self.app), self.app.data))
+                        widget.config(command=lambda e=element: (self.app.call_handler(handler, e), self.wake()))
 
-            if widget and tag != 'window':
-                if "x" in element.attributes and "y" in element.attributes:
-                    widget.place(x=int(element.attributes["x"]), y=int(element.attributes["y"]))
+            if widget and tag != 'window' and not prebuild:
+                if props.modal != "none" and element.parent is not None and element.parent.tag == "window":
+                    self._show_modal(element, widget)
                 else:
-                    pack_args = {}
-                    side = element.attributes.get("pack", "top").lower()
-                    padx = element.attributes.get("padx")
-                    pady = element.attributes.get("pady")
+                    self._place(element, widget, parent)
+
+            element.widget = widget
+            self.app.register_element(element)
+
+            for child in element.children:
+                self.build(widget or parent, child)
+
+        def _place(self, element, widget, parent):
+            props = element.props
+            if props.x is not None and props.y is not None:
+                widget.place(x=props.x, y=props.y)
+            else:
+                pack_args = {"side": props.side}
+                if props.padx > 0:
+                    pack_args["padx"] = props.padx
+                if props.pady > 0:
+                    pack_args["pady"] = props.pady
+
+                # 👇 Inject full_screen auto-pack if this is root frame
+                if element.tag == "frame" and parent == self.full_screen_parent and not any(k in element.attributes for k in ("width", "height", "x", "y")):
+                    pack_args["fill"] = "both"
+                    pack_args["expand"] = True
+
+                if element.visibility == "hidden":
+                    widget.lower()
+                    widget.configure(state="disabled")
+
+                widget.pack(**pack_args)
+
+        def _show_modal(self, element, widget):
+            # Cover the window instead of tearing it down, closing is just the reverse
+            self._hide_modal()
+            window = self.full_screen_parent
+            if element.props.modal == "opaque":
+                self.modal_backdrop = tk.Frame(window, bg="#333333")
+                self.modal_backdrop.place(x=0, y=0, relwidth=1, relheight=1)
+            outer = self._outer(element, widget)
+            props = element.props
+            if props.x is not None and props.y is not None:
+                outer.place(x=props.x, y=props.y)
+            else:
+                outer.place(relx=0.5, rely=0.5, anchor="center")
+            outer.lift()
+            self.active_modal_element = element
+            try:
+                self.root.after_idle(self._grab_modal, element, outer)  # once it is mapped
+            except tk.TclError:
+                pass
 
-                    if side:
-                        pack_args["side"] = side
-                    if padx and int(padx) > 0:
-                        pack_args["padx"] = int(padx)
-                    if pady and int(pady) > 0:
-                        pack_args["pady"] = int(pady)
+        def _grab_modal(self, element, outer):
+            # Background stays drawn but gets no input. grab_set fails until the modal is viewable,
+            # so it is tried again a little later for as long as this modal is open.
+            try:
+                if self.active_modal_element is element and outer.winfo_exists():
+                    try:
+                        outer.grab_set()
+                    except tk.TclError:
+                        self.root.after(20, self._grab_modal, element, outer)
+            except tk.TclError:
+                pass  # window was destroyed
+
+        def _hide_modal(self):
+            if self.active_modal_element is not None:
+                widget = self.active_modal_element.widget
+                if widget is not None and widget.winfo_exists():
+                    try:
+                        self._outer(self.active_modal_element, widget).grab_release()
+                    except tk.TclError:
+                        pass
+            if self.modal_backdrop is not None:
+                self.modal_backdrop.destroy()
+                self.modal_backdrop = None
+            self.active_modal_element = None
 
-                    # 👇 Inject full_screen auto-pack if this is root frame
-                    if tag == "frame" and parent == self.full_screen_parent and not any(k in element.attributes for k in ("width", "height", "x", "y")):
-                        pack_args["fill"] = "both"
-                        pack_args["expand"] = True
+        @staticmethod
+        def _outer(element, widget):
+            # overflow="hidden" frames live inside a scroll canvas, that is what gets packed and destroyed
+            if element.tag == "frame" and element.props.overflow == "hidden" and isinstance(widget.master, tk.Canvas):
+                return widget.master
+            return widget
+
+        # Textbox -> data model without copying the whole text on every key: the Tk text command is
+        # wrapped so every insert/delete is recorded as an edit, and once typing pauses for `delay` ms
+        # the edits go to data.apply_edits, which reads the text back only when somebody asks for it.
+        class TextTracker:
+            def __init__(self, data, widget, key, delay):
+                self.data = data
+                self.widget = widget
+                self.key = key
+                self.delay = delay
+                self.edits = []
+                self.untracked = False  # changed by something we didn't see (undo), edits are incomplete
+                self._after = None
+                self.orig = widget._w + "_orig"
+                widget.tk.call("rename", widget._w, self.orig)
+                widget.tk.createcommand(widget._w, self._dispatch)
+                if widget._tclCommands is None:
+                    widget._tclCommands = []
+                widget._tclCommands.append(widget._w)  # deleted with the widget
+                widget.edit_modified(False)
+                widget.bind("<<Modified>>", self._modified, add="+")
+                widget.bind("<Destroy>", self._destroyed, add="+")
+
+            def _dispatch(self, command, *args):
+                tcl = self.widget.tk
+                call = tcl.call
+                orig = self.orig
+
+                def index(i):
+                    return str(call(orig, "index", i))
+
+                def compare(a, op, b):
+                    return tcl.getboolean(call(orig, "compare", a, op, b))
+
+                edits = ()
+                if command in ("insert", "delete", "replace") and args:
+                    edits = []
+                    try:
+                        start = index(args[0])
+                        if command == "insert":
+                            if compare(start, "==", "end"):
+                                start = index("end-1c")  # Tk inserts before the last newline
+                            edits.append(("insert", start, "".join(args[1::2])))
+                        else:
+                            end = index(args[1] if len(args) > 1 else start + "+1c")
+                            if compare(end, "==", "end"):
+                                end = index("end-1c")
+                            if compare(start, "<", end):
+                                edits.append(("delete", start, end))
+                            if command == "replace":
+                                edits.append(("insert", start, "".join(args[2::2])))
+                    except tk.TclError:
+                        # Couldn't work out the edit, the next sync reads the whole text instead
+                        edits = ()
+                        self.untracked = True
+                        self._schedule()
+                result = call((orig, command) + args)  # the widget's own errors reach the caller
+                for edit in edits:
+                    self._record(edit)
+                return result
+
+            def _record(self, edit):
+                if edit[0] == "insert" and not edit[2]:
+                    return
+                self.edits.append(edit)
+                self._schedule()
+
+            def _modified(self, event=None):
+                if not self.widget.edit_modified():
+                    return  # our own reset below
+                self.widget.edit_modified(False)
+                if not self.edits and self._after is None:
+                    self.untracked = True
+                    self._schedule()
+
+            def _schedule(self):
+                if self._after is not None:
+                    self.widget.after_cancel(self._after)
+                self._after = self.widget.after(self.delay, self.flush)
+
+            def flush(self, materialize_now=False):
+                self._after = None
+                if not self.edits and not self.untracked:
+                    return
+                edits = [("replace", "1.0", "end")] if self.untracked else self.edits
+                self.edits = []
+                self.untracked = False
+                widget = self.widget
+                text = widget.get("1.0", "end-1c") if materialize_now else None
+                self.data.apply_edits(self.key, edits, lambda: text if text is not None else widget.get("1.0", "end-1c"))
+
+            def _destroyed(self, event):
+                if event.widget is self.widget and self._after is not None:
+                    self.widget.after_cancel(self._after)
+                    self.flush(materialize_now=True)  # the widget is gone after this
+
+        # What the last build/render produced for one element
+        class Node:
+            __slots__ = ("element", "key", "attributes", "widget", "var", "children")
+
+            def __init__(self, element, key, children):
+                self.element = element
+                self.key = key
+                self.attributes = dict(element.attr_items())
+                self.widget = element.widget
+                self.var = element._var
+                self.children = children
+
+        # Attributes that are wired up at build time, changing them means building the widget again
+        REBUILD_KEYS = ("ezBind", "ezClick", "ezModal", "ezFormat", "ezAsync", "overflow", "border", "value", "init",
+                        "scrollLeft", "scrollTop", "ezDebounce")
+        # Per tag: attributes the widget can't take as options, e.g. an image is scaled at build time
+        TAG_REBUILD_KEYS = {"image": ("src", "width", "height")}
+        # Attributes handled by pack/place
+        LAYOUT_KEYS = ("pack", "padx", "pady", "x", "y", "visibility")
 
-                    if element.visibility == "hidden":
-                        widget.lower()
-                        widget.configure(state="disabled")
+        @staticmethod
+        def child_keys(element):
+            # ezKey, then name, then tag + position among unkeyed siblings of that tag
+            keys = []
+            counts = {}
+            for child in element.children:
+                key = child.attr("ezKey")
+                if key is not None:
+                    keys.append(("key", key))
+                elif child.attr("name"):
+                    keys.append(("name", child.attr("name")))
+                else:
+                    counts[child.tag] = counts.get(child.tag, -1) + 1
+                    keys.append(("pos", child.tag, counts[child.tag]))
+            return keys
+
+        def snapshot(self, element, key=("root",)):
+            children = [
+                self.snapshot(child, child_key)
+                for child, child_key in zip(element.children, self.child_keys(element))
+                if child.visibility != "collapsed"
+            ]
+            node = ezUI.GUI.Node(element, key, children)
+            self._nodes[element] = node
+            return node
+
+        def _on_change(self, event, element, detail):
+            # Tree listener, work is queued and done once per frame in flush_changes
+            if event == "attribute":
+                node = self._nodes.get(element)
+                if (node is not None and node.element is element and self._option_name(detail) is not None
+                        and not self._rebuilds(element, detail) and element.attr(detail) is not None):
+                    self._restyle.setdefault(element, set()).add(detail)  # plain widget option, see _apply_styles
+                elif element.parent is not None:
+                    self._changed.setdefault(element.parent, set()).add(element)
+            else:
+                self._changed.setdefault(element, set())
+            self.wake()
+
+        def flush_changes(self):
+            # Reconcile only the parents whose children or child attributes changed
+            if not self._changed:
+                return
+            changed, self._changed = self._changed, {}
+            units = {}
+            for parent, touched in changed.items():
+                if parent._tree is not self.app.tree:
+                    continue  # removed since
+                # Not built (new or collapsed): hand it up to the nearest built ancestor
+                while parent not in self._nodes and parent.parent is not None:
+                    touched = {parent}
+                    parent = parent.parent
+                units.setdefault(parent, set()).update(touched)
+
+            def depth(el):
+                n = 0
+                while el.parent is not None:
+                    el, n = el.parent, n + 1
+                return n
+
+            for parent in sorted(units, key=depth):
+                node = self._nodes.get(parent)
+                if node is not None and node.element is parent:
+                    self._reconcile_children(node, parent, self._container(parent), False, units[parent])
+
+        def _apply_styles(self):
+            # One configure per widget for the options set since the last frame, values that
+            # ended up where they started are dropped
+            restyle, self._restyle = self._restyle, {}
+            for element, keys in restyle.items():
+                node = self._nodes.get(element)
+                if node is None or node.element is not element:
+                    continue  # rebuilt or removed since, the reconcile took the new values
+                options = {}
+                old = {}
+                for key in keys:
+                    value = element.attr(key)
+                    if value is None:  # removed again, only a rebuild clears an option
+                        self._restyle_failed(element)
+                    elif node.attributes.get(key) != value:
+                        old[key] = node.attributes.get(key)
+                        node.attributes[key] = value
+                        options[self._option_name(key)] = value
+                widget = node.widget
+                if options and widget is not None and widget is not self.full_screen_parent:
+                    try:
+                        widget.configure(**options)
+                    except tk.TclError:
+                        # not an option of this widget, let the next reconcile rebuild it
+                        for key, value in old.items():
+                            if value is None:
+                                node.attributes.pop(key, None)
+                            else:
+                                node.attributes[key] = value
+                        self._restyle_failed(element)
+            return bool(restyle)
 
-                    widget.pack(**pack_args)
+        def _restyle_failed(self, element):
+            if element.parent is not None:
+                self._changed.setdefault(element.parent, set()).add(element)
 
+        @staticmethod
+        def _rebuilds(element, key):
+            return key in ezUI.GUI.REBUILD_KEYS or key in ezUI.GUI.TAG_REBUILD_KEYS.get(element.tag, ())
+
+        @staticmethod
+        def _option_name(key):
+            # The tk option an attribute maps to, None for the ones ezUI handles itself
+            if key in ezUI.GUI.LAYOUT_KEYS or key.startswith("ez") or key == "name":
+                return None
+            return {"bg": "background", "fg": "foreground"}.get(key, key)
+
+        def _container(self, element):
+            # The widget children of element get built into
+            while element is not None and element.widget is None:
+                element = element.parent
+            return element.widget if element is not None else self.full_screen_parent
+
+        def render(self, root_element=None):
+            # Bring the tk widgets in line with the element tree, touching only what changed.
+            # Pass a new root to diff a freshly built tree against the current one.
+            if root_element is not None:
+                self.app.set_root(root_element)
+            self.app.update_repeaters()
+            root = self.app.root_element
+            root.widget = self.full_screen_parent
+            self._rendered.element = root
+            self._rendered.widget = root.widget
+            self._nodes[root] = self._rendered
+            self._reconcile_children(self._rendered, root, self.full_screen_parent)
+            self._rendered.attributes = dict(root.attr_items())
+            self._changed.clear()
+            self._restyle.clear()
+
+        def _reconcile(self, node, element, parent, deep=True, touched=()):
+            # Returns the node now standing for element, reusing node's widget when possible.
+            # deep=False leaves the children alone unless element is a different object.
+            if node.element.tag != element.tag:
+                self._destroy(node)
+                return self._build_node(parent, element, node.key)
+
+            old = node.attributes
+            new = dict(element.attr_items())
+            changed = {k for k in set(old) | set(new) if old.get(k) != new.get(k)}
+            if any(self._rebuilds(element, k) for k in changed) or any(k not in new for k in changed if k not in ezUI.GUI.LAYOUT_KEYS):
+                self._destroy(node)
+                return self._build_node(parent, element, node.key)
+
+            widget = node.widget
             element.widget = widget
-            self.app.register_element(element)
+            element._var = node.var
+            same = node.element is element
+            if not same and self._nodes.get(node.element) is node:
+                del self._nodes[node.element]
+            node.element = element
+            node.attributes = new
+            self._nodes[element] = node
+
+            options = {}
+            for k in changed:
+                option = self._option_name(k)
+                if option is not None:
+                    options[option] = new[k]
+            if options and widget is not None and widget is not self.full_screen_parent:
+                try:
+                    widget.configure(**options)
+                except tk.TclError:
+                    self._destroy(node)
+                    return self._build_node(parent, element, node.key)
+
+            if widget is not None and any(k in ezUI.GUI.LAYOUT_KEYS for k in changed):
+                if element is self.active_modal_element:
+                    self._show_modal(element, widget)
+                else:
+                    outer = self._outer(element, widget)
+                    outer.pack_forget()
+                    outer.place_forget()
+                    self._place(element, outer, parent)
+
+            if deep or not same:
+                self._reconcile_children(node, element, widget or parent, deep, touched)
+            return node
+
+        def _reconcile_children(self, node, element, container, deep=True, touched=()):
+            old_by_key = {child.key: child for child in node.children}
+            pairs = [(child, key) for child, key in zip(element.children, self.child_keys(element))
+                     if child.visibility != "collapsed"]
+
+            old_index = {child.key: i for i, child in enumerate(node.children)}
+            kept = {}  # new index -> old index, for children still packed where they were
+            children = []
+            for child, key in pairs:
+                old = old_by_key.pop(key, None)
+                if old is None:
+                    parked, _ = self._parked.pop(child, (None, None))
+                    if (parked is not None and parked.widget.winfo_exists()
+                            and self._outer(parked.element, parked.widget).master is container):
+                        parked.key = key
+                        new_node = self._reconcile(parked, child, container)
+                        if new_node is parked:
+                            outer = self._outer(child, parked.widget)
+                            if child.props.modal != "none" and element.tag == "window":
+                                self._show_modal(child, parked.widget)
+                            else:
+                                self._place(child, outer, container)
+                    else:
+                        if parked is not None:
+                            self._destroy(parked)
+                        new_node = self._build_node(container, child, key)
+                else:
+                    if not deep and old.element is child and child not in touched:
+                        new_node, relayout = old, False
+                    else:
+                        relayout = any(old.attributes.get(k) != child.attr(k) for k in ezUI.GUI.LAYOUT_KEYS)
+                        new_node = self._reconcile(old, child, container, deep, touched)
+                    if new_node is old and not relayout:
+                        kept[len(children)] = old_index[key]
+                children.append(new_node)
+
+            for leftover in old_by_key.values():
+                removed = leftover.element._tree is None or leftover.element.visibility == "collapsed"
+                if removed and leftover.widget is not None:
+                    self._park(leftover)
+                else:
+                    self._destroy(leftover)
+
+            # The longest run of kept children still in their old order stays put, everything else
+            # (new, rebuilt, re-placed, moved) is re-packed right after the child before it
+            stay = ezUI.Repeater.longest_increasing(list(kept.values()))
+            stay = {i for i, old in kept.items() if old in stay}
+            outers = [self._outer(n.element, n.widget) if n.widget is not None else None for n in children]
+            packed = [w is not None and w.winfo_manager() == "pack" for w in outers]
+            first_stay = next((outers[i] for i in sorted(stay) if packed[i]), None)
+            after = None
+            for i, outer in enumerate(outers):
+                if not packed[i]:
+                    continue
+                if i not in stay:
+                    if after is not None:
+                        outer.pack_configure(after=after)
+                    elif first_stay is not None:
+                        outer.pack_configure(before=first_stay)
+                after = outer
+            node.children = children
+
+        PARKED = 128  # at least Repeater.POOL
+
+        def _park(self, node):
+            # Collapsed or taken out of the tree: unpack instead of destroying, so showing it again
+            # (or a pooled ezFor row coming back) reuses the widgets. Released after "release_after"
+            # seconds (default 30), ezPrebuild ones are kept.
+            element = node.element
+            if element is self.active_modal_element:
+                self._hide_modal()
+            outer = self._outer(element, node.widget)
+            outer.pack_forget()
+            outer.place_forget()
+            self._parked[element] = (node, None if element.props.prebuild else time.monotonic())
+            while len(self._parked) > ezUI.GUI.PARKED:
+                self._destroy(self._parked.pop(next(iter(self._parked)))[0])
+
+        def _background(self, visible, until):
+            # Work that can wait, done until perf_counter() reaches until (what is left of half a
+            # frame). True while there is more prebuilding to do.
+            self._release_parked(until)
+            return visible and self._prebuild(until)
+
+        def _release_parked(self, until):
+            release_after = self.app.options.get("release_after", 30)
+            if release_after is None:
+                return
+            limit = time.monotonic() - release_after
+            for element, (node, since) in list(self._parked.items()):
+                if since is not None and since < limit:
+                    if time.perf_counter() >= until:
+                        return  # the rest next frame
+                    del self._parked[element]
+                    self._destroy(node)
+
+        def _prebuild(self, until):
+            # Build collapsed ezPrebuild="true" subtrees ahead of time, parked until shown
+            for element in self.app.tree.query("[ezPrebuild]"):
+                parent = element.parent
+                if (not element.props.prebuild or element.visibility != "collapsed" or element.widget is not None
+                        or parent is None or parent.widget is None or self._nodes.get(parent) is None):
+                    continue
+                if time.perf_counter() >= until:
+                    return True  # the rest next frame
+                self.build(parent.widget, element, prebuild=True)
+                if element.widget is not None:
+                    self._park(self.snapshot(element, None))
+            return False
+
+        def _build_node(self, parent, element, key):
+            self.build(parent, element)
+            return self.snapshot(element, key)
+
+        def _destroy(self, node):
+            element = node.element
+            if element is self.active_modal_element:
+                self._hide_modal()
+            widget = node.widget
+            if widget is not None and widget is not self.full_screen_parent:
+                self._outer(element, widget).destroy()  # takes the children with it
+            for current in self._walk_nodes(node):
+                el = current.element
+                el.widget = None
+                el._var = None
+                self._scenes.pop(el, None)
+                self._charts.pop(el, None)
+                if self._nodes.get(el) is current:
+                    del self._nodes[el]
 
-            for child in element.children:
-                self.build(widget or parent, child)
+        @staticmethod
+        def _walk_nodes(node):
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                yield current
+                stack.extend(current.children)
                 
     # TUI renderer uses curses
     class TUI:
-        def __init__(self, root_element, data_model, opts, user_function=None, user_loop=None):
+        def __init__(self, root_element, data_model, opts, user_function=None, user_loop=None, autorun=True, terminal=None):
+            ezUI.require("cu")
             options = opts
             self.app = ezUI.UIApp(root_element, data_model, options)
+            self.app.backend = self
             self.system = system = self.app.system(self.app)
             self.screen = None
+            self.terminal = terminal  # a TUI.Server client instead of curses, see TUI.Terminal
+            self.recorder = None  # TUI.Recorder of this session, see the "record" option
             self.focus_index = None
             self.focus_element = None
             self.last_focus_index = -1  # to track prior focus element
             self.elements_flat = []  # Linear list of interactive elements
+            self.draw_list = []  # every laid out element in drawing order
             self.element_coords = []  # List of (x1, y1, x2, y2, element)
             self.clickable_zones = []  # List of (x1, y1, x2, y2, handler, name, element)
             self.layout_map = {}  # element -> (x, y)
+            self._layout_cache = {}  # frame -> what its subtree added to the layout last time, see compute_layout
+            self._layout_dirty = set()  # elements changed since they were last laid out
+            self._scene_cache = {}  # canvas/image element -> ((scene version or image, cols, rows, mode), pixels, texts)
+            self._redraw = set()  # elements changed since the layers were last drawn
+            self._stamp = None  # frame_stamp() of the last drawn frame
+            self._surfaces = {}  # frame or loose element -> (subtree key, surface canvas, spans, bounds), see node_surface
+            self._layer_backgrounds = {}  # layer name -> (key, rows), see layer_background
+            self._backgrounds = {}  # frame element -> what its canvas was painted for, see draw_frame
+            self.app.tree.subscribe(self._on_change)
             self.user_function = user_function
             self.user_loop = user_loop
             self.hover_element = None
@@ -555,8 +2439,9 @@ class ezUI:
             self.bg_color = (0, 0, 246)
             self.fg_color = (255,255,255)
             self.counter = 0
+            self.running = False
             
-            self.screen = cu.initscr()
+            self.screen = cu.initscr() if terminal is None else terminal
             if opts.get("full_screen", False):
                 rows, cols = self.screen.getmaxyx()
             else:
@@ -571,90 +2456,150 @@ class ezUI:
             self.exit_button_rect = (0, 0, 0, 0)
             self.app.cleanup = self.cleanup
             
-            print("TUI started")
-            
-            #Initialize curses here
-            cu.noecho()
-            cu.mousemask(cu.ALL_MOUSE_EVENTS | cu.REPORT_MOUSE_POSITION)
-            print("Capturing mouse movements:")
-            sys.stdout.write("\033[?1000h")  # Enable mouse move tracking
-            sys.stdout.flush()
-            print(" ")
-            self.screen.nodelay(True)  # make getch non-blocking
-            cu.cbreak()
-            cu.curs_set(0)
-            self.screen.keypad(True)
-            
-            # Enable color
-            if cu.has_colors():
-                cu.start_color()
-                cu.init_pair(1, cu.COLOR_WHITE, cu.COLOR_BLACK)
-
-            # Optional: catch cleanup on exit
-            import atexit
-            atexit.register(self.cleanup)
+            if terminal is None:
+                print("TUI started")
+                
+                #Initialize curses here
+                cu.noecho()
+                cu.mousemask(cu.ALL_MOUSE_EVENTS | cu.REPORT_MOUSE_POSITION)
+                print("Capturing mouse movements:")
+                sys.stdout.write("\033[?1000h")  # Enable mouse move tracking
+                sys.stdout.flush()
+                print(" ")
+                self.screen.nodelay(True)  # make getch non-blocking
+                cu.cbreak()
+                cu.curs_set(0)
+                self.screen.keypad(True)
+                
+                # Enable color
+                if cu.has_colors():
+                    cu.start_color()
+                    cu.init_pair(1, cu.COLOR_WHITE, cu.COLOR_BLACK)
+
+                # Optional: catch cleanup on exit
+                import atexit
+                atexit.register(self.cleanup)
             
             self.canvas = ezUI.Canvas(self.computed_width,self.computed_height, ezUI.Canvas.mode.CP437)
-            self.run()
-
-        def run(self):
-            cu.curs_set(0)
+            self.layers = [ezUI.TUI.Layer(name, self.computed_width, self.computed_height) for name in ezUI.TUI.Layer.NAMES]
+            self._dirty = {}  # row -> (x1, x2) of the screen to composite again
+            self._full_redraw = True
+            self._row_sums = {}  # row -> crc32 of what is on screen there, see frame_checksum
+            if terminal is None and opts.get("record"):
+                ezUI.TUI.Recorder(opts.get("record"), self)
+            if autorun:
+                self.run()
+
+        def _start(self):
+            if self.terminal is None:
+                cu.curs_set(0)
             self.screen.keypad(True)
             self.screen.nodelay(True)  # <-- make getch non-blocking
             self.running = True
 
             if self.user_function:
-                self.user_function(self.app.system(self.app), self.app.data)
-                
-            self.make_optionmenus(self.app.root_element)
+                self.app.schedule(self.user_function(self.app.system(self.app), self.app.data))
 
             self.draw_ui()
-            
+            self.app.painted()
+            if self.recorder is not None:
+                self.recorder.frame()
+            # Dropdown lists start collapsed, so they can wait until the first frame is on screen
+            self.make_optionmenus(self.app.root_element)
+
+        def run(self):
+            self._start()
             while self.running:
-                self.blink_timer += 1
-                
-                if self.blink_timer >= 20:
-                    self.blink_timer = 0
-                    self.blink_state = not self.blink_state
-                
-                try:
-                    id, self.mouse_x, self.mouse_y, _, bstate = cu.getmouse()
-                    self._check_hover()
-    
-                    self.mouse_left = False
-                    self.mouse_right = False
-                    
-                    self.mouse_left = bool(bstate & cu.BUTTON1_CLICKED)
-                    self.mouse_right = bool(bstate & cu.BUTTON3_CLICKED)  # BUTTON2 = middle click                          
-                        
-                    self.handle_mouse()
-                    
-                except cu.error:
-                    pass
-                
-                key = self.screen.getch()
-                if key != -1:
-                    self.handle_input(key)
-                
+                self.step()
                 if self.user_loop:
-                    self.user_loop(self.system(self.app), self.app.data)
-                
-                self.draw_ui()
-                
-                if self._close_dropdown_next_frame:
-                    dropdown = self.system.get_element_by_name(self.active_dropdown)
-                    if dropdown:
-                        dropdown.attributes["visibility"] = "collapsed"
-                        dropdown.visibility = "collapsed"
-                    self.active_dropdown = None
-                    self._close_dropdown_next_frame = False
-                    self.compute_layout()
-                
-                if self.dropdown_guard:
-                    self.dropdown_guard = False
-                    
+                    self.app.run_loop(self.user_loop, self.system)
+                self.finish_frame()
                 time.sleep(0.01)  # small delay to prevent CPU spinning
+
+        async def run_async(self):
+            # Same frame as run(), but yields to the asyncio loop between frames
+            ezUI.require("asyncio")
+            self._start()
+            while self.running:
+                self.step()
+                if self.user_loop:
+                    self.app.run_loop(self.user_loop, self.system)
+                self.finish_frame()
+                await asyncio.sleep(0.01)
+
+        def step(self):
+            # Input half of a frame: worker results, blink, mouse and keyboard
+            self.app.executor.pump()
+            self.tick()
+            
+            try:
+                getmouse = cu.getmouse if self.terminal is None else self.terminal.getmouse
+                id, x, y, _, bstate = getmouse()
+            except cu.error:
+                pass
+            else:
+                self.feed("mouse", x, y, bstate)
+            
+            key = self.screen.getch()
+            if key != -1:
+                self.feed("key", key)
+
+        def tick(self):
+            # The cursor blinks every 20 frames, counted in frames so a replay blinks the same
+            self.blink_timer += 1
+            
+            if self.blink_timer >= 20:
+                self.blink_timer = 0
+                self.blink_state = not self.blink_state
+
+        def feed(self, kind, *args):
+            # One ("key", code) or ("mouse", x, y, bstate) event into the UI, from the terminal or
+            # from a TUI.Replayer
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.write(kind, *args)
+                recorder.muted += 1  # what the handlers change comes back when the event is replayed
+            try:
+                if kind == "key":
+                    self.handle_input(*args)
+                else:
+                    self.mouse_event(*args)
+            finally:
+                if recorder is not None:
+                    recorder.muted -= 1
+
+        def mouse_event(self, x, y, bstate):
+            self.mouse_x, self.mouse_y = x, y
+            self._check_hover()
+
+            self.mouse_left = False
+            self.mouse_right = False
+            
+            self.mouse_left = bool(bstate & cu.BUTTON1_CLICKED)
+            self.mouse_right = bool(bstate & cu.BUTTON3_CLICKED)  # BUTTON2 = middle click                          
                 
+            self.handle_mouse()
+
+        def finish_frame(self):
+            # Draw half of a frame, runs after user_loop
+            self.app.update_repeaters()
+            self.draw_ui()
+            
+            if self._close_dropdown_next_frame:
+                dropdown = self.system.get_element_by_name(self.active_dropdown)
+                if dropdown:
+                    dropdown.attributes["visibility"] = "collapsed"
+                    dropdown.visibility = "collapsed"
+                self.active_dropdown = None
+                self._close_dropdown_next_frame = False
+                self.compute_layout()
+            
+            if self.dropdown_guard:
+                self.dropdown_guard = False
+
+            if self.recorder is not None:
+                self.recorder.frame()
+            
         def _check_hover(self):
             for x1, y1, x2, y2, handler, name, element in self.clickable_zones:
                 if x1 <= self.mouse_x <= x2 and y1 == self.mouse_y:
@@ -702,12 +2647,12 @@ class ezUI:
         def make_optionmenus(self,parent):
             
             def make_dropdowns_recursive(el):
-                if el.tag.lower() == "optionmenu":
-                    name = el.attributes.get("name")
+                if el.tag == "optionmenu":
+                    name = el.attr("name")
                     if not name:
                         pass  # require name for tracking
                     else:
-                        key = el.attributes.get("ezBind", "").strip("()")
+                        key = el.binding.key
                         dropdown_data = self.app.data.get(key, {"options": [], "selected_index": 0})
                         options = dropdown_data.get("options", {})
                         labels = list(options.keys())
@@ -738,8 +2683,9 @@ class ezUI:
                                 "width": str(max_label_len + 4)
                             })
                             
-                            def make_handler(index, ui=self):  # ← capture self as ui
+                            def make_handler(index):
                                 def handler(e, system, data):
+                                    ui = system.app.backend  # not the TUI that bound it, sessions share the data model
                                     if key:
                                         obj = data.get(key)
                                         if isinstance(obj, dict) and "selected_index" in obj:
@@ -753,7 +2699,7 @@ class ezUI:
                                         dropdown.visibility = "collapsed"
                                     
                                     ui.active_dropdown = None
-                                    self.dropdown_opener_name = None
+                                    ui.dropdown_opener_name = None
                                     ui.compute_layout()
                                 return handler
                             
@@ -763,10 +2709,10 @@ class ezUI:
                                 
                             drop_frame.add_child(btn)
 
-                            # Register and append dropdown frame
-                            self.dropdowns[name] = (el, drop_frame)
-                            self.app.register_element(drop_frame)
-                            self.app.root_element.add_child(drop_frame)
+                        # Register and append dropdown frame, once per dropdown
+                        self.dropdowns[name] = (el, drop_frame)
+                        self.app.root_element.add_child(drop_frame)
+                        self._mark_dirty(el)  # its layout gets the toggle zone now
                             
                 for child in el.children: 
                     make_dropdowns_recursive(child)
@@ -774,6 +2720,35 @@ class ezUI:
             for child in parent.children: 
                 make_dropdowns_recursive(child)
 
+        def render(self, root_element=None):
+            # The TUI lays out and redraws every frame, so a new tree only needs swapping in
+            if root_element is not None:
+                self.app.set_root(root_element)
+            self._layout_cache.clear()  # the tree may have been changed behind our back
+            for layer in self.layers:
+                layer.key = None
+                layer.background = None
+            self._surfaces.clear()
+            self._stamp = None
+            self.app.update_repeaters()
+            self.compute_layout()
+
+        def _on_change(self, event, element, detail):
+            # Tree listener: the frames holding element have to be laid out again
+            if event == "remove":
+                for el in self.app.tree._walk(detail):
+                    self._layout_cache.pop(el, None)
+                    self._scene_cache.pop(el, None)
+                    self._surfaces.pop(el, None)
+                    self._backgrounds.pop(el, None)
+            self._redraw.add(element)
+            self._mark_dirty(element)
+
+        def _mark_dirty(self, element):
+            while element is not None and element not in self._layout_dirty:
+                self._layout_dirty.add(element)
+                element = element.parent
+
         def compute_layout(self):
             self.elements_flat = []
             self.layout_map = {}
@@ -782,17 +2757,17 @@ class ezUI:
                 stack = [root]
                 while stack:
                     el = stack.pop()
-                    if el.attributes.get("ezModal", "").lower() in ("clear", "opaque") and el.visibility == "visible":
+                    if el.props.modal in ("clear", "opaque") and el.visibility == "visible":
                         return el
                     stack.extend(el.children[::-1])
                 return None
 
             modal_element = find_modal(self.app.root_element)
             self.active_modal_element = modal_element
-            self.modal_root_name = modal_element.attributes.get("name") if modal_element else None
+            self.modal_root_name = modal_element.attr("name") if modal_element else None
             
             el = self.app.root_element
-            self.title = el.attributes.get("title", "ezUI")
+            self.title = el.attr("title", "ezUI")
 
             max_width = self.window_body_width
             max_height = self.window_body_height
@@ -826,24 +2801,23 @@ class ezUI:
                         child
                     ))
                     
-                    if child.tag.lower() in ["button", "checkbutton", "radiobutton"]:
-                        name = child.attributes.get("name")
-                        handler_name = child.attributes.get("ezClick")
+                    if child.tag in ["button", "checkbutton", "radiobutton"]:
+                        name = child.attr("name")
+                        handler_name = child.attr("ezClick")
                         x, y = self.layout_map[child]
 
                         # Default handler for toggling checkbutton or selecting radiobutton
                         def default_handler(e, system, data):
-                            key = e.attributes.get("ezBind", "").strip("()")
-                            if not key:
+                            binding = e.binding
+                            if not binding:
                                 return
-                            if e.tag.lower() == "checkbutton":
-                                current = data.get(key, False)
-                                data.update(key, not bool(current))
-                            elif e.tag.lower() == "radiobutton":
-                                key = e.attributes.get("ezBind", "").strip("()")
-                                value = e.attributes.get("value")
-                                if key and value:
-                                    data.update(key, value)
+                            if e.tag == "checkbutton":
+                                current = binding.get(data, False)
+                                binding.set(data, not bool(current))
+                            elif e.tag == "radiobutton":
+                                value = e.attr("value")
+                                if value:
+                                    binding.set(data, value)
 
                         if name:
                             if handler_name:
@@ -853,10 +2827,10 @@ class ezUI:
                             else:
                                 handler = default_handler
 
-                            self.clickable_zones.append((x,y,x + width - 1,y,lambda h=handler, e=child: h(e, self.app.system(self.app), self.app.data),name,child))
+                            self.clickable_zones.append((x,y,x + width - 1,y,lambda h=handler, e=child: self.app.call_handler(h, e),name,child))
                     
-                    elif child.tag.lower() == "optionmenu":
-                        name = child.attributes.get("name")
+                    elif child.tag == "optionmenu" and child.attr("name") in self.dropdowns:  # made after the first frame
+                        name = child.attr("name")
                         x, y = self.layout_map[child]
                         
                         # Add clickable dropdown toggle zone
@@ -864,18 +2838,18 @@ class ezUI:
                             def open_dropdown(e=toggle_element, dropdown=dropdown_element):                                    
 
                                 # Collapse previous dropdown if it's different
-                                if self.active_dropdown and self.active_dropdown != dropdown.attributes.get("name"):
+                                if self.active_dropdown and self.active_dropdown != dropdown.attr("name"):
                                     prev = self.app.system(self.app).get_element_by_name(self.active_dropdown)
                                     if prev:
                                         prev.attributes["visibility"] = "collapsed"
                                         prev.visibility = "collapsed"
 
                                 # Toggle this one
-                                current_visibility = dropdown.attributes.get("visibility", "collapsed")
+                                current_visibility = dropdown.attr("visibility", "collapsed")
                                 new_state = "visible" if current_visibility == "collapsed" else "collapsed"
 
                                 dropdown.attributes["visibility"] = new_state
-                                self.dropdown_opener_name = toggle_element.attributes.get("name")
+                                self.dropdown_opener_name = toggle_element.attr("name")
                                 dropdown.visibility = new_state
                                 self.active_dropdown = dropdown.attributes["name"] if new_state == "visible" else None
                                 self.dropdown_guard = (new_state == "visible")
@@ -914,17 +2888,19 @@ class ezUI:
                         if drop_y + drop_height > window_height:
                             drop_y = max(0, window_height - drop_height)
 
-                        drop_frame.attributes["x"] = str(x * 8)
-                        drop_frame.attributes["y"] = str(drop_y * 16)
+                        if drop_frame.props.x != x * 8 or drop_frame.props.y != drop_y * 16:
+                            drop_frame.attributes["x"] = x * 8
+                            drop_frame.attributes["y"] = drop_y * 16
                         
                 for child in element.children:                    
                     if child.visibility == "collapsed":
                         continue
                         
-                    tag = child.tag.lower()
-                    side = child.layout["side"]
-                    padx, pady = self.downscale_resolution(int(child.layout["padx"]), int(child.layout["pady"]))
-                    raw_text = child.attributes.get("text", "")
+                    tag = child.tag
+                    props = child.props
+                    side = props.side
+                    padx, pady = self.downscale_resolution(props.padx, props.pady)
+                    raw_text = child.attr("text", "")
                     text_width = len(str(raw_text))
                     
                     # Estimate default width for non-frame controls
@@ -932,13 +2908,13 @@ class ezUI:
                     est_height = 1
                     if tag == "label":
                         est_width = text_width + 2
-                        text = child.attributes.get("text", "")
+                        text = child.attr("text", "")
                         num_lines = text.count("\n") + 1
-                        est_height = max(num_lines, int(child.attributes.get("height", num_lines)))
+                        est_height = max(num_lines, props.height if props.height is not None else num_lines)
                     elif tag == "button":
-                        text = child.attributes.get("text", "")
+                        text = child.attr("text", "")
                         text_width = len(text)                        
-                        el_width = int(child.attributes.get("width","10"))
+                        el_width = props.width if props.width is not None else 10
                         space_len = 0 if el_width == (text_width + 4) else  (el_width - (text_width + 4))
                         if text_width/2 != math.floor(text_width/2):
                             space_len +=1
@@ -946,8 +2922,7 @@ class ezUI:
                     elif tag in ["checkbutton", "radiobutton"]:
                         est_width = text_width + 4
                     elif tag == "optionmenu":
-                        key = child.attributes.get("ezBind", "").strip("()")
-                        dropdown_data = self.app.data.get(key, {"options": [], "selected_index": 0})
+                        dropdown_data = child.binding.get(self.app.data, {"options": [], "selected_index": 0})
                         options = dropdown_data.get("options", {})
                         selected_index = dropdown_data.get("selected_index", 0)
                         labels = list(options.keys())
@@ -956,15 +2931,25 @@ class ezUI:
                         max_label_len = max((len(label) for label in labels), default=0)
                         dropdown_width = max_label_len + 4                        
                         est_width = dropdown_width
-                        child.attributes["width"] = est_width
-
-                    width = int(child.attributes.get("width", est_width))
-                    height = int(child.attributes.get("height", est_height))                   
+                        if props.width != est_width:
+                            child.attributes["width"] = est_width
+                            props = child.props
+
+                    elif tag in ("canvas", "chart"):
+                        # width/height are real pixels, like in the GUI
+                        est_width, est_height = self.downscale_resolution(
+                            props.width if props.width is not None else 200,
+                            props.height if props.height is not None else 100)
+                    elif tag == "image":
+                        est_width, est_height = self.image_cells(child)
+
+                    width = props.width if props.width is not None and tag not in ("canvas", "image", "chart") else est_width
+                    height = props.height if props.height is not None and tag not in ("canvas", "image", "chart") else est_height
                     
                     # --- Handle <frame> ---
                     if tag == "frame":                        
-                        child_width = int(child.attributes.get("width", -1))
-                        child_height = int(child.attributes.get("height", -1))
+                        child_width = props.width if props.width is not None else -1
+                        child_height = props.height if props.height is not None else -1
 
                         if element.tag == "window" and (child_width <= 0 or child_height <= 0):
                             usable_w = self.window_body_width
@@ -972,37 +2957,67 @@ class ezUI:
                             child_width = usable_w if child_width <= 0 else child_width
                             child_height = usable_h if child_height <= 0 else child_height
 
-                            if "x" not in child.attributes and "y" not in child.attributes:
+                            if props.x is None and props.y is None:
                                 layout_x = layout_offset_x + (usable_w - child_width) // 2
                                 layout_y = layout_offset_y
                             else:
-                                layout_x, layout_y = self.downscale_resolution(
-                                    int(child.attributes.get("x", 0)), int(child.attributes.get("y", 0))
-                                )
+                                layout_x, layout_y = self.downscale_resolution(props.x or 0, props.y or 0)
                         else:
                             child_width = child_width if child_width > 0 else 10
                             child_height = child_height if child_height > 0 else 5
 
-                            if "x" in child.attributes and "y" in child.attributes:
-                                layout_x, layout_y = self.downscale_resolution(
-                                    int(child.attributes["x"]), int(child.attributes["y"])
-                                )
+                            if props.x is not None and props.y is not None:
+                                layout_x, layout_y = self.downscale_resolution(props.x, props.y)
                             else:
                                 layout_x, layout_y = cursor_x, cursor_y
 
                         self.layout_map[child] = (layout_x, layout_y)
-                        child.canvas = ezUI.Canvas(child_width, child_height, ezUI.Canvas.mode.CP437)
                         child.x, child.y = layout_x, layout_y
                         child.width, child.height = child_width, child_height
-                        layout_recursive(child, layout_x, layout_y)
+
+                        # A frame that didn't change, didn't move and whose data didn't change lays out
+                        # the same, so replay what it added last time instead of walking it again
+                        data = self.app.data
+                        key = (layout_x, layout_y, child_width, child_height,
+                               self.computed_width, self.window_body_width, self.window_body_height)
+                        cached = self._layout_cache.get(child)
+                        if (cached is not None and cached[0] == key and child not in self._layout_dirty
+                                and all(data.version(k) == v for k, v in cached[1].items())):
+                            _, deps, flat, coords, zones, placed = cached
+                            self.elements_flat.extend(flat)
+                            self.element_coords.extend(coords)
+                            self.clickable_zones.extend(zones)
+                            self.layout_map.update(placed)
+                            if data._tracking:
+                                data._tracking[-1].update(deps)
+                        else:
+                            self._layout_dirty.discard(child)
+                            if child.canvas is None or (child.canvas.width, child.canvas.height) != (child_width, child_height):
+                                child.canvas = ezUI.Canvas(child_width, child_height, ezUI.Canvas.mode.CP437)
+                            marks = (len(self.elements_flat), len(self.element_coords), len(self.clickable_zones), len(self.layout_map))
+                            captured = set()
+                            data._tracking.append(captured)
+                            try:
+                                layout_recursive(child, layout_x, layout_y)
+                            finally:
+                                data._tracking.pop()
+                            if data._tracking:
+                                data._tracking[-1].update(captured)
+                            self._layout_cache[child] = (
+                                key,
+                                {k: data.version(k) for k in captured},
+                                self.elements_flat[marks[0]:],
+                                self.element_coords[marks[1]:],
+                                self.clickable_zones[marks[2]:],
+                                dict(islice(self.layout_map.items(), marks[3], None)),
+                            )
                         
                         self.modal_root_name = None
                         self.active_modal_element = None
                         modal_element = None
                         
-                        modal_type = child.attributes.get("ezModal", "None").lower()
-                        if modal_type in ["clear", "opaque"]:
-                            self.modal_root_name = child.attributes.get("name")
+                        if props.modal in ("clear", "opaque"):
+                            self.modal_root_name = child.attr("name")
                             modal_element = child
                             self.active_modal_element = modal_element
                             break
@@ -1012,7 +3027,7 @@ class ezUI:
                             allowed = set()
 
                             def collect_subtree_names(e):
-                                name = e.attributes.get("name")
+                                name = e.attr("name")
                                 if name:
                                     allowed.add(name)
                                 for child in e.children:
@@ -1030,29 +3045,27 @@ class ezUI:
                             self.clickable_zones = [z for z in self.clickable_zones if z[5] in allowed]
 
                             # Filter element coords
-                            self.element_coords = [e for e in self.element_coords if e[4].attributes.get("name") in allowed]
+                            self.element_coords = [e for e in self.element_coords if e[4].attr("name") in allowed]
                             
                         continue
 
                     # --- Normal element layout ---
-                    if "x" in child.attributes and "y" in child.attributes:
-                        layout_x, layout_y = self.downscale_resolution(
-                            int(child.attributes["x"]), int(child.attributes["y"])
-                        )
+                    if props.x is not None and props.y is not None:
+                        layout_x, layout_y = self.downscale_resolution(props.x, props.y)
                     elif side == "top":
                         cursor_y += pady
                         layout_x = max(0, (self.computed_width - width) // 2) if tag in [
                             "label", "entry", "button",
-                            "checkbutton", "radiobutton","optionmenu"
-                        ] and "padx" not in child.attributes else cursor_x + padx
+                            "checkbutton", "radiobutton", "optionmenu", "canvas", "image", "chart"
+                        ] and child.attr("padx") is None else cursor_x + padx
                         layout_y = cursor_y
                         cursor_y += height + pady
                     elif side == "bottom":
                         bottom_y -= height + pady
                         layout_x = max(0, (self.computed_width - width) // 2) if tag in [
                             "label", "entry", "button", 
-                            "checkbutton", "radiobutton","optionmenu"
-                        ] and "padx" not in child.attributes else x + padx
+                            "checkbutton", "radiobutton", "optionmenu", "canvas", "image", "chart"
+                        ] and child.attr("padx") is None else x + padx
                         layout_y = bottom_y
                     elif side == "left":
                         layout_x = cursor_x
@@ -1083,6 +3096,12 @@ class ezUI:
                     layout_recursive(child, layout_x, layout_y)
                         
             layout_recursive(el, layout_offset_x, layout_offset_y)
+            self.draw_list = self.elements_flat  # everything laid out, before a modal filters the input
+            # Start over for the next change. Frames still marked weren't laid out this time (e.g.
+            # inside a collapsed frame), so what they cached can't be replayed later either.
+            for element in self._layout_dirty:
+                self._layout_cache.pop(element, None)
+            self._layout_dirty.clear()
             
             if self.active_modal_element:
                 allowed = set()
@@ -1093,24 +3112,35 @@ class ezUI:
                         collect_modal_subtree(c)
 
                 collect_modal_subtree(self.active_modal_element)
-                modal_type = self.active_modal_element.attributes.get("ezModal","clear").lower()
-                if modal_type == "opaque":
+                if self.active_modal_element.props.modal == "opaque":
                     self.elements_flat = [e for e in self.elements_flat if e in allowed]
                 self.element_coords = [z for z in self.element_coords if z[4] in allowed]
                 self.clickable_zones = [z for z in self.clickable_zones if z[6] in allowed]
 
+        # One level of the z-order: base UI, an open modal, dropdown lists, then the window chrome.
+        # Each layer draws into its own canvas, and only again when what it shows changed; the
+        # upper layers are transparent (None) where they don't draw.
+        class Layer:
+            __slots__ = ("name", "canvas", "key", "members", "background", "placed")
+            NAMES = ("base", "modal", "popup", "overlay")
+
+            def __init__(self, name, width, height):
+                self.name = name
+                self.canvas = ezUI.Canvas(width, height, ezUI.Canvas.mode.CP437)
+                if name != "base":
+                    self.canvas.buffer = [[None] * width for _ in range(height)]
+                self.key = None         # what the layer was last drawn from
+                self.members = set()    # elements it drew, a change to one of them redraws it
+                self.background = None  # (key, rows) the layer is painted over, see draw_layer
+                self.placed = []        # (node, surface, spans, bounds) of its top level nodes
+
         def draw_ui(self):
-            self.screen.clear()
             self.element_coords = []
             self.clickable_zones.clear()
-            self.canvas.clear()
 
-            if self.app.options.get("show_title_bar", True):
-                draw_exit = self.app.options.get("show_exit_button", True)
-                highlight = (self.hover_element == "exit_button")
-                self.draw_title_bar(draw_exit, hover=highlight)
-                
-            self.draw_background(color_bg=self.bg_color)
+            show_title_bar = self.app.options.get("show_title_bar", True)
+            if show_title_bar and self.app.options.get("show_exit_button", True):
+                self.add_exit_zone()
             
             self.compute_layout()
             
@@ -1119,41 +3149,352 @@ class ezUI:
             #    self.focus_element = self.elements_flat[self.focus_index]
             #else:
             #    self.focus_element = None
-            
-            self.canvas.setColorBG(self.bg_color)
-            self.canvas.setColorFG(self.fg_color)            
-            
-            for el in self.elements_flat:
-                if el.visibility in ("hidden", "collapsed"):                    
-                    continue
 
-                # walk up parents just to be safe
-                parent = el.parent
-                while parent:
-                    if parent.visibility in ("hidden", "collapsed"):
+            if self._full_redraw:
+                # first frame: curses forgets what was printed before, and every cell is written
+                self._full_redraw = False
+                self.screen.clear()
+                self.canvas.buffer = [[None] * self.computed_width for _ in range(self.computed_height)]
+                self._row_sums.clear()
+                self._dirty = {y: (0, self.computed_width) for y in range(self.computed_height)}
+
+            stamp = self.frame_stamp()
+            if stamp == self._stamp and not self._redraw and not self._dirty:
+                return  # nothing a layer reads moved, the screen is still right
+            self._stamp = stamp
+
+            parts = self.layer_elements()
+            changed, self._redraw = self._redraw, set()
+            touched = set()
+            for el in changed:
+                while el is not None and el not in touched:
+                    touched.add(el)
+                    self._surfaces.pop(el, None)  # drawn again when it is next shown, even if not this frame
+                    el = el.parent
+            for layer in self.layers:
+                elements = parts.get(layer.name, ())
+                members = set(elements)
+                if layer.name == "base":
+                    members.add(self.app.root_element)
+                key, keys = self.layer_key(layer.name, elements)
+                if key == layer.key and changed.isdisjoint(layer.members) and changed.isdisjoint(members):
+                    continue  # cached
+                layer.key = key
+                layer.members = members
+                self.draw_layer(layer, elements, keys)
+
+            self.composite()
+
+        def frame_stamp(self):
+            # A cheap summary of what drawing reads besides the tree (whose changes come in through
+            # _on_change): data, TUI state and the canvases' and charts' own versions
+            data = self.app.data
+            options = self.app.options
+            focus = self.focus_element
+            caret = (self.blink_state, self.cursor_pos, self.insert_mode) if focus is not None and focus.tag == "entry" else None
+            tags = self.app.tree.tags
+            contents = [el._scene.version for el in tags.get("canvas", ()) if el._scene is not None]
+            contents += [getattr(el.binding.get(data), "version", None) for el in tags.get("chart", ())]
+            return (data.revision, self.hover_element, focus, caret, self.bg_color, self.fg_color,
+                    self.computed_width, self.computed_height, options.get("title", "ezUI App"),
+                    options.get("show_title_bar", True), options.get("show_exit_button", True), tuple(contents))
+
+        def layer_elements(self):
+            # Laid out elements by layer: dropdown lists are popups, the open modal's subtree is the
+            # modal layer and the rest is the base UI. An opaque modal hides the base elements.
+            popups = {frame for _, frame in self.dropdowns.values()}
+            modal = self.active_modal_element
+            if modal in popups:
+                modal = None
+            parts = {"base": [], "modal": [], "popup": []}
+            for el in self.draw_list:
+                if el.visibility in ("hidden", "collapsed"):
+                    continue
+                name = "base"
+                parent = el
+                while parent is not None:
+                    if parent in popups:
+                        name = "popup"
                         break
-                    parent = parent.parent                    
-                
-                x, y = self.layout_map.get(el, (0, 0))
-                self.draw_elements_from(el, x, y)            
-            
-            self.draw_borders()
-
-            self.canvas.flush(self.screen)
+                    if parent is modal:
+                        name = "modal"
+                        break
+                    parent = parent.parent
+                parts[name].append(el)
+            if modal is not None and modal.props.modal == "opaque":
+                parts["base"] = []
+            return parts
+
+        def layer_key(self, name, elements):
+            # Everything a layer's drawing reads, besides the element attributes (see _redraw).
+            # Returns it with the key of every element, frame surfaces are keyed on those.
+            key = (self.bg_color, self.fg_color, self.computed_width, self.computed_height)
+            if name == "overlay":
+                options = self.app.options
+                key += (options.get("title", "ezUI App"), options.get("show_title_bar", True),
+                        options.get("show_exit_button", True), self.hover_element == "exit_button")
+                return key, {}
+            data = self.app.data
+            focus = self.focus_element.attr("name") if self.focus_element is not None else None
+            keys = {}
+            for el in elements:
+                content = el._scene
+                if el.tag == "chart":
+                    content = el.binding.get(data)
+                el_key = (el, self.layout_map.get(el), el.width, el.height, data.version(el.binding.key),
+                          getattr(content, "version", None))
+                el_name = el.attr("name")
+                if el_name is not None:
+                    if el_name == self.hover_element:
+                        el_key += ("hover",)
+                    if el_name == focus:
+                        el_key += ("focus",)
+                        if el.tag == "entry":
+                            el_key += (self.blink_state, self.cursor_pos, self.insert_mode)
+                keys[el] = el_key
+            return (key, tuple(keys.values())), keys
+
+        def draw_layer(self, layer, elements, keys):
+            # Draws a layer again, but only where it changed: the area its changed top level nodes
+            # covered before and cover now is painted over with the background, and the nodes that
+            # reach into it are copied back there. Marks that area for composite.
+            canvas = layer.canvas
+            if layer.name == "overlay":
+                old = canvas.buffer
+                canvas.buffer = [[None] * canvas.width for _ in range(canvas.height)]
+                if self.app.options.get("show_title_bar", True):
+                    draw_exit = self.app.options.get("show_exit_button", True)
+                    highlight = (self.hover_element == "exit_button")
+                    self.draw_title_bar(draw_exit, hover=highlight, target=canvas)
+                self.draw_borders(target=canvas)
+                self.damage(old, canvas.buffer)
+                return
+
+            # Every frame's subtree is drawn into a surface that is kept while nothing in it changed;
+            # the layer is put together from those and the surfaces of its loose elements. Frames are
+            # only layout here, so they are found by walking up from the elements.
+            children = {}
+            for el in elements:
+                node = el
+                owner = el.parent
+                while owner is not None:
+                    if owner.tag == "frame":
+                        known = owner in children
+                        children.setdefault(owner, []).append(node)
+                        if known:
+                            break
+                        node = owner
+                    owner = owner.parent
+                else:
+                    children.setdefault(None, []).append(node)
+            keys = dict(keys)
+
+            def subtree_key(node):
+                if node in children:
+                    keys[node] = (keys.get(node, node),) + tuple(subtree_key(child) for child in children[node])
+                return keys[node]
+
+            placed = []
+            for node in children.get(None, ()):
+                subtree_key(node)
+                placed.append((node,) + self.node_surface(node, children, keys)[1:])
+
+            damaged = {}  # row -> (x1, x2)
+
+            def mark(y, x1, x2):
+                if y in damaged:
+                    x1, x2 = min(x1, damaged[y][0]), max(x2, damaged[y][1])
+                damaged[y] = (x1, x2)
+
+            background = self.layer_background(layer.name)
+            if layer.background is None or layer.background[0] != background[0]:
+                layer.background = background  # first time, colours or the title bar changed
+                for y in range(canvas.height):
+                    mark(y, 0, canvas.width)
+            else:
+                before = [(node, surface) for node, surface, _, _ in layer.placed]
+                now = [(node, surface) for node, surface, _, _ in placed]
+                kept = set(before).intersection(now)
+                if [part for part in before if part in kept] != [part for part in now if part in kept]:
+                    for y in range(canvas.height):  # the z-order changed
+                        mark(y, 0, canvas.width)
+                else:
+                    for node, surface, spans, _ in layer.placed + placed:
+                        if (node, surface) not in kept:
+                            for y, x1, x2 in spans:
+                                mark(y, x1, x2)
+
+            rows = layer.background[1]
+            buffer = canvas.buffer
+            for y, (x1, x2) in damaged.items():
+                buffer[y][x1:x2] = rows[y][x1:x2]
+            for node, surface, spans, (left, top, _, _) in placed:
+                source = surface.buffer
+                for y, x1, x2 in spans:
+                    area = damaged.get(y)
+                    if area is None:
+                        continue
+                    x1, x2 = max(x1, area[0]), min(x2, area[1])
+                    if x1 >= x2:
+                        continue
+                    cells = source[y - top][x1 - left:x2 - left]
+                    row = buffer[y]
+                    if None in cells:
+                        cells = [below if cell is None else cell for cell, below in zip(cells, row[x1:x2])]
+                    row[x1:x2] = cells
+            layer.placed = placed
+
+            dirty = self._dirty
+            for y, (x1, x2) in damaged.items():
+                if y in dirty:
+                    x1, x2 = min(x1, dirty[y][0]), max(x2, dirty[y][1])
+                dirty[y] = (x1, x2)
+
+        def layer_background(self, name):
+            # (key, rows) under a layer: the window background for the base layer (the title bar row
+            # stays blank, the overlay draws it), transparent (None) for the others
+            show_title_bar = self.app.options.get("show_title_bar", True)
+            key = (name, self.bg_color, show_title_bar, self.computed_width, self.computed_height)
+            cached = self._layer_backgrounds.get(name)
+            if cached is None or cached[0] != key:
+                width = self.computed_width
+                if name == "base":
+                    blank = [(" ", tuple(self.bg_color), tuple(self.bg_color))] * width
+                    rows = [[(" ", (255, 255, 255), (0, 0, 0))] * width if show_title_bar and y == 0 else blank
+                            for y in range(self.computed_height)]
+                else:
+                    rows = [[None] * width] * self.computed_height
+                cached = self._layer_backgrounds[name] = (key, rows)  # rows are only read
+            return cached
+
+        def draw_node(self, element, target, children, keys, origin=(0, 0)):
+            # Draws element (and its subtree) into target, whose top left cell is at origin on screen
+            left, top = origin
+            if element.tag != "frame":
+                x, y = self.layout_map.get(element, (0, 0))
+                self.draw_elements_from(element, x - left, y - top, target)
+                return
+            _, surface, spans, bounds = self.node_surface(element, children, keys)
+            source = surface.buffer
+            for y, x1, x2 in spans:
+                cells = source[y - bounds[1]][x1 - bounds[0]:x2 - bounds[0]]
+                row = target.buffer[y - top]
+                if None in cells:
+                    cells = [below if cell is None else cell for cell, below in zip(cells, row[x1 - left:x2 - left])]
+                row[x1 - left:x2 - left] = cells
+
+        def node_surface(self, node, children, keys):
+            # A frame and everything in it (or a loose element) on a transparent canvas just big enough
+            # for what it draws, drawn again only when one of them changed (keys[node] holds the
+            # subtree's keys, see draw_layer). Frames draw nothing themselves. Returns
+            # (key, surface, spans, bounds): spans are the (row, x1, x2) that have anything and bounds
+            # the surface's (x1, y1, x2, y2), all in screen cells.
+            key = (keys[node], self.bg_color, self.fg_color, self.computed_width, self.computed_height)
+            cached = self._surfaces.get(node)
+            if cached is not None and cached[0] == key:
+                return cached
+            members = children[node] if node.tag == "frame" else (node,)
+            x1 = y1 = math.inf
+            x2 = y2 = -math.inf
+            for el in members:
+                if el.tag == "frame":
+                    bounds = self.node_surface(el, children, keys)[3]
+                    if bounds[0] == bounds[2]:
+                        continue  # draws nothing
+                else:
+                    bounds = self.extent(el, *self.layout_map.get(el, (0, 0)))
+                x1, y1 = min(x1, bounds[0]), min(y1, bounds[1])
+                x2, y2 = max(x2, bounds[2]), max(y2, bounds[3])
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(self.computed_width, x2), min(self.computed_height, y2)
+            if x1 >= x2 or y1 >= y2:
+                x1 = y1 = x2 = y2 = 0
+            width = x2 - x1
+            surface = ezUI.Canvas(width, y2 - y1, ezUI.Canvas.mode.CP437)
+            surface.buffer = [[None] * width for _ in range(surface.height)]
+            for el in members:
+                self.draw_node(el, surface, children, keys, (x1, y1))
+            spans = []
+            for y, row in enumerate(surface.buffer, y1):
+                if row.count(None) != width:
+                    start = next(x for x, cell in enumerate(row) if cell is not None)
+                    end = width - next(x for x, cell in enumerate(reversed(row)) if cell is not None)
+                    spans.append((y, x1 + start, x1 + end))
+            cached = self._surfaces[node] = (key, surface, spans, (x1, y1, x2, y2))
+            return cached
+
+        def damage(self, old, new):
+            # Marks the span of every row that differs between two versions of a layer
+            dirty = self._dirty
+            for y, (old_row, new_row) in enumerate(zip(old, new)):
+                if old_row == new_row:
+                    continue
+                cells = list(zip(old_row, new_row))
+                x1 = next(x for x, (a, b) in enumerate(cells) if a != b)
+                x2 = len(cells) - next(x for x, (a, b) in enumerate(reversed(cells)) if a != b)
+                if y in dirty:
+                    x1, x2 = min(x1, dirty[y][0]), max(x2, dirty[y][1])
+                dirty[y] = (x1, x2)
+
+        def composite(self):
+            # Stacks the layers again over the dirty spans only, and writes the cells that moved
+            dirty, self._dirty = self._dirty, {}
+            if not dirty:
+                return
+            base = self.layers[0].canvas.buffer
+            upper = [layer.canvas.buffer for layer in self.layers[1:]]
+            frame = self.canvas.buffer
+            for y in sorted(dirty):
+                x1, x2 = dirty[y]
+                row = base[y][x1:x2]
+                for buffer in upper:
+                    cells = buffer[y][x1:x2]
+                    if cells.count(None) != len(cells):
+                        row = [below if cell is None else cell for cell, below in zip(cells, row)]
+                if frame[y][x1:x2] != row:
+                    frame[y][x1:x2] = row
+                    self._row_sums.pop(y, None)
+                    if self.terminal is not None:
+                        self.terminal.write_cells(y, x1, row)
+                    else:
+                        self.canvas._write_cells(self.screen, y, x1, row)
             self.screen.refresh()
-            
-        def draw_title_bar(self, show_exit, hover=False):
-            self.canvas.setColorBG(227, 240, 236)
-            self.canvas.setColorFG(0, 0, 0)
+
+        def frame_checksum(self):
+            # crc32 of what is on screen, a row is only summed again after composite changed it
+            sums = self._row_sums
+            crc = 0
+            for y, row in enumerate(self.canvas.buffer):
+                row_sum = sums.get(y)
+                if row_sum is None:
+                    row_sum = sums[y] = zlib.crc32(repr(row).encode("utf-8"))
+                crc = zlib.crc32(row_sum.to_bytes(4, "little"), crc)
+            return crc
+
+        def add_exit_zone(self):
+            exit_label = "[X]"
+            exit_x = self.computed_width - len(exit_label) - 1
+            element = ezUI.Element("button", {"name": "sys_exit", "text": "exit"})
+            self.clickable_zones.append((
+                exit_x, 0, exit_x + len(exit_label) - 1, 0,
+                self.app.system(self.app).exit,
+                "exit_button",  # Identifier for hover matching
+                element
+            ))
+
+        def draw_title_bar(self, show_exit, hover=False, target=None):
+            target = target or self.canvas
+            target.setColorBG(227, 240, 236)
+            target.setColorFG(0, 0, 0)
             w = self.computed_width
             title = self.app.options.get("title", "ezUI App")
 
             # Fill the title bar background
             for x in range(self.computed_width):
-                self.canvas.draw_char(x, 0, ' ')
+                target.draw_char(x, 0, ' ')
 
             # Draw title text
-            self.canvas.text(1, 0, title)
+            target.text(1, 0, title)
 
             if show_exit:
                 exit_label = "[X]"
@@ -1161,77 +3502,104 @@ class ezUI:
 
                 # Highlight effect if hovered
                 if hover:
-                    self.canvas.setColorBG(0, 0, 0)
-                    self.canvas.setColorFG(227, 240, 236)
+                    target.setColorBG(0, 0, 0)
+                    target.setColorFG(227, 240, 236)
                 else:
-                    self.canvas.setColorBG(227, 240, 236)
-                    self.canvas.setColorFG(0, 0, 0)
-                    
-                element = ezUI.Element("button", {"name": "sys_exit", "text": "exit"})
-
-                self.canvas.text(exit_x, 0, exit_label)
-                self.clickable_zones.append((
-                    exit_x, 0, exit_x + len(exit_label) - 1, 0,
-                    self.app.system(self.app).exit,
-                    "exit_button",  # Identifier for hover matching
-                    element
-                ))
+                    target.setColorBG(227, 240, 236)
+                    target.setColorFG(0, 0, 0)
+
+                target.text(exit_x, 0, exit_label)
             
-        def draw_background(self, color_bg=(30, 30, 30)):
-            self.canvas.setColorBG(*color_bg)
-            self.canvas.setColorFG(*color_bg)  # Use same FG to hide text artifacts
+        def draw_background(self, color_bg=(30, 30, 30), target=None):
+            target = target or self.canvas
+            target.setColorBG(*color_bg)
+            target.setColorFG(*color_bg)  # Use same FG to hide text artifacts
             start_y = 1 if self.app.options.get("show_title_bar", True) else 0
-            self.canvas.fillbox(0, start_y, self.computed_width - 1, self.computed_height - 1)
+            target.fillbox(0, start_y, self.computed_width - 1, self.computed_height - 1)
                     
         def draw_elements_from(self, element, x, y, target=None):
             target = target or self.canvas
             if element.visibility in ("hidden", "collapsed"):
                 return # skip entirely
                 
-            tag = element.tag.lower()
+            tag = element.tag
             if tag == "label":
-                self.draw_label(element, x, y)
+                self.draw_label(element, x, y, target)
             elif tag == "entry":
-                self.draw_entry(element, x, y)
+                self.draw_entry(element, x, y, target)
             elif tag == "button":
-                self.draw_button(element, x, y)
+                self.draw_button(element, x, y, target)
             elif tag == "checkbutton":
-                self.draw_checkbutton(element, x, y)
+                self.draw_checkbutton(element, x, y, target)
             elif tag == "radiobutton":
-                self.draw_radiobutton(element, x, y)
+                self.draw_radiobutton(element, x, y, target)
             elif tag == "frame":
-                self.draw_frame(element, x, y)
+                self.draw_frame(element, x, y, target)
             elif tag == "optionmenu":
-                self.draw_optionmenu(element, x, y)
+                self.draw_optionmenu(element, x, y, target)
+            elif tag == "canvas":
+                self.draw_canvas(element, x, y, target)
+            elif tag == "image":
+                self.draw_image(element, x, y, target)
+            elif tag == "chart":
+                self.draw_chart(element, x, y, target)
                     
-        def draw_borders(self):
+        def draw_borders(self, target=None):
+            target = target or self.canvas
             title_offset = 1 if self.app.options.get("show_title_bar", True) else 0
-            self.canvas.setColorBG(self.bg_color)
-            self.canvas.setColorFG(self.fg_color)
+            target.setColorBG(self.bg_color)
+            target.setColorFG(self.fg_color)
             
             for y in range(title_offset,self.computed_height):                
-                self.canvas.draw_char(0, y, '│')
-                self.canvas.draw_char(self.computed_width - 1, y, '│')
+                target.draw_char(0, y, '│')
+                target.draw_char(self.computed_width - 1, y, '│')
         
             for x in range(self.computed_width):
-                self.canvas.draw_char(x, self.computed_height - 1, '─')
+                target.draw_char(x, self.computed_height - 1, '─')
                 
-            self.canvas.draw_char(0, self.computed_height - 1, '└')
-            self.canvas.draw_char(self.computed_width - 1, self.computed_height - 1, '┘')
+            target.draw_char(0, self.computed_height - 1, '└')
+            target.draw_char(self.computed_width - 1, self.computed_height - 1, '┘')
                     
+        def extent(self, element, x, y):
+            # The cells a loose element at x, y draws into as (x1, y1, x2, y2), the same as its draw_*
+            # method. Frame surfaces are sized from these.
+            tag = element.tag
+            props = element.props
+            width, height = 0, 1
+            if tag == "label":
+                binding = element.binding
+                lines = (binding.text(self.app.data) if binding else element.attr("text", "")).split("\n")
+                return x + 1, y, x + 1 + max(len(line) for line in lines), y + len(lines)
+            elif tag == "entry":
+                width = props.width if props.width is not None else 12
+            elif tag == "button":
+                width = max(len(element.attr("text", "Button")) + 5, (props.width if props.width is not None else 10) + 2)
+            elif tag in ("checkbutton", "radiobutton"):
+                width = len(element.attr("text", "")) + 4
+            elif tag == "optionmenu":
+                options = element.binding.get(self.app.data, {"options": [], "selected_index": 0}).get("options", [])
+                width = max((len(label) for label in options), default=0) + 4
+            elif tag in ("canvas", "chart"):
+                width, height = self.downscale_resolution(props.width if props.width is not None else 200,
+                                                          props.height if props.height is not None else 100)
+            elif tag == "image":
+                width, height = self.image_cells(element)
+            else:
+                height = 0
+            return x, y, x + width, y + height
+
         def draw_label(self, element, x, y, target=None):
             target = target or self.canvas
-            bg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), self.bg_color)
-            fg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), self.fg_color)
+            bg = element.props.bg_rgb or self.bg_color
+            fg = element.props.fg_rgb or self.fg_color
             target.setColorBG(*bg)
             target.setColorFG(*fg)
             
-            text = ""
-            if 'ezBind' in element.attributes:
-                key = element.attributes['ezBind'].strip("()")
-                text = self.app.data.get(key, '')
-            elif 'text' in element.attributes:
-                text = element.attributes['text']
+            binding = element.binding
+            if binding:
+                text = binding.text(self.app.data)
+            else:
+                text = element.attr("text", "")
                 
             lines = text.split("\n")
                 
@@ -1245,17 +3613,16 @@ class ezUI:
             
         def draw_entry(self, element, x, y, target=None):
             target = target or self.canvas
-            bg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), "#ffffff")
-            fg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), "#000000")
-            self.canvas.setColorBG(*bg)
-            self.canvas.setColorFG(*fg)
-            key = element.attributes.get("ezBind", "").strip("()")
-            text = str(self.app.data.get(key, ""))
-            max_length = int(element.attributes.get("width", 12))
+            bg = element.props.bg_rgb or (255, 255, 255)
+            fg = element.props.fg_rgb or (0, 0, 0)
+            target.setColorBG(*bg)
+            target.setColorFG(*fg)
+            text = str(element.binding.get(self.app.data, ""))
+            max_length = element.props.width if element.props.width is not None else 12
             
             is_focus = (
                 self.focus_element is not None and
-                element.attributes.get("name") == self.focus_element.attributes.get("name")
+                element.attr("name") == self.focus_element.attr("name")
             )
 
             cursor = self.cursor_pos if is_focus else len(text)
@@ -1294,15 +3661,15 @@ class ezUI:
             
         def draw_button(self, element, x, y, target=None):
             target = target or self.canvas
-            text = element.attributes.get("text", "Button")
-            is_hover = self.hover_element == element.attributes.get("name")
+            text = element.attr("text", "Button")
+            is_hover = self.hover_element == element.attr("name")
             is_focus = (
                 self.focus_element is not None and
-                element.attributes.get("name") == self.focus_element.attributes.get("name")
+                element.attr("name") == self.focus_element.attr("name")
             )
             
             text_width = len(text)
-            el_width = int(element.attributes.get("width","10"))
+            el_width = element.props.width if element.props.width is not None else 10
             space_len = 0 if el_width == (text_width + 4) else  (el_width - (text_width + 4))
             
             if space_len/2 != math.floor(space_len/2):
@@ -1325,8 +3692,8 @@ class ezUI:
                     target.setColorFG(255, 255, 255)   # white text
                 else:
                     # Default button style (light)
-                    bg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), "#cccccc")
-                    fg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), "#000000")
+                    bg = element.props.bg_rgb or (204, 204, 204)
+                    fg = element.props.fg_rgb or (0, 0, 0)
                     target.setColorBG(*bg)
                     target.setColorFG(*fg)
 
@@ -1337,15 +3704,14 @@ class ezUI:
 
         def draw_checkbutton(self, element, x, y, target=None):
             target = target or self.canvas
-            key = element.attributes.get("ezBind", "").strip("()")
-            state = bool(self.app.data.get(key, False))
-            label = element.attributes.get("text", "")
+            state = bool(element.binding.get(self.app.data, False))
+            label = element.attr("text", "")
             box = "[x]" if state else "[ ]"
             full_label = "{} {}".format(box,label)
-            is_hover = self.hover_element == element.attributes.get("name")
+            is_hover = self.hover_element == element.attr("name")
             is_focus = (
                 self.focus_element is not None and
-                element.attributes.get("name") == self.focus_element.attributes.get("name")
+                element.attr("name") == self.focus_element.attr("name")
             )
             
             for i, ch in enumerate(full_label):
@@ -1355,8 +3721,8 @@ class ezUI:
                     target.setColorFG(255, 255, 255)   # white text
                 else:
                     # Default button style (light)
-                    bg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), self.bg_color)
-                    fg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), self.fg_color)
+                    bg = element.props.bg_rgb or self.bg_color
+                    fg = element.props.fg_rgb or self.fg_color
                     target.setColorBG(*bg)
                     target.setColorFG(*fg)
 
@@ -1367,17 +3733,16 @@ class ezUI:
             
         def draw_radiobutton(self, element, x, y, target=None):
             target = target or self.canvas
-            key = element.attributes.get("ezBind", "").strip("()")
-            value = element.attributes.get("value", "")
-            current = self.app.data.get(key, "")
+            value = element.attr("value", "")
+            current = element.binding.get(self.app.data, "")
             state = (current == value)
-            label = element.attributes.get("text", "")
+            label = element.attr("text", "")
             box = "(o)" if state else "( )"
             full_label = "{} {}".format(box, label)
-            is_hover = self.hover_element == element.attributes.get("name")
+            is_hover = self.hover_element == element.attr("name")
             is_focus = (
                 self.focus_element is not None and
-                element.attributes.get("name") == self.focus_element.attributes.get("name")
+                element.attr("name") == self.focus_element.attr("name")
             )
 
             for i, ch in enumerate(full_label):
@@ -1385,8 +3750,8 @@ class ezUI:
                     target.setColorBG(100, 100, 100)   # darker
                     target.setColorFG(255, 255, 255)   # white text
                 else:
-                    bg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), self.bg_color)
-                    fg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), self.fg_color)
+                    bg = element.props.bg_rgb or self.bg_color
+                    fg = element.props.fg_rgb or self.fg_color
                     target.setColorBG(*bg)
                     target.setColorFG(*fg)
 
@@ -1397,8 +3762,7 @@ class ezUI:
             
         def draw_optionmenu(self, element, x, y, target=None):
             target = target or self.canvas
-            key = element.attributes.get("ezBind", "").strip("()")
-            dropdown_data = self.app.data.get(key, {"options": [], "selected_index": 0})
+            dropdown_data = element.binding.get(self.app.data, {"options": [], "selected_index": 0})
             options = dropdown_data.get("options", [])
             selected_index = dropdown_data.get("selected_index", 0)
             labels = list(options.keys())
@@ -1411,46 +3775,131 @@ class ezUI:
             space_len = dropdown_width - text_len
             space = " " * space_len
             full_label = "{}{} [V]".format(text,space)
-            is_hover = self.hover_element == element.attributes.get("name")
+            is_hover = self.hover_element == element.attr("name")
             is_focus = (
                 self.focus_element is not None and
-                element.attributes.get("name") == self.focus_element.attributes.get("name")
+                element.attr("name") == self.focus_element.attr("name")
             )
             
             for i, ch in enumerate(full_label):
                 if (ch == "[" or ch == "]") and (is_hover or is_focus):
-                    bg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), "#000000")
-                    fg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), "#cccccc")
+                    bg = element.props.fg_rgb or (0, 0, 0)
+                    fg = element.props.bg_rgb or (204, 204, 204)
                     target.setColorBG(*bg)
                     target.setColorFG(*fg)
                 else:
-                    bg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), "#cccccc")
-                    fg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), "#000000")
+                    bg = element.props.bg_rgb or (204, 204, 204)
+                    fg = element.props.fg_rgb or (0, 0, 0)
                     target.setColorBG(*bg)
                     target.setColorFG(*fg)
 
-                self.canvas.draw_char(x + i, y, ch)
+                target.draw_char(x + i, y, ch)
 
             target.setColorFG(self.fg_color)
             target.setColorBG(self.bg_color)
             
-        def draw_frame(self, element, x, y, target=None):
+        def draw_canvas(self, element, x, y, target=None):
+            # The scene is rasterised into half-block pixels again only when it changed
             target = target or self.canvas
-            w = element.width
-            h = element.height
-            canvas = element.canvas
+            props = element.props
+            real_width = props.width if props.width is not None else 200
+            real_height = props.height if props.height is not None else 100
+            cols, rows = self.downscale_resolution(real_width, real_height)
+            cols = min(cols, target.width - x)
+            rows = min(rows, target.height - y)
+            if cols <= 0 or rows <= 0 or x < 0 or y < 0:
+                return
+            scene = element._scene
+            mode = ezUI.Canvas.mode.BRAILLE if props.pixels == "braille" else ezUI.Canvas.mode.PIXEL
+            cell_w, cell_h = ezUI.Canvas.CELL_SIZE[mode]
+            key = (scene.version if scene is not None else -1, cols, rows, mode)
+            cached = self._scene_cache.get(element)
+            if cached is None or cached[0] != key:
+                pixels = ezUI.Canvas(cols * cell_w, rows * cell_h, mode)
+                texts = scene.rasterize(pixels, real_width, real_height) if scene is not None else []
+                cached = self._scene_cache[element] = (key, pixels, texts)
+            _, pixels, texts = cached
+            pixels.flush(target, start_x=x * cell_w, start_y=y * cell_h)
+
+            target.setColorBG(0, 0, 0)
+            for col, row, text, rgb in texts:
+                if 0 <= row < rows:
+                    start = max(0, -col)
+                    text = text[start:max(start, cols - col)]
+                    target.setColorFG(*rgb)
+                    target.text(x + col + start, y + row, text)
+            target.setColorFG(self.fg_color)
+            target.setColorBG(self.bg_color)
+
+        def draw_chart(self, element, x, y, target=None):
+            # Min/max per pixel column of the bound ezUI.Series, plotted again only when it changed
+            target = target or self.canvas
+            series = element.binding.get(self.app.data)
+            if not isinstance(series, ezUI.Series):
+                return
+            props = element.props
+            cols, rows = self.downscale_resolution(props.width if props.width is not None else 200,
+                                                   props.height if props.height is not None else 100)
+            mode = ezUI.Canvas.mode.BRAILLE if props.pixels == "braille" else ezUI.Canvas.mode.PIXEL
+            cell_w, cell_h = ezUI.Canvas.CELL_SIZE[mode]
+            key = (series, series.version, cols, rows, props)
+            cached = self._scene_cache.get(element)
+            if cached is None or cached[0] != key:
+                pixels = ezUI.Canvas(cols * cell_w, rows * cell_h, mode)
+                color = props.fg_rgb or (0, 255, 0)
+                color = (0, 0, 1) if color == ezUI.Canvas.EMPTY else color
+                buffer = pixels.buffer
+                for col, (top, bottom) in enumerate(series.plot(pixels.width, pixels.height,
+                                                                props.chart_min, props.chart_max, props.points)):
+                    for row in range(top, bottom + 1):
+                        buffer[row][col] = color
+                cached = self._scene_cache[element] = (key, pixels, [])
+            cached[1].flush(target, start_x=x * cell_w, start_y=y * cell_h)
+
+        def image_cells(self, element):
+            # Cells an image takes: width/height are real pixels like the canvas, by default the
+            # picture's own size. Returns the alt text's size when the image can't be loaded.
+            try:
+                image = ezUI.Image.of(element, self.app.data)
+            except (OSError, ValueError):
+                return len(element.attr("text", "")) + 2, 1
+            cols, rows = self.downscale_resolution(*image.fit(element.props.width, element.props.height))
+            return max(1, cols), max(1, rows)
+
+        def draw_image(self, element, x, y, target=None):
+            # Scaled once per size into half-block or braille pixels, see ezUI.Image
+            target = target or self.canvas
+            try:
+                image = ezUI.Image.of(element, self.app.data)
+            except (OSError, ValueError):
+                target.setColorBG(*(element.props.bg_rgb or self.bg_color))
+                target.setColorFG(*(element.props.fg_rgb or self.fg_color))
+                target.text(x + 1, y, element.attr("text", ""))  # alt text
+                return
+            cols, rows = self.image_cells(element)
+            mode = ezUI.Canvas.mode.BRAILLE if element.props.pixels == "braille" else ezUI.Canvas.mode.PIXEL
+            cell_w, cell_h = ezUI.Canvas.CELL_SIZE[mode]
+            key = (image, cols, rows, mode)
+            cached = self._scene_cache.get(element)
+            if cached is None or cached[0] != key:
+                pixels = ezUI.Canvas(cols * cell_w, rows * cell_h, mode)
+                pixels.buffer = image.scaled(pixels.width, pixels.height, ezUI.Canvas.EMPTY)
+                cached = self._scene_cache[element] = (key, pixels, [])
+            cached[1].flush(target, start_x=x * cell_w, start_y=y * cell_h)
+
+        def paint_frame(self, element, canvas, w, h):
             canvas.clear()
 
             # Default to frame-specific background color if defined
-            bg = self.parse_color(element.attributes.get("background") or element.attributes.get("bg"), self.bg_color)
-            fg = self.parse_color(element.attributes.get("foreground") or element.attributes.get("fg"), self.fg_color)
+            bg = element.props.bg_rgb or self.bg_color
+            fg = element.props.fg_rgb or self.fg_color
             canvas.setColorBG(*bg)
             canvas.setColorFG(*fg)
                     
             canvas.fillbox(0, 0, w - 1, h - 1)  # fill background
 
             # Draw border if enabled
-            if element.attributes.get("border", "false").lower() != "false":
+            if element.props.border:  # TUI frames have no border unless asked for
                 canvas.draw_char(0, 0, '┌')
                 canvas.draw_char(w - 1, 0, '┐')
                 canvas.draw_char(0, h - 1, '└')
@@ -1462,17 +3911,26 @@ class ezUI:
                     canvas.draw_char(0, j, '│')
                     canvas.draw_char(w - 1, j, '│')
 
+        def draw_frame(self, element, x, y, target=None):
+            target = target or self.canvas
+            w = element.width
+            h = element.height
+            canvas = element.canvas
+            key = (canvas, w, h, element.props, self.bg_color, self.fg_color)
+            if self._backgrounds.get(element) != key:  # the frame's own canvas is kept until it looks different
+                self._backgrounds[element] = key
+                self.paint_frame(element, canvas, w, h)
+
             # Handle scrollLeft/scrollTop attributes
-            scroll_x = int(element.attributes.get("scrollLeft", 0))
-            scroll_y = int(element.attributes.get("scrollTop", 0))
+            scroll_x = element.props.scroll_left
+            scroll_y = element.props.scroll_top
 
             # Sanity: don't allow scrolling beyond canvas dimensions
             scroll_x = max(0, min(scroll_x, canvas.width - w))
             scroll_y = max(0, min(scroll_y, canvas.height - h))
 
             # Clipping logic
-            overflow = element.attributes.get("overflow", "visible").lower()
-            if overflow == "hidden":
+            if element.props.overflow == "hidden":
                 clip_x1 = scroll_x
                 clip_y1 = scroll_y
                 clip_x2 = scroll_x + w
@@ -1493,125 +3951,119 @@ class ezUI:
         
         def handle_input(self, key):
             #print(key)            
+            if self.focus_index is None:
+                return  # keys go to the focused element, and nothing was clicked yet
             prev_index = self.focus_index
             
             if key == 259:  # up arrow → move cursor to beginning                
                 el = self.elements_flat[self.focus_index]
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry"):
-                    keyname = el.attributes.get("ezBind", "").strip("()")
-                    val = str(self.app.data.get(keyname, ""))
                     self.cursor_pos = 0                    
             elif key == 258:  # down arrow → move cursor to end
                 el = self.elements_flat[self.focus_index]
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry"):
-                    keyname = el.attributes.get("ezBind", "").strip("()")
-                    val = str(self.app.data.get(keyname, ""))
+                    val = str(el.binding.get(self.app.data, ""))
                     self.cursor_pos = len(val)
             elif key == 260: # left arrow
                 el = self.elements_flat[self.focus_index]
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry"):
                     self.cursor_pos = max(0, self.cursor_pos - 1)
             elif key == 261: # right arrow
                 el = self.elements_flat[self.focus_index]                
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry"):
-                    keyname = el.attributes.get("ezBind", "").strip("()")
-                    val = str(self.app.data.get(keyname, ""))
+                    val = str(el.binding.get(self.app.data, ""))
                     self.cursor_pos = min(len(val), self.cursor_pos + 1)
             elif key in [cu.KEY_ENTER, 10, 13]:
                 el = self.elements_flat[self.focus_index]
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("button"):
                     self.activate_current()
                 elif tag in ("textbox"):
-                    keyname = el.attributes.get("ezBind", "").strip("()")
-                    val = str(self.app.data.get(keyname, ""))
-                    self.app.data.update(keyname, "{}\n".format(val))
+                    val = str(el.binding.get(self.app.data, ""))
+                    el.binding.set(self.app.data, "{}\n".format(val))
             elif key in range(32, 127):  # Printable characters
                 el = self.elements_flat[self.focus_index]                
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry","textbox"):
                     self.update_text(chr(key))
             elif key  == 8: # Backspace key
                 el = self.elements_flat[self.focus_index]                
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry","textbox"):
                     self.backspace_text()            
             elif key == 330:  # Delete key
                 el = self.elements_flat[self.focus_index]                
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry","textbox"):
                     self.delete_text()
             elif key == 331:  # Insert key
                 el = self.elements_flat[self.focus_index]                
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry","textbox"):
                     self.insert_mode = not self.insert_mode
                 
             if self.focus_index != prev_index:
                 el = self.elements_flat[self.focus_index]
-                tag = el.tag.lower()
+                tag = el.tag
                 if tag in ("entry","textbox"):
-                    keyname = el.attributes.get("ezBind", "").strip("()")
-                    val = str(self.app.data.get(keyname, ""))
+                    val = str(el.binding.get(self.app.data, ""))
                     self.cursor_pos = len(val)
 
         def activate_current(self, el, handler=None):            
-            tag = el.tag.lower()
-            handler_name = el.attributes.get("ezClick", "")         
+            tag = el.tag
+            handler_name = el.attr("ezClick", "")         
             
             if tag in ("button","optionmenu"):
                 handler = self.app.data.get(handler_name) if handler_name != "" else handler
                 if handler and handler_name != "":
-                    handler(el, self.system, self.app.data)
+                    self.app.call_handler(handler, el)
                 else:
                     #must be sys exit or dropdown
                     handler()
             elif tag == "checkbutton":
-                key = el.attributes.get("ezBind", "").strip("()")
-                current = self.app.data.data.get(key, False)
-                self.app.data.update(key, not current)
+                current = el.binding.get(self.app.data, False)
+                el.binding.set(self.app.data, not current)
             elif tag == "radiobutton":
-                key = el.attributes.get("ezBind", "").strip("()")
-                value = el.attributes.get("value", "")
-                self.app.data.update(key, value)
+                value = el.attr("value", "")
+                el.binding.set(self.app.data, value)
             
 
         def update_text(self, char):
             el = self.elements_flat[self.focus_index]
-            if el.tag.lower() == "entry":
-                key = el.attributes.get("ezBind", "").strip("()")
-                val = str(self.app.data.get(key, ""))
+            if el.tag == "entry":
+                binding = el.binding
+                val = str(binding.get(self.app.data, ""))
                 if self.insert_mode and self.cursor_pos < len(val):
                     new = val[:self.cursor_pos] + char + val[self.cursor_pos+1:]
                 else:
                     new = val[:self.cursor_pos] + char + val[self.cursor_pos:]
                 self.cursor_pos += 1
-                self.app.data.update(key, new)
+                binding.set(self.app.data, new)
 
         def backspace_text(self):
             el = self.elements_flat[self.focus_index]
-            tag = el.tag.lower()
+            tag = el.tag
             if tag in ("entry","textbox"):
-                key = el.attributes.get("ezBind", "").strip("()")
-                val = str(self.app.data.get(key, ""))
+                binding = el.binding
+                val = str(binding.get(self.app.data, ""))
                 if self.cursor_pos > 0:
                     new = val[:self.cursor_pos - 1] + val[self.cursor_pos:]
                     self.cursor_pos -= 1
-                    self.app.data.update(key, new)
+                    binding.set(self.app.data, new)
                     
         def delete_text(self):
             el = self.elements_flat[self.focus_index]                
-            tag = el.tag.lower()
+            tag = el.tag
             if tag in ("entry","textbox"):
-                keyname = el.attributes.get("ezBind", "").strip("()")
-                val = str(self.app.data.get(keyname, ""))                    
+                binding = el.binding
+                val = str(binding.get(self.app.data, ""))                    
                 if self.cursor_pos < len(val):
                     new = val[:self.cursor_pos] + val[self.cursor_pos+1:]
-                    self.app.data.update(keyname, new)
+                    binding.set(self.app.data, new)
         
         def handle_mouse(self):
             if self.dropdown_guard:
@@ -1619,8 +4071,7 @@ class ezUI:
                 
             # Block clicks outside modal dropdown and auto-close if modal="clear"
             if self.active_modal_element and self.mouse_left:
-                modal_type = self.active_modal_element.attributes.get("ezModal", "none").lower()
-                if modal_type in ("clear", "opaque"):
+                if self.active_modal_element.props.modal in ("clear", "opaque"):
                     # Get modal layout area
                     bounds = self.layout_map.get(self.active_modal_element)
                     if bounds:
@@ -1666,7 +4117,7 @@ class ezUI:
                                 self.queue = {
                                     "action": "MouseLeft" if self.mouse_left else "MouseRight",
                                     "element": el,
-                                    "handler": el.attributes.get("ezClick"),
+                                    "handler": el.attr("ezClick"),
                                     "zone": (x1, y1, x2, y2),
                                     "name": name
                                 }
@@ -1703,8 +4154,7 @@ class ezUI:
                     )
 
                     if not inside_modal and (self.mouse_left or self.mouse_right):
-                        modal_type = self.active_modal_element.attributes.get("ezModal", "").lower()
-                        if modal_type == "clear" and self.active_dropdown:
+                        if self.active_modal_element.props.modal == "clear" and self.active_dropdown:
                             # Close dropdown if click is outside
                             dropdown = self.system.get_element_by_name(self.active_dropdown + "_dropdown")
                             if dropdown:
@@ -1731,7 +4181,7 @@ class ezUI:
                         }
 
                         # Visual focus
-                        tag = el.tag.lower()
+                        tag = el.tag
                         if tag in ["button", "checkbutton", "radiobutton", "optionmenu"]:
                             self.last_focus_index = self.focus_index
                             try:
@@ -1760,7 +4210,7 @@ class ezUI:
                     x1, y1, x2, y2 = self.queue["zone"]
 
                     if x1 <= self.mouse_x <= x2 and y1 == self.mouse_y and action == "MouseLeft":
-                        tag = el.tag.lower()
+                        tag = el.tag
                         if tag in ["button", "checkbutton", "radiobutton", "optionmenu"]:
                             self.activate_current(el, handler)
 
@@ -1772,15 +4222,14 @@ class ezUI:
                     continue
                 if x1 <= self.mouse_x <= x2 and y1 <= self.mouse_y <= y2:
                     if self.mouse_left:
-                        tag = el.tag.lower()
+                        tag = el.tag
                         self.last_focus_index = self.focus_index
                         self.focus_index = i + 1
                         self.focus_element = el
 
                         if tag == "entry":
-                            max_length = int(el.attributes.get("width", 12))
-                            keyname = el.attributes.get("ezBind", "").strip("()")
-                            val = str(self.app.data.get(keyname, ""))
+                            max_length = el.props.width if el.props.width is not None else 12
+                            val = str(el.binding.get(self.app.data, ""))
                             total_len = len(val)
 
                             start = 0
@@ -1793,16 +4242,1288 @@ class ezUI:
                     break
                 
         def cleanup(self):
+            self.running = False
+            self.app.executor.shutdown()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.terminal is not None:
+                self.terminal.close()
+                return
             cu.nocbreak()
             self.screen.keypad(False)
             cu.echo()
             cu.endwin()
+
+        # A TUI.Server client on a socket (or a pty's file descriptor), standing in for the curses
+        # screen: cells go out as ANSI escapes, the bytes that come in are parsed into curses key
+        # codes and getmouse() events. Speaks enough telnet for `telnet host port` to run in
+        # character mode.
+        class Terminal:
+            IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+            ECHO, SGA = 1, 3
+            KEYS = {"A": "KEY_UP", "B": "KEY_DOWN", "C": "KEY_RIGHT", "D": "KEY_LEFT", "H": "KEY_HOME",
+                    "F": "KEY_END", "2~": "KEY_IC", "3~": "KEY_DC", "5~": "KEY_PPAGE", "6~": "KEY_NPAGE"}
+            BACKLOG = 1 << 20  # unsent bytes a client may fall behind by before it is dropped
+
+            def __init__(self, conn, cols=80, rows=25, telnet=True):
+                self.conn = conn  # socket or file descriptor, closed with the terminal
+                self.fd = conn if isinstance(conn, int) else conn.fileno()
+                os.set_blocking(self.fd, False)
+                self.size = (rows, cols)
+                self.telnet = telnet
+                self.closed = False  # the client hung up or fell too far behind
+                self.keys = []  # key codes for getch()
+                self.mice = []  # (id, x, y, z, bstate) for getmouse()
+                self._input = b""  # the start of a sequence whose end hasn't arrived yet
+                self._out = []
+                self._unsent = b""
+                self._colors = None  # (fg, bg) the client's terminal is set to
+                self._moving = False  # the last mouse event queued was a move
+                if telnet:
+                    self._unsent = bytes((self.IAC, self.WILL, self.ECHO, self.IAC, self.WILL, self.SGA, self.IAC, self.DO, self.SGA))
+                self._out.append("\033[?25l\033[?1003h\033[?1006h")  # no cursor, report every mouse move
+
+            def fileno(self):
+                return self.fd
+
+            def getmaxyx(self):
+                return self.size
+
+            def keypad(self, flag):
+                pass  # keys are always decoded
+
+            def nodelay(self, flag):
+                pass  # getch() never waits
+
+            def getch(self):
+                return self.keys.pop(0) if self.keys else -1
+
+            def getmouse(self):
+                if not self.mice:
+                    raise cu.error("no mouse event")
+                return self.mice.pop(0)
+
+            def clear(self):
+                self._colors = None
+                self._out.append("\033[0m\033[2J")
+
+            def write_cells(self, y, x, cells):
+                # Like Canvas._write_cells: one colour change per run of cells with the same colours
+                out = self._out
+                out.append("\033[{};{}H".format(y + 1, x + 1))
+                for colors, run in groupby(cells, key=itemgetter(1, 2)):
+                    if colors != self._colors:
+                        self._colors = colors
+                        fg, bg = colors
+                        out.append("\033[38;5;{};48;5;{}m".format(
+                            ezUI.Canvas.rgb_to_ansi256(None, *fg), ezUI.Canvas.rgb_to_ansi256(None, *bg)))
+                    out.append("".join(cell[0] for cell in run))
+
+            def refresh(self):
+                if self._out:
+                    self._unsent += "".join(self._out).encode("utf-8", "replace")
+                    self._out = []
+                while self._unsent and not self.closed:
+                    try:
+                        sent = os.write(self.fd, self._unsent)
+                    except BlockingIOError:
+                        break  # the rest goes with the next frame
+                    except OSError:
+                        self.closed = True
+                        break
+                    self._unsent = self._unsent[sent:]
+                if len(self._unsent) > self.BACKLOG:
+                    self.closed = True
+
+            def pump(self):
+                # Reads what the client sent, call it when the connection is readable
+                data = b""
+                while not self.closed:
+                    try:
+                        chunk = os.read(self.fd, 4096)
+                    except BlockingIOError:
+                        break
+                    except OSError:
+                        chunk = b""  # e.g. EIO from a pty whose other end was closed
+                    if not chunk:
+                        self.closed = True
+                        break
+                    data += chunk
+                if data:
+                    self.feed(data)
+
+            def feed(self, data):
+                data = self._input + data
+                i, n = 0, len(data)
+                while i < n:
+                    byte = data[i]
+                    if byte == self.IAC and self.telnet:
+                        # telnet: IAC IAC is a 255, option negotiation and subnegotiation are skipped
+                        if i + 1 >= n:
+                            break
+                        command = data[i + 1]
+                        if command == self.IAC:
+                            self.keys.append(255)
+                            i += 2
+                        elif command == self.SB:
+                            end = data.find(bytes((self.IAC, self.SE)), i + 2)
+                            if end < 0:
+                                break
+                            i = end + 2
+                        elif command in (self.WILL, self.WONT, self.DO, self.DONT):
+                            if i + 2 >= n:
+                                break
+                            i += 3
+                        else:
+                            i += 2
+                    elif byte == 27:
+                        used = self._escape(data, i)
+                        if not used:
+                            break
+                        i += used
+                    elif byte == 13:
+                        self.keys.append(10)
+                        i += 2 if data[i + 1:i + 2] in (b"\0", b"\n") else 1  # telnet sends CR NUL or CR LF
+                    else:
+                        self.keys.append(8 if byte == 127 else byte)  # handle_input knows backspace as 8
+                        i += 1
+                self._input = data[i:]
+
+            def _escape(self, data, i):
+                # ESC [ ... final, ESC O x, X10 and SGR mouse reports, or a lone ESC.
+                # Returns the bytes it used, 0 when the rest hasn't arrived.
+                n = len(data)
+                if i + 1 >= n:
+                    return 0
+                kind = data[i + 1:i + 2]
+                if kind == b"O":
+                    if i + 2 >= n:
+                        return 0
+                    self._key(chr(data[i + 2]))
+                    return 3
+                if kind != b"[":
+                    self.keys.append(27)
+                    return 1
+                if data[i + 2:i + 3] == b"M":  # X10 mouse: ESC [ M button x y, offset by 32
+                    if i + 5 >= n:
+                        return 0
+                    button = data[i + 3] - 32
+                    self._mouse(button, data[i + 4] - 33, data[i + 5] - 33, button & 3 != 3)
+                    return 6
+                end = i + 2
+                while end < n and not 0x40 <= data[end] <= 0x7e:
+                    end += 1
+                if end >= n:
+                    return 0
+                body, final = data[i + 2:end].decode("latin-1"), chr(data[end])
+                if body.startswith("<"):  # SGR mouse: ESC [ < button ; x ; y M (press) or m (release)
+                    try:
+                        button, x, y = (int(v) for v in body[1:].split(";"))
+                    except ValueError:
+                        return end + 1 - i
+                    self._mouse(button, x - 1, y - 1, final == "M")
+                else:
+                    self._key(body.split(";")[0] + final if final == "~" else final)  # modifiers are dropped
+                return end + 1 - i
+
+            def _key(self, name):
+                code = self.KEYS.get(name)
+                if code is not None:
+                    self.keys.append(getattr(cu, code))
+
+            def _mouse(self, button, x, y, press):
+                # A press is curses' BUTTON1/3_CLICKED, handle_mouse queues the click on it and runs it
+                # on the next event (the release). Moves in a row are merged, only the last one matters.
+                if button & 64:
+                    return  # wheel
+                state = cu.REPORT_MOUSE_POSITION
+                motion = bool(button & 32)
+                if press and not motion:
+                    state = {0: cu.BUTTON1_CLICKED, 2: cu.BUTTON3_CLICKED}.get(button & 3, state)
+                event = (0, x, y, 0, state)
+                if motion and self._moving and self.mice:
+                    self.mice[-1] = event
+                else:
+                    self.mice.append(event)
+                self._moving = motion
+
+            def close(self):
+                # Gives the client's terminal back and hangs up
+                if self.conn is None:
+                    return
+                if not self.closed:
+                    self._out.append("\033[0m\033[?1006l\033[?1003l\033[?25h\033[2J\033[H")
+                    self.refresh()
+                self.closed = True
+                if isinstance(self.conn, int):
+                    os.close(self.conn)
+                else:
+                    self.conn.close()
+                self.conn = None
+
+        # One app for many terminals, without a process per login. Every client gets a session of
+        # its own (tree, focus, cursor, hover, open dropdowns, layers) made from the shared template,
+        # all sessions share the data model, so a change made by one operator shows on every screen,
+        # and each client is only sent the cells that changed on its own screen.
+        #   ezUI.TUI.Server(ezUI.Template.load("app.xml"), data, options, port=8023).run()
+        # then `telnet localhost 8023`, or a pty: server.connect(ezUI.TUI.Terminal(fd, telnet=False))
+        class Server:
+            def __init__(self, template, data_model, opts, host="127.0.0.1", port=8023,
+                         user_function=None, user_loop=None, telnet=True):
+                ezUI.require("cu", "socket", "select")
+                if isinstance(template, ezUI.Element):
+                    raise TypeError("TUI.Server needs a Template (or a function returning a root element), "
+                                    "every session gets its own tree")
+                if isinstance(template, str):
+                    template = ezUI.Template.load(template)
+                self.template = template
+                self.data = data_model
+                self.options = opts
+                self.user_function = user_function  # run for every session, like user_loop
+                self.user_loop = user_loop
+                self.telnet = telnet
+                self.sessions = []  # TUI, one per client
+                self.connections = 0  # clients so far, numbers the recordings of the "record" option
+                self.listener = socket.create_server((host, port))
+                self.listener.setblocking(False)
+                self.address = self.listener.getsockname()  # port=0 picks a free port
+                self.running = False
+
+            def connect(self, terminal):
+                # A new session on terminal, it starts with the next step()
+                if isinstance(self.template, ezUI.Template):
+                    root = self.template.instantiate()
+                else:
+                    root = self.template()
+                session = ezUI.TUI(root, self.data, self.options, self.user_function, self.user_loop,
+                                   autorun=False, terminal=terminal)
+                self.connections += 1
+                if self.options.get("record"):
+                    # e.g. "session-{}.ezr", one recording per client
+                    ezUI.TUI.Recorder(self.options.get("record").format(self.connections), session)
+                self.sessions.append(session)
+                return session
+
+            def disconnect(self, session):
+                if session in self.sessions:
+                    self.sessions.remove(session)
+                    session.cleanup()
+
+            def step(self):
+                # Waits up to 10 ms for input, then one frame for every session
+                sources = [self.listener] + [session.terminal for session in self.sessions]
+                ready, _, _ = select.select(sources, [], [], 0.01)
+                for source in ready:
+                    if source is self.listener:
+                        self.accept()
+                    else:
+                        source.pump()
+                for session in list(self.sessions):
+                    try:
+                        if session.terminal.closed:
+                            raise SystemExit  # the client hung up
+                        if not session.running:
+                            session._start()
+                            continue
+                        session.step()
+                        if self.user_loop:
+                            session.app.run_loop(self.user_loop, session.system)
+                        session.finish_frame()
+                    except SystemExit:
+                        self.disconnect(session)  # system.exit() only ends its own session
+                    except Exception as e:
+                        print("Session failed:", repr(e))
+                        self.disconnect(session)
+
+            def accept(self):
+                while True:
+                    try:
+                        conn, _ = self.listener.accept()
+                    except BlockingIOError:
+                        return
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.connect(ezUI.TUI.Terminal(conn, telnet=self.telnet))
+
+            def run(self):
+                self.running = True
+                try:
+                    while self.running:
+                        self.step()
+                finally:
+                    self.close()
+
+            def close(self):
+                self.running = False
+                for session in list(self.sessions):
+                    self.disconnect(session)
+                self.listener.close()
+
+        # Records a TUI session for TUI.Replayer: timestamped key and mouse events as they go into
+        # the handlers, data model changes that came from anywhere else (user_loop, workers, other
+        # sessions) and a checksum of every frame. Records are pickled one after the other, so a
+        # session that dies still leaves everything up to its last flush.
+        #   options {"record": "session.ezr"}, for a TUI.Server "session-{}.ezr" numbers the clients.
+        # Start it with the session, a replay starts from the app's first frame.
+        class Recorder:
+            FORMAT = 1
+            MAGIC = "ezUI-record"
+
+            def __init__(self, path, ui):
+                ezUI.require("pickle", "zlib")
+                self.ui = ui
+                self.file = open(path, "wb")
+                self.started = time.perf_counter()
+                self.muted = 0  # inside a recorded event, its data changes come back on replay
+                self.frames = 0
+                self.skipped = 0  # data changes that can't be pickled (handler functions and such)
+                self._write((self.MAGIC, self.FORMAT, ui.computed_width, ui.computed_height))
+                ui.recorder = self
+                ui.app.data._recorders.append(self)
+
+            def _write(self, record):
+                pickle.dump(record, self.file, pickle.HIGHEST_PROTOCOL)
+
+            def write(self, kind, *args):
+                self._write((kind, time.perf_counter() - self.started) + args)
+
+            def data(self, method, key, value):
+                if self.muted or self.file is None:
+                    return
+                try:
+                    record = pickle.dumps(("data", time.perf_counter() - self.started, method, key, value),
+                                          pickle.HIGHEST_PROTOCOL)
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    self.skipped += 1  # the app binds those again itself when it is replayed
+                    return
+                self.file.write(record)
+
+            def frame(self):
+                self.write("frame", self.ui.frame_checksum())
+                self.frames += 1
+                if self.frames % 100 == 0:
+                    self.file.flush()
+
+            def close(self):
+                if self.file is None:
+                    return
+                if self in self.ui.app.data._recorders:
+                    self.ui.app.data._recorders.remove(self)
+                if self.ui.recorder is self:
+                    self.ui.recorder = None
+                self.file.close()
+                self.file = None
+
+        # Plays a recording back into a fresh app: headless (the screen goes to os.devnull through a
+        # TUI.Terminal), as fast as it can or in real time. Keys and mouse events run through the
+        # handlers again, the other data changes are applied as recorded, and every frame's
+        # checksum is compared with the recorded one. Only replay recordings you trust, they are
+        # pickles. Changes made outside the data model (tree edits in user_loop, Series appends)
+        # aren't recorded and show up as mismatches.
+        #   stats = ezUI.TUI.Replayer("session.ezr", ezUI.load("app.xml"), data, options).run()
+        class Replayer:
+            def __init__(self, path, root_element, data_model, opts):
+                ezUI.require("cu", "pickle", "zlib")
+                records = []
+                with open(path, "rb") as f:
+                    while True:
+                        try:
+                            records.append(pickle.load(f))
+                        except EOFError:
+                            break
+                magic, version, cols, rows = records[0]
+                if magic != ezUI.TUI.Recorder.MAGIC or version != ezUI.TUI.Recorder.FORMAT:
+                    raise ValueError("{} is not an ezUI recording this version can play".format(path))
+                self.frames = []  # ([events], time, checksum), the last frame's events come before it
+                events = []
+                for record in records[1:]:
+                    if record[0] == "frame":
+                        self.frames.append((events, record[1], record[2]))
+                        events = []
+                    else:
+                        events.append(record)
+                screen = ezUI.TUI.Terminal(os.open(os.devnull, os.O_RDWR), cols, rows, telnet=False)
+                self.ui = ezUI.TUI(root_element, data_model, opts, autorun=False, terminal=screen)
+
+            def apply(self, events):
+                ui = self.ui
+                for kind, _, *args in events:
+                    if kind == "data":
+                        method, key, value = args
+                        getattr(ui.app.data, method)(key, value)
+                    else:
+                        ui.feed(kind, *args)
+
+            def run(self, realtime=False):
+                # {"frames", "mismatches", "first_mismatch", "seconds", "frame_ms", "max_frame_ms"},
+                # first_mismatch is the index of the first frame that didn't come out the same
+                ui = self.ui
+                mismatches = 0
+                first_mismatch = None
+                times = []
+                started = time.perf_counter()
+                try:
+                    for index, (events, at, checksum) in enumerate(self.frames):
+                        if realtime:
+                            begin = events[0][1] if events else at
+                            delay = started + begin - time.perf_counter()
+                            if delay > 0:
+                                time.sleep(delay)
+                        t = time.perf_counter()
+                        if index == 0:
+                            self.apply(events)  # what user_function did before the first frame
+                            ui._start()
+                        else:
+                            ui.tick()
+                            self.apply(events)
+                            ui.finish_frame()
+                        times.append(time.perf_counter() - t)
+                        if ui.frame_checksum() != checksum:
+                            mismatches += 1
+                            if first_mismatch is None:
+                                first_mismatch = index
+                finally:
+                    ui.cleanup()
+                times.sort()
+                return {
+                    "frames": len(times),
+                    "mismatches": mismatches,
+                    "first_mismatch": first_mismatch,
+                    "seconds": round(time.perf_counter() - started, 3),
+                    "frame_ms": round(times[len(times) // 2] * 1000, 3) if times else None,
+                    "max_frame_ms": round(times[-1] * 1000, 3) if times else None,
+                }
                 
     
+    # Retained drawing for a canvas element (element.scene). Items keep the id they were
+    # created with, changes are collected and applied once a frame: the GUI sends only the
+    # coords/itemconfigure calls for what changed, the TUI rasterises the whole scene into a
+    # PIXEL canvas again only when its version moved. Method names follow tk.Canvas.
+    class Scene:
+        KINDS = ("rectangle", "oval", "line", "polygon", "text", "image")
+        COLORS = {
+            "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0), "green": (0, 128, 0),
+            "lime": (0, 255, 0), "blue": (0, 0, 255), "yellow": (255, 255, 0), "cyan": (0, 255, 255),
+            "magenta": (255, 0, 255), "orange": (255, 165, 0), "purple": (128, 0, 128),
+            "gray": (128, 128, 128), "grey": (128, 128, 128), "brown": (165, 42, 42), "pink": (255, 192, 203),
+        }
+
+        def __init__(self):
+            self.items = {}    # id -> [kind, coords, options], dict order is the stacking order
+            self.version = 0   # bumped by every change, the TUI redraws when it moves
+            self._next_id = 1
+            self._created = {}  # ids created since the last sync
+            self._changed = {}  # id -> [coords changed, {changed options}]
+            self._deleted = []  # ids deleted since the last sync
+
+        def _create(self, kind, coords, options):
+            if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+                coords = coords[0]
+            item_id = self._next_id
+            self._next_id += 1
+            self.items[item_id] = [kind, list(coords), options]
+            self._created[item_id] = None
+            self.version += 1
+            return item_id
+
+        def create_rectangle(self, *coords, **options):
+            return self._create("rectangle", coords, options)
+
+        def create_oval(self, *coords, **options):
+            return self._create("oval", coords, options)
+
+        def create_line(self, *coords, **options):
+            return self._create("line", coords, options)
+
+        def create_polygon(self, *coords, **options):
+            return self._create("polygon", coords, options)
+
+        def create_text(self, *coords, **options):
+            return self._create("text", coords, options)
+
+        def create_image(self, *coords, **options):
+            return self._create("image", coords, options)
+
+        def _touch(self, item_id):
+            changed = self._changed.get(item_id)
+            if changed is None:
+                changed = self._changed[item_id] = [False, {}]
+            self.version += 1
+            return changed
+
+        def coords(self, item_id, *coords):
+            item = self.items[item_id]
+            if not coords:
+                return list(item[1])
+            if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+                coords = coords[0]
+            coords = list(coords)
+            if coords != item[1]:
+                item[1] = coords
+                self._touch(item_id)[0] = True
+
+        def move(self, item_id, dx, dy):
+            if not (dx or dy):
+                return
+            item = self.items[item_id]
+            item[1] = [v + (dy if i & 1 else dx) for i, v in enumerate(item[1])]
+            self._touch(item_id)[0] = True
+
+        def itemconfigure(self, item_id, **options):
+            current = self.items[item_id][2]
+            changed = {k: v for k, v in options.items() if current.get(k, self) != v}  # skip no-ops
+            if changed:
+                current.update(changed)
+                self._touch(item_id)[1].update(changed)
+
+        itemconfig = itemconfigure
+
+        def itemcget(self, item_id, option):
+            return self.items[item_id][2].get(option)
+
+        def type(self, item_id):
+            return self.items[item_id][0]
+
+        def delete(self, *item_ids):
+            if "all" in item_ids:
+                item_ids = list(self.items)
+            for item_id in item_ids:
+                if self.items.pop(item_id, None) is None:
+                    continue
+                self._changed.pop(item_id, None)
+                if self._created.pop(item_id, 0) is not None:
+                    self._deleted.append(item_id)  # only what a sync already created needs deleting
+                self.version += 1
+
+        def clear(self):
+            self.delete("all")
+
+        def __len__(self):
+            return len(self.items)
+
+        def __contains__(self, item_id):
+            return item_id in self.items
+
+        @property
+        def pending(self):
+            return bool(self._created or self._changed or self._deleted)
+
+        def clean(self):
+            self._created = {}
+            self._changed = {}
+            self._deleted = []
+
+        # GUI: apply what changed since the last sync to the tk canvas, ids maps our ids to tk's
+        def sync(self, widget, ids):
+            calls = 0
+            for item_id in self._deleted:
+                tk_id = ids.pop(item_id, None)
+                if tk_id is not None:
+                    widget.delete(tk_id)
+                    calls += 1
+            for item_id, (moved, options) in self._changed.items():
+                tk_id = ids.get(item_id)
+                if tk_id is None:
+                    continue
+                if moved:
+                    widget.coords(tk_id, *self.items[item_id][1])
+                    calls += 1
+                if options:
+                    widget.itemconfigure(tk_id, **options)
+                    calls += 1
+            for item_id in self._created:
+                kind, coords, options = self.items[item_id]
+                ids[item_id] = getattr(widget, "create_" + kind)(*coords, **options)
+                calls += 1
+            self.clean()
+            return calls
+
+        # GUI: (re)create every item on a fresh tk canvas
+        def draw(self, widget):
+            ids = {}
+            for item_id, (kind, coords, options) in self.items.items():
+                ids[item_id] = getattr(widget, "create_" + kind)(*coords, **options)
+            self.clean()
+            return ids
+
+        @classmethod
+        def rgb(cls, color):
+            if not color:
+                return None
+            if isinstance(color, tuple):
+                return color
+            color = str(color).lower()
+            if color.startswith("#"):
+                digits = color[1:]
+                if len(digits) == 3:
+                    digits = "".join(c * 2 for c in digits)
+                try:
+                    return (int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16))
+                except ValueError:
+                    return (255, 255, 255)
+            return cls.COLORS.get(color, (255, 255, 255))
+
+        # TUI: rasterise into a PIXEL or BRAILLE canvas, scaled from the element's real pixel
+        # size. Returns the text items as (col, row, text, rgb) to draw on top in cells.
+        def rasterize(self, canvas, real_width, real_height):
+            cell_w, cell_h = canvas.CELL_SIZE[canvas.render_mode]
+            sx = canvas.width / float(real_width or 1)
+            sy = canvas.height / float(real_height or 1)
+            raster = ezUI.Rasterizer
+            texts = []
+            for kind, coords, options in self.items.values():
+                points = [(int(round(coords[i] * sx)), int(round(coords[i + 1] * sy)))
+                          for i in range(0, len(coords) - 1, 2)]
+                if not points:
+                    continue
+                # tk defaults: lines and polygons are filled black, rectangles and ovals outlined black
+                fill = self._pixel(options.get("fill", "black" if kind in ("line", "polygon") else None))
+                outline = self._pixel(options.get("outline", "black" if kind in ("rectangle", "oval") else None))
+                if kind == "line":
+                    if fill:
+                        raster.polyline(canvas, points, fill)
+                elif kind in ("rectangle", "oval") and len(points) >= 2:
+                    shape = raster.rect if kind == "rectangle" else raster.ellipse
+                    (x1, y1), (x2, y2) = points[0], points[1]
+                    if fill:
+                        shape(canvas, x1, y1, x2, y2, fill, True)
+                    if outline:
+                        shape(canvas, x1, y1, x2, y2, outline, False)
+                elif kind == "polygon":
+                    if fill:
+                        raster.polygon(canvas, points, fill)
+                    if outline:
+                        raster.polyline(canvas, points, outline, closed=True)
+                elif kind == "text":
+                    text = str(options.get("text", ""))
+                    col = points[0][0] // cell_w
+                    if options.get("anchor", "center") == "center":
+                        col -= len(text) // 2
+                    texts.append((col, points[0][1] // cell_h, text, self.rgb(options.get("fill")) or (255, 255, 255)))
+            return texts
+
+        @classmethod
+        def _pixel(cls, color):
+            rgb = cls.rgb(color)
+            return (0, 0, 1) if rgb == (0, 0, 0) else rgb  # (0, 0, 0) is an empty pixel
+
+    # Shape drawing for pixel canvases. Everything is broken into horizontal spans that are
+    # clipped once and written as row slices, so the cost goes with the rows a shape covers,
+    # not with its pixels. value is what lands in the buffer, a colour for PIXEL/BRAILLE.
+    class Rasterizer:
+        @staticmethod
+        def span(canvas, y, x1, x2, value):
+            if 0 <= y < canvas.height:
+                if x1 > x2:
+                    x1, x2 = x2, x1
+                if x1 < 0:
+                    x1 = 0
+                if x2 >= canvas.width:
+                    x2 = canvas.width - 1
+                if x1 <= x2:
+                    canvas.buffer[y][x1:x2 + 1] = [value] * (x2 - x1 + 1)
+
+        @staticmethod
+        def rect(canvas, x1, y1, x2, y2, value, fill=True):
+            x1, x2 = sorted((x1, x2))
+            y1, y2 = sorted((y1, y2))
+            span = ezUI.Rasterizer.span
+            if fill:
+                for y in range(max(0, y1), min(canvas.height, y2 + 1)):
+                    span(canvas, y, x1, x2, value)
+                return
+            span(canvas, y1, x1, x2, value)
+            span(canvas, y2, x1, x2, value)
+            buffer, width = canvas.buffer, canvas.width
+            for y in range(max(0, y1 + 1), min(canvas.height, y2)):
+                row = buffer[y]
+                if 0 <= x1 < width:
+                    row[x1] = value
+                if 0 <= x2 < width:
+                    row[x2] = value
+
+        @staticmethod
+        def clip_steps(width, height, x1, y1, x2, y2):
+            # First and last Bresenham step of the line that lands on the canvas, None when none do.
+            # After n steps along the major axis the minor one has moved (2*minor*n + major) // (2*major),
+            # so this is exact integer maths and clipped lines keep the pixels of the whole line.
+            dx, dy = abs(x2 - x1), abs(y2 - y1)
+            if dx >= dy:
+                major, minor, axes = dx, dy, ((x1, x2, width), (y1, y2, height))
+            else:
+                major, minor, axes = dy, dx, ((y1, y2, height), (x1, x2, width))
+            ranges = []
+            for c1, c2, size in axes:
+                # how far along this axis we can move and still be on the canvas
+                ranges.append((-c1, size - 1 - c1) if c1 <= c2 else (c1 - size + 1, c1))
+            (first, last), (low, high) = ranges
+            first, last = max(first, 0), min(last, major)
+            if minor:
+                first = max(first, -((major - 2 * major * low) // (2 * minor)))
+                last = min(last, (2 * major * (high + 1) - major - 1) // (2 * minor))
+            elif not low <= 0 <= high:
+                return None
+            if first > last:
+                return None
+            return first, last
+
+        @staticmethod
+        def line(canvas, x1, y1, x2, y2, value):
+            width, height = canvas.width, canvas.height
+            buffer = canvas.buffer
+            span = ezUI.Rasterizer.span
+            if y1 == y2:
+                span(canvas, y1, x1, x2, value)
+                return
+            dx = abs(x2 - x1)
+            dy = -abs(y2 - y1)
+            sx = 1 if x1 < x2 else -1
+            sy = 1 if y1 < y2 else -1
+            err = dx + dy
+            x, y = x1, y1
+            if not (0 <= x1 < width and 0 <= y1 < height and 0 <= x2 < width and 0 <= y2 < height):
+                if ((x1 < 0 and x2 < 0) or (y1 < 0 and y2 < 0) or (x1 >= width and x2 >= width)
+                        or (y1 >= height and y2 >= height)):
+                    return
+                steps = ezUI.Rasterizer.clip_steps(width, height, x1, y1, x2, y2)
+                if steps is None:
+                    return
+                # Jump to the first step on the canvas with the error term it would have there
+                major, minor = max(dx, -dy), min(dx, -dy)
+                ends = []
+                for n in steps:
+                    offset = (2 * minor * n + major) // (2 * major)
+                    ends.append((n, offset) if dx >= -dy else (offset, n))
+                (i, j), (i2, j2) = ends
+                x, y = x1 + sx * i, y1 + sy * j
+                err += i * dy + j * dx
+                x2, y2 = x1 + sx * i2, y1 + sy * j2
+            if dx < -dy:
+                # Steep: one pixel per row
+                while True:
+                    buffer[y][x] = value
+                    if y == y2:
+                        return
+                    e2 = 2 * err
+                    if e2 >= dy:
+                        err += dy
+                        x += sx
+                    err += dx
+                    y += sy
+            # Shallow: Bresenham, the pixels of each row go out as one span
+            start = x
+            while x != x2 or y != y2:
+                e2 = 2 * err
+                last = x
+                if e2 >= dy:
+                    err += dy
+                    x += sx
+                if e2 <= dx:
+                    err += dx
+                    a, b = (start, last) if sx > 0 else (last, start)
+                    buffer[y][a:b + 1] = [value] * (b - a + 1)
+                    y += sy
+                    start = x
+            span(canvas, y, start, x, value)
+
+        @staticmethod
+        def points(canvas, points, value):
+            buffer, width, height = canvas.buffer, canvas.width, canvas.height
+            for x, y in points:
+                if 0 <= x < width and 0 <= y < height:
+                    buffer[y][x] = value
+
+        @staticmethod
+        def polyline(canvas, points, value, closed=False):
+            points = list(points)
+            if closed and len(points) > 2:
+                points.append(points[0])
+            if len(points) == 1:
+                ezUI.Rasterizer.points(canvas, points, value)
+            line = ezUI.Rasterizer.line
+            for (x1, y1), (x2, y2) in zip(points, points[1:]):
+                line(canvas, x1, y1, x2, y2, value)
+
+        @staticmethod
+        def polygon(canvas, points, value):
+            # Even-odd scanline fill sampled at pixel centres, with an active edge list
+            points = list(points)
+            if len(points) < 3:
+                return
+            edges = []
+            for (xa, ya), (xb, yb) in zip(points, points[1:] + points[:1]):
+                if ya == yb:
+                    continue
+                if ya > yb:
+                    xa, ya, xb, yb = xb, yb, xa, ya
+                edges.append((ya, yb, xa, (xb - xa) / float(yb - ya)))
+            if not edges:
+                return
+            edges.sort()
+            # rows whose centre lies inside the polygon's height
+            top = max(0, int(math.ceil(edges[0][0] - 0.5)))
+            bottom = min(canvas.height - 1, int(math.ceil(max(e[1] for e in edges) - 0.5)) - 1)
+            span = ezUI.Rasterizer.span
+            active = []
+            i = 0
+            for y in range(top, bottom + 1):
+                yc = y + 0.5
+                while i < len(edges) and edges[i][0] <= yc:
+                    active.append(edges[i])
+                    i += 1
+                active = [e for e in active if e[1] > yc]
+                xs = sorted(x + (yc - y0) * slope for y0, _, x, slope in active)
+                for j in range(0, len(xs) - 1, 2):
+                    left, right = int(math.ceil(xs[j] - 0.5)), int(math.floor(xs[j + 1] - 0.5))
+                    if left <= right:
+                        span(canvas, y, left, right, value)
+
+        @staticmethod
+        def ellipse(canvas, x1, y1, x2, y2, value, fill=False):
+            # Midpoint ellipse inside the rectangle x1,y1 - x2,y2 (A. Zingl's integer version, which
+            # also gets even sizes right). Filled: one span per row between the outline's ends.
+            x0, x1 = sorted((x1, x2))
+            y0, y1 = sorted((y1, y2))
+            a, b = x1 - x0, y1 - y0
+            b1 = b & 1
+            dx = 4 * (1 - a) * b * b
+            dy = 4 * (b1 + 1) * a * a
+            err = dx + dy + b1 * a * a
+            y0 += (b + 1) // 2
+            y1 = y0 - b1
+            a8, b8 = 8 * a * a, 8 * b * b
+            rows = {}  # row -> (left, right), the first (widest) extent seen
+            while True:
+                rows.setdefault(y0, (x0, x1))
+                rows.setdefault(y1, (x0, x1))
+                if not fill:
+                    ezUI.Rasterizer.points(canvas, ((x0, y0), (x1, y0), (x0, y1), (x1, y1)), value)
+                e2 = 2 * err
+                if e2 <= dy:
+                    y0 += 1
+                    y1 -= 1
+                    dy += a8
+                    err += dy
+                if e2 >= dx or 2 * err > dy:
+                    x0 += 1
+                    x1 -= 1
+                    dx += b8
+                    err += dx
+                if x0 > x1:
+                    break
+            while y0 - y1 <= b:  # very flat ellipses stop early, finish the tips
+                for y in (y0, y1):
+                    rows.setdefault(y, (x0 - 1, x1 + 1))
+                    if not fill:
+                        ezUI.Rasterizer.points(canvas, ((x0 - 1, y), (x1 + 1, y)), value)
+                y0 += 1
+                y1 -= 1
+            if fill:
+                span = ezUI.Rasterizer.span
+                for y, (left, right) in rows.items():
+                    span(canvas, y, left, right, value)
+
+    # Fixed size ring buffer of numbers for the chart tag (ezBind to one), appends are thread
+    # safe. Besides the samples it keeps the min/max of every block of 64, 4096, ... samples,
+    # so a chart column costs a few slices however many samples it covers.
+    class Series:
+        BLOCK = 64
+
+        def __init__(self, capacity=100000, values=()):
+            self.capacity = capacity
+            self.samples = array("d", bytes(8 * capacity))
+            self.levels = []  # (block size, mins, maxs), smallest blocks first
+            size = ezUI.Series.BLOCK
+            while size < capacity:
+                blocks = -(-capacity // size)
+                self.levels.append((size, array("d", bytes(8 * blocks)), array("d", bytes(8 * blocks))))
+                size *= ezUI.Series.BLOCK
+            self.pos = 0       # slot the next sample goes to
+            self.count = 0
+            self.version = 0   # bumped by every change, charts redraw when it moves
+            self._lock = threading.Lock()
+            self.extend(values)
+
+        def __len__(self):
+            return self.count
+
+        def append(self, value):
+            with self._lock:
+                self._put(float(value))
+                self.version += 1
+
+        def extend(self, values):
+            values = [float(v) for v in values]
+            if values:
+                with self._lock:
+                    for value in values:
+                        self._put(value)
+                    self.version += 1
+
+        def _put(self, value):
+            pos = self.pos
+            self.samples[pos] = value
+            for size, mins, maxs in self.levels:
+                block = pos // size
+                if pos % size == 0:  # a block is written front to back, so this starts it over
+                    mins[block] = maxs[block] = value
+                elif value < mins[block]:
+                    mins[block] = value
+                elif value > maxs[block]:
+                    maxs[block] = value
+            self.pos = pos + 1 if pos + 1 < self.capacity else 0
+            if self.count < self.capacity:
+                self.count += 1
+
+        def clear(self):
+            with self._lock:
+                self.pos = self.count = 0
+                self.version += 1
+
+        def values(self):
+            # Oldest first
+            with self._lock:
+                start = (self.pos - self.count) % self.capacity
+                if start + self.count <= self.capacity:
+                    return self.samples[start:start + self.count].tolist()
+                return (self.samples[start:] + self.samples[:self.pos]).tolist()
+
+        def minmax(self, columns, last=None):
+            # (low, high) per column of the newest `last` samples (all of them by default)
+            with self._lock:
+                n = self.count if last is None else min(last, self.count)
+                if n <= 0 or columns <= 0:
+                    return []
+                capacity = self.capacity
+                start = (self.pos - n) % capacity
+                out = []
+                for i in range(columns):
+                    a = start + i * n // columns
+                    b = max(a + 1, start + (i + 1) * n // columns)
+                    if b <= capacity:
+                        out.append(self._range(a, b))
+                    elif a >= capacity:
+                        out.append(self._range(a - capacity, b - capacity))
+                    else:
+                        (lo1, hi1), (lo2, hi2) = self._range(a, capacity), self._range(0, b - capacity)
+                        out.append((min(lo1, lo2), max(hi1, hi2)))
+            return out
+
+        def _range(self, a, b):
+            # Whole blocks from the biggest level down, the samples themselves at the edges. Blocks
+            # wholly inside a shown range were always written completely, even the one at pos.
+            lows = []
+            highs = []
+            pending = [(a, b, len(self.levels) - 1)]
+            while pending:
+                a, b, level = pending.pop()
+                if level < 0:
+                    part = self.samples[a:b]
+                    lows.append(min(part))
+                    highs.append(max(part))
+                    continue
+                size, mins, maxs = self.levels[level]
+                first = -(-a // size)
+                last = b // size
+                if first < last:
+                    lows.append(min(mins[first:last]))
+                    highs.append(max(maxs[first:last]))
+                    if a < first * size:
+                        pending.append((a, first * size, level - 1))
+                    if last * size < b:
+                        pending.append((last * size, b, level - 1))
+                else:
+                    pending.append((a, b, level - 1))
+            return min(lows), max(highs)
+
+        def plot(self, width, height, low=None, high=None, last=None):
+            # Pixel rows (top, bottom) to fill per column, 0 at the top, each column reaching the
+            # one before so the line has no gaps. low/high default to the shown samples' range.
+            columns = self.minmax(width, last)
+            if not columns or height <= 0:
+                return []
+            if low is None:
+                low = min(lo for lo, _ in columns)
+            if high is None:
+                high = max(hi for _, hi in columns)
+            scale = (height - 1) / ((high - low) or 1.0)
+            bottom_row = height - 1
+            out = []
+            prev = None
+            for lo, hi in columns:
+                top = bottom_row - int(round((min(max(hi, low), high) - low) * scale))
+                bottom = bottom_row - int(round((min(max(lo, low), high) - low) * scale))
+                span = (top, bottom)
+                if prev is not None:
+                    top = min(top, prev[1])
+                    bottom = max(bottom, prev[0])
+                prev = span
+                out.append((top, bottom))
+            return out
+
+    # Decoded PPM/PGM or PNG picture for the image tag, stdlib only (zlib for PNG). Pixels are
+    # rows of (r, g, b), None where the picture is transparent. Files and rescaled copies are
+    # kept in small least recently used caches, keyed on the file's mtime and on the size.
+    class Image:
+        __slots__ = ("width", "height", "rows")
+        LIMIT = 64      # entries per cache
+        _files = {}     # (path, mtime, size) -> Image, least recently used first
+        _scaled = {}    # (image, width, height, empty) -> rows
+        _lock = threading.Lock()
+        PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+        PNM_FIELD = re.compile(rb"(?:\s|#[^\n]*\n)*(\d+)")
+        GRAY = tuple((v, v, v) for v in range(256))
+
+        def __init__(self, width, height, rows):
+            self.width = width
+            self.height = height
+            self.rows = rows
+
+        @classmethod
+        def _cached(cls, cache, key, make):
+            with cls._lock:
+                value = cache.pop(key, None)
+                if value is not None:
+                    cache[key] = value  # now the most recent
+                    return value
+            value = make()
+            with cls._lock:
+                cache[key] = value
+                while len(cache) > cls.LIMIT:
+                    del cache[next(iter(cache))]
+            return value
+
+        @classmethod
+        def open(cls, path):
+            # Decoded once per version of the file, raises OSError or ValueError
+            stat = os.stat(path)
+            def load():
+                with open(path, "rb") as f:
+                    return cls.decode(f.read())
+            return cls._cached(cls._files, (path, stat.st_mtime_ns, stat.st_size), load)
+
+        @classmethod
+        def of(cls, element, data):
+            # The image an element shows: its ezBind value (a path, file bytes or an Image), else src
+            source = element.binding.get(data) if element.binding else element.attr("src")
+            if isinstance(source, cls):
+                return source
+            if isinstance(source, (bytes, bytearray)):
+                source = bytes(source)
+                return cls._cached(cls._files, source, lambda: cls.decode(source))
+            if not source:
+                raise ValueError("image without src")
+            return cls.open(str(source))
+
+        def fit(self, width=None, height=None):
+            # Display size: as given, the natural size, or the missing side from the aspect ratio
+            if width is None and height is None:
+                return self.width, self.height
+            if width is None:
+                width = max(1, self.width * height // max(1, self.height))
+            elif height is None:
+                height = max(1, self.height * width // max(1, self.width))
+            return width, height
+
+        def scaled(self, width, height, empty=None):
+            # Rows at width x height, averaged when shrinking. Transparent pixels become empty,
+            # opaque ones that happen to equal it are moved off by one step.
+            return ezUI.Image._cached(ezUI.Image._scaled, (self, width, height, empty),
+                                      lambda: self._resample(width, height, empty))
+
+        def _resample(self, width, height, empty):
+            if empty is not None:
+                nudged = (empty[0], empty[1], empty[2] + 1 if empty[2] < 255 else 254)
+            xs = [(x * self.width // width, max(x * self.width // width + 1, (x + 1) * self.width // width))
+                  for x in range(width)]
+            ys = [(y * self.height // height, max(y * self.height // height + 1, (y + 1) * self.height // height))
+                  for y in range(height)]
+            single = all(x2 - x1 == 1 for x1, x2 in xs)
+            out = []
+            for y1, y2 in ys:
+                band = self.rows[y1:y2]
+                if single and len(band) == 1:
+                    src = band[0]
+                    row = [src[x1] for x1, _ in xs]
+                else:
+                    row = []
+                    for x1, x2 in xs:
+                        r = g = b = lit = clear = 0
+                        for src in band:
+                            for pixel in src[x1:x2]:
+                                if pixel is None:
+                                    clear += 1
+                                else:
+                                    r += pixel[0]
+                                    g += pixel[1]
+                                    b += pixel[2]
+                                    lit += 1
+                        row.append((r // lit, g // lit, b // lit) if lit >= clear else None)
+                if empty is not None:
+                    row = [empty if pixel is None else nudged if pixel == empty else pixel for pixel in row]
+                out.append(row)
+            return out
+
+        @classmethod
+        def decode(cls, data):
+            if data[:8] == cls.PNG_SIGNATURE:
+                return cls._png(data)
+            if data[:1] == b"P" and data[1:2] in (b"2", b"3", b"5", b"6"):
+                return cls._pnm(data)
+            raise ValueError("not a PNG, PPM or PGM image")
+
+        @classmethod
+        def _pnm(cls, data):
+            # P6/P5 binary and P3/P2 plain PPM/PGM
+            fields = []
+            pos = 2
+            while len(fields) < 3:
+                match = cls.PNM_FIELD.match(data, pos)
+                if match is None:
+                    raise ValueError("bad PPM header")
+                fields.append(int(match.group(1)))
+                pos = match.end()
+            width, height, maxval = fields
+            if not width or not height or not 0 < maxval < 65536:
+                raise ValueError("bad PPM header")
+            channels = 3 if data[1:2] in (b"3", b"6") else 1
+            count = width * height * channels
+            if data[1:2] in (b"5", b"6"):
+                size = 2 if maxval > 255 else 1
+                samples = data[pos + 1:pos + 1 + count * size]
+                if len(samples) < count * size:
+                    raise ValueError("truncated PPM data")
+                samples = samples[0::2] if size == 2 else samples  # big endian, keep the high byte
+                if size == 2:
+                    maxval >>= 8
+            else:
+                samples = [int(v) for v in data[pos:].split()[:count]]
+                if len(samples) < count:
+                    raise ValueError("truncated PPM data")
+            if maxval != 255:
+                samples = bytes(min(255, v * 255 // max(1, maxval)) for v in samples)
+            stride = width * channels
+            return cls(width, height, [cls._pixels(samples[y * stride:(y + 1) * stride], channels)
+                                       for y in range(height)])
+
+        @classmethod
+        def _png(cls, data):
+            pos = 8
+            header = palette = transparency = None
+            chunks = []
+            while pos + 8 <= len(data):
+                length = int.from_bytes(data[pos:pos + 4], "big")
+                kind = data[pos + 4:pos + 8]
+                body = data[pos + 8:pos + 8 + length]
+                pos += 12 + length  # length, type, body, crc
+                if kind == b"IHDR":
+                    header = body
+                elif kind == b"PLTE":
+                    palette = [tuple(body[i:i + 3]) for i in range(0, len(body) - 2, 3)]
+                elif kind == b"tRNS":
+                    transparency = body
+                elif kind == b"IDAT":
+                    chunks.append(body)
+                elif kind == b"IEND":
+                    break
+            if header is None or len(header) < 13 or not chunks:
+                raise ValueError("bad PNG data")
+            width = int.from_bytes(header[0:4], "big")
+            height = int.from_bytes(header[4:8], "big")
+            depth, color_type, interlace = header[8], header[9], header[12]
+            channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(color_type)
+            if channels is None or depth not in (1, 2, 4, 8, 16):
+                raise ValueError("unsupported PNG colour type {} / bit depth {}".format(color_type, depth))
+            if interlace:
+                raise ValueError("interlaced PNGs are not supported")
+            if color_type == 3 and palette is None:
+                raise ValueError("PNG palette missing")
+            ezUI.require("zlib")
+            raw = zlib.decompress(b"".join(chunks))
+
+            bits = channels * depth
+            step = max(1, bits // 8)  # bytes per pixel for the filters
+            stride = (width * bits + 7) // 8
+            if len(raw) < (stride + 1) * height:
+                raise ValueError("truncated PNG data")
+            if depth < 8:
+                shifts = tuple(range(8 - depth, -1, -depth))
+                mask = (1 << depth) - 1
+            if color_type == 3:
+                table = list(palette) + [(0, 0, 0)] * (256 - len(palette))
+                for i, alpha in enumerate((transparency or b"")[:256]):
+                    if alpha < 128:
+                        table[i] = None
+            key = None  # colour key transparency of grey and RGB images
+            if transparency and color_type in (0, 2):
+                values = [int.from_bytes(transparency[i:i + 2], "big") for i in range(0, len(transparency) - 1, 2)]
+                values = [v >> 8 if depth == 16 else v * 255 // ((1 << depth) - 1) for v in values]
+                key = (values[0],) * 3 if color_type == 0 else tuple(values[:3])
+
+            rows = []
+            prev = bytearray(stride)
+            pos = 0
+            for _ in range(height):
+                kind = raw[pos]
+                line = bytearray(raw[pos + 1:pos + 1 + stride])
+                pos += stride + 1
+                if kind == 1:    # sub
+                    for i in range(step, stride):
+                        line[i] = (line[i] + line[i - step]) & 255
+                elif kind == 2:  # up
+                    line = bytearray((a + b) & 255 for a, b in zip(line, prev))
+                elif kind == 3:  # average
+                    for i in range(stride):
+                        left = line[i - step] if i >= step else 0
+                        line[i] = (line[i] + ((left + prev[i]) >> 1)) & 255
+                elif kind == 4:  # paeth
+                    for i in range(stride):
+                        a = line[i - step] if i >= step else 0
+                        b = prev[i]
+                        c = prev[i - step] if i >= step else 0
+                        p = a + b - c
+                        pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                        line[i] = (line[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 255
+                elif kind:
+                    raise ValueError("bad PNG filter {}".format(kind))
+                prev = line
+
+                if depth == 16:
+                    samples = line[0::2]
+                elif depth < 8:
+                    samples = [(byte >> shift) & mask for byte in line for shift in shifts][:width]
+                    if color_type == 0:
+                        samples = [v * 255 // mask for v in samples]
+                else:
+                    samples = line
+                if color_type == 3:
+                    row = list(map(table.__getitem__, samples[:width]))
+                else:
+                    row = cls._pixels(samples, channels)
+                    if key is not None:
+                        row = [None if pixel == key else pixel for pixel in row]
+                rows.append(row)
+            return cls(width, height, rows)
+
+        @classmethod
+        def _pixels(cls, samples, channels):
+            # One row of 8 bit samples as pixels, alpha below half is transparent
+            if channels == 1:
+                return list(map(cls.GRAY.__getitem__, samples))
+            if channels == 2:
+                return [cls.GRAY[v] if a >= 128 else None for v, a in zip(samples[0::2], samples[1::2])]
+            colors = zip(samples[0::channels], samples[1::channels], samples[2::channels])
+            if channels == 3:
+                return list(colors)
+            return [pixel if a >= 128 else None for pixel, a in zip(colors, samples[3::4])]
+
     class Canvas:
         class mode:
             PIXEL = 0
             CP437 = 1
+            BRAILLE = 2  # a PIXEL buffer shown as 2x4 braille dots per cell
+
+        EMPTY = (0, 0, 0)  # unlit pixel
+        CELL_SIZE = {0: (1, 2), 2: (2, 4)}  # pixels per cell of the pixel modes
 
         def __init__(self, width, height, render_mode=0, fg=(255, 255, 255), bg=(0, 0, 0)):
             self.width = width
@@ -1822,19 +5543,12 @@ class ezUI:
                 self.buffer[y][x] = color
 
         def clear(self, fg=(255, 255, 255), bg=(0, 0, 0)):
-            temp_fg = self.color_fg
-            temp_bg = self.color_bg
-            self.color_fg = fg
-            self.color_bg = bg
-            for x in range(self.width):
-                for y in range(self.height):
-                    if self.render_mode == self.mode.CP437:
-                        self.draw_char(x,y,' ')
-                    else:
-                        self.buffer = [[(0, 0, 0) for _ in range(self.width)] for _ in range(self.height)]
-
-            self.color_fg = temp_fg
-            self.color_bg = temp_bg
+            # cells are immutable tuples, so one blank can fill every row
+            if self.render_mode == self.mode.CP437:
+                blank = (" ", fg, bg)
+            else:
+                blank = ezUI.Canvas.EMPTY
+            self.buffer = [[blank] * self.width for _ in range(self.height)]
             
         def setColorFG(self, r, g=None, b=None):
             if isinstance(r, tuple) and len(r) == 3:
@@ -1889,14 +5603,32 @@ class ezUI:
             self.line(x, y1, x, y2)
 
         def line(self, x1, y1, x2, y2):
-            for (x, y) in self.calculate_line(x1, y1, x2, y2):
-                self.set(x, y, self.color_fg)
+            ezUI.Rasterizer.line(self, x1, y1, x2, y2, self.color_fg)
 
         def box(self, x1, y1, x2, y2):
-            self.hline(x1, x2, y1)
-            self.hline(x1, x2, y2)
-            self.vline(x1, y1, y2)
-            self.vline(x2, y1, y2)
+            ezUI.Rasterizer.rect(self, x1, y1, x2, y2, self.color_fg, fill=False)
+
+        # Pixel mode shapes in the foreground colour, see ezUI.Rasterizer
+        def fillrect(self, x1, y1, x2, y2):
+            ezUI.Rasterizer.rect(self, x1, y1, x2, y2, self.color_fg)
+
+        def draw_points(self, points):
+            ezUI.Rasterizer.points(self, points, self.color_fg)
+
+        def draw_polyline(self, points, closed=False):
+            ezUI.Rasterizer.polyline(self, points, self.color_fg, closed)
+
+        def polygon(self, points, fill=True):
+            if fill:
+                ezUI.Rasterizer.polygon(self, points, self.color_fg)
+            else:
+                ezUI.Rasterizer.polyline(self, points, self.color_fg, closed=True)
+
+        def ellipse(self, x1, y1, x2, y2, fill=False):
+            ezUI.Rasterizer.ellipse(self, x1, y1, x2, y2, self.color_fg, fill)
+
+        def circle(self, cx, cy, r, fill=False):
+            ezUI.Rasterizer.ellipse(self, cx - r, cy - r, cx + r, cy + r, self.color_fg, fill)
 
         def fillbox(self, x1, y1, x2, y2, ch=' '):
             for y in range(y1, y2 + 1):
@@ -1928,11 +5660,40 @@ class ezUI:
                 return 1
 
         def flush(self, target, start_x=0, start_y=0, clip_x1=None, clip_y1=None, clip_x2=None, clip_y2=None):
+            # start_x/start_y are in this canvas' units for a canvas target, in cells for the screen.
+            # The clip rectangle is in this canvas' units.
             clip = all(v is not None for v in (clip_x1, clip_y1, clip_x2, clip_y2))
             offset_x = clip_x1 if clip else 0
             offset_y = clip_y1 if clip else 0
 
-            if type(target) is type(self):
+            if self.render_mode != self.mode.CP437 and (type(target) is not type(self) or target.render_mode == self.mode.CP437):
+                rows = self.cells(clip_x1, clip_y1, clip_x2, clip_y2) if clip else self.cells()
+                if type(target) is type(self):
+                    cell_w, cell_h = self.CELL_SIZE[self.render_mode]
+                    col, row = start_x // cell_w, start_y // cell_h
+                    for cells in rows:
+                        if 0 <= row < target.height:
+                            skip = max(0, -col)
+                            cells = cells[skip:max(skip, target.width - col)]
+                            target.buffer[row][col + skip:col + skip + len(cells)] = cells
+                        row += 1
+                else:
+                    for row, cells in enumerate(rows):
+                        self._write_cells(target, start_y + row, start_x, cells)
+                return
+
+            if type(target) is type(self) and self.render_mode == target.render_mode:
+                # row slices, cut to the clip rectangle and to the target
+                x1 = max(0, clip_x1 if clip else 0, offset_x - start_x)
+                x2 = min(self.width, clip_x2 if clip else self.width, target.width - start_x + offset_x)
+                y1 = max(0, clip_y1 if clip else 0, offset_y - start_y)
+                y2 = min(self.height, clip_y2 if clip else self.height, target.height - start_y + offset_y)
+                dst_x = start_x + x1 - offset_x
+                if x1 < x2:
+                    for y in range(y1, y2):
+                        target.buffer[start_y + y - offset_y][dst_x:dst_x + x2 - x1] = self.buffer[y][x1:x2]
+
+            elif type(target) is type(self):
                 for y in range(self.height):
                     if clip and not (clip_y1 <= y < clip_y2):
                         continue
@@ -1946,90 +5707,116 @@ class ezUI:
                             if 0 <= dst_y < len(target.buffer) and 0 <= dst_x < len(target.buffer[0]):
                                 target.buffer[dst_y][dst_x] = self.buffer[y][x]
 
-                        elif self.render_mode == self.mode.PIXEL and target.render_mode == self.mode.CP437:
-                            if y % 2 == 0 and y + 1 < self.height:
-                                top = self.buffer[y][x]
-                                bottom = self.buffer[y + 1][x]
-                                ch = ' '
-                                fg, bg = (255, 255, 255), (0, 0, 0)
-                                if top == bottom and top != (0, 0, 0):
-                                    ch = '█'
-                                    fg = top
-                                    bg = top
-                                elif top != (0, 0, 0) and bottom != (0, 0, 0):
-                                    ch = '█'
-                                    fg = top
-                                    bg = bottom
-                                elif top != (0, 0, 0):
-                                    ch = '▀'
-                                    fg = top
-                                    bg = (0, 0, 0)
-                                elif bottom != (0, 0, 0):
-                                    ch = '▄'
-                                    fg = (0, 0, 0)
-                                    bg = bottom
-                                target.buffer[dst_y // 2][dst_x] = (ch, fg, bg)
-
                         elif self.render_mode == self.mode.CP437 and target.render_mode == self.mode.PIXEL:
                             ch, fg, bg = self.buffer[y][x]
                             target.draw_cp437_char_to_pixel(dst_x, dst_y, ch, fg, bg)
 
             else:
                 stdscr = target
-                if self.render_mode == self.mode.CP437:
-                    for y in range(self.height):
-                        if clip and not (clip_y1 <= y < clip_y2):
+                for y in range(self.height):
+                    if clip and not (clip_y1 <= y < clip_y2):
+                        continue
+                    for x in range(self.width):
+                        if clip and not (clip_x1 <= x < clip_x2):
                             continue
-                        for x in range(self.width):
-                            if clip and not (clip_x1 <= x < clip_x2):
-                                continue
-                            ch, fg, bg = self.buffer[y][x]
-                            pair_id = self.get_color_pair(stdscr, fg, bg)
-                            try:
-                                stdscr.attron(cu.color_pair(pair_id))
-                                stdscr.addch(start_y + (y - offset_y), start_x + (x - offset_x), ch)
-                                stdscr.attroff(cu.color_pair(pair_id))
-                            except cu.error:
-                                pass
-                else:
-                    rows = self.height // 2
-                    for row in range(rows):
-                        for col in range(self.width):
-                            y_screen = start_y + row
-                            x_screen = start_x + col
-                            if clip and not (clip_y1 <= row * 2 < clip_y2 and clip_x1 <= col < clip_x2):
-                                continue
-                            top = self.buffer[row * 2][col]
-                            bottom = self.buffer[row * 2 + 1][col] if (row * 2 + 1) < self.height else (0, 0, 0)
-
-                            if top == bottom and top != (0, 0, 0):
-                                ch = '█'
-                                fg = top
-                                bg = top
-                            elif top != (0, 0, 0) and bottom != (0, 0, 0):
-                                ch = '█'
-                                fg = top
-                                bg = bottom
-                            elif top != (0, 0, 0):
-                                ch = '▀'
-                                fg = top
-                                bg = (0, 0, 0)
-                            elif bottom != (0, 0, 0):
-                                ch = '▄'
-                                fg = (0, 0, 0)
-                                bg = bottom
-                            else:
-                                ch = ' '
-                                fg = (255, 255, 255)
-                                bg = (0, 0, 0)
+                        ch, fg, bg = self.buffer[y][x]
+                        pair_id = self.get_color_pair(stdscr, fg, bg)
+                        try:
+                            stdscr.attron(cu.color_pair(pair_id))
+                            stdscr.addch(start_y + (y - offset_y), start_x + (x - offset_x), ch)
+                            stdscr.attroff(cu.color_pair(pair_id))
+                        except cu.error:
+                            pass
+
+        def cells(self, x1=0, y1=0, x2=None, y2=None):
+            # Pixel modes: the pixel rectangle as rows of (ch, fg, bg) cells, 1x2 pixels per half block
+            # (PIXEL) or 2x4 per braille character (BRAILLE). Rows are sliced and zipped into pixel groups
+            # and every group is looked up in a cache, so there is no Python code per pixel.
+            cell_w, cell_h = self.CELL_SIZE[self.render_mode]
+            x2 = self.width if x2 is None else min(x2, self.width)
+            y2 = self.height if y2 is None else min(y2, self.height)
+            x1 = max(0, x1 - x1 % cell_w)
+            y1 = max(0, y1 - y1 % cell_h)
+            buffer = self.buffer
+            empty = ezUI.Canvas.EMPTY
+            pad = [empty] * ((x1 - x2) % cell_w)  # completes a last, partial cell
+            blank = [empty] * (x2 - x1) + pad
+            rows = []
+            if self.render_mode == self.mode.PIXEL:
+                get = ezUI.Canvas._half_cells.__getitem__
+                for y in range(y1, y2, 2):
+                    top = buffer[y][x1:x2]
+                    bottom = buffer[y + 1][x1:x2] if y + 1 < self.height else blank
+                    rows.append(list(map(get, zip(top, bottom))))
+            else:
+                get = ezUI.Canvas._braille_cells.__getitem__
+                for y in range(y1, y2, 4):
+                    lines = [buffer[y + i][x1:x2] + pad if y + i < self.height else blank for i in range(4)]
+                    a, b, c, d = lines
+                    rows.append(list(map(get, zip(a[0::2], a[1::2], b[0::2], b[1::2],
+                                                  c[0::2], c[1::2], d[0::2], d[1::2]))))
+            return rows
 
-                            pair_id = self.get_color_pair(stdscr, fg, bg)
-                            try:
-                                stdscr.attron(cu.color_pair(pair_id))
-                                stdscr.addch(y_screen, x_screen, ch)
-                                stdscr.attroff(cu.color_pair(pair_id))
-                            except cu.error:
-                                pass
+        @staticmethod
+        def half_cell(pixels):
+            top, bottom = pixels
+            empty = ezUI.Canvas.EMPTY
+            if top == bottom and top != empty:
+                return ('█', top, top)
+            elif top != empty and bottom != empty:
+                return ('█', top, bottom)
+            elif top != empty:
+                return ('▀', top, empty)
+            elif bottom != empty:
+                return ('▄', empty, bottom)
+            return (' ', (255, 255, 255), empty)
+
+        # dot bits in the order braille_cell gets the pixels: left, right of each of the 4 rows
+        BRAILLE_BITS = (0x01, 0x08, 0x02, 0x10, 0x04, 0x20, 0x40, 0x80)
+
+        @staticmethod
+        def braille_cell(pixels):
+            # One colour per character, the first lit dot's
+            empty = ezUI.Canvas.EMPTY
+            bits = 0
+            fg = None
+            for bit, color in zip(ezUI.Canvas.BRAILLE_BITS, pixels):
+                if color != empty:
+                    bits |= bit
+                    if fg is None:
+                        fg = color
+            if not bits:
+                return (' ', (255, 255, 255), empty)
+            return (chr(0x2800 + bits), fg, empty)
+
+        class CellCache(dict):
+            # pixel group -> cell, filled on first use. Drawings use few colours, so this stays
+            # small; it starts over if it ever gets big.
+            __slots__ = ("convert",)
+            LIMIT = 65536
+
+            def __init__(self, convert):
+                super().__init__()
+                self.convert = convert
+
+            def __missing__(self, pixels):
+                if len(self) >= self.LIMIT:
+                    self.clear()
+                cell = self[pixels] = self.convert(pixels)
+                return cell
+
+        _half_cells = CellCache(half_cell.__func__)
+        _braille_cells = CellCache(braille_cell.__func__)
+
+        def _write_cells(self, stdscr, y, x, cells):
+            # One addstr per run of cells with the same colours
+            for (fg, bg), run in groupby(cells, key=itemgetter(1, 2)):
+                text = "".join(cell[0] for cell in run)
+                try:
+                    stdscr.addstr(y, x, text, cu.color_pair(self.get_color_pair(stdscr, fg, bg)))
+                except cu.error:
+                    pass  # off screen, or the bottom-right corner
+                x += len(text)
 
         def show_cursor(self):
             sys.stdout.write("\033[?25h")
@@ -2062,18 +5849,95 @@ class ezUI:
     def start_ui(root, data_model, mode=0, options=None, user_function=None, user_loop=None):
         options = options or ezUI.Options()
         if mode == ezUI.mode.GUI:
-            ezUI.GUI(root, data_model, options, user_function)
+            ezUI.GUI(root, data_model, options, user_function, user_loop)
+        elif mode == ezUI.mode.TUI:
+            ezUI.require("cu")
+            if cu is None:
+                raise RuntimeError("TUI mode not available on Windows. Install windows-curses or use GUI mode.")
+            tui = ezUI.TUI(root, data_model, options, user_function, user_loop)
+        else:
+            raise ValueError("Unknown mode: use ezUI.mode.GUI or ezUI.mode.TUI")
+
+    # TUI for many clients at once, see TUI.Server. template is an ezUI.Template, a markup file or a
+    # function returning a new root element, every client gets its own tree made from it.
+    @staticmethod
+    def serve_ui(template, data_model, options=None, host="127.0.0.1", port=8023, user_function=None, user_loop=None):
+        options = options or ezUI.Options()
+        ezUI.require("cu")
+        if cu is None:
+            raise RuntimeError("TUI mode not available on Windows. Install windows-curses or use GUI mode.")
+        server = ezUI.TUI.Server(template, data_model, options, host, port, user_function, user_loop)
+        print("Serving on {}:{}".format(*server.address[:2]))
+        server.run()
+
+    # Element tree from a markup file, see ezUI.Template
+    @staticmethod
+    def load(path):
+        return ezUI.Template.load(path).instantiate()
+
+    # Asyncio entry point, await it from your own event loop:
+    #   asyncio.run(ezUI.start_ui_async(root, data, mode=ezUI.mode.TUI))
+    @staticmethod
+    async def start_ui_async(root, data_model, mode=0, options=None, user_function=None, user_loop=None):
+        options = options or ezUI.Options()
+        if mode == ezUI.mode.GUI:
+            ui = ezUI.GUI(root, data_model, options, user_function, user_loop, autorun=False)
         elif mode == ezUI.mode.TUI:
+            ezUI.require("cu")
             if cu is None:
                 raise RuntimeError("TUI mode not available on Windows. Install windows-curses or use GUI mode.")
-            tui = ezUI.TUI(root, data_model, options, user_function)
+            ui = ezUI.TUI(root, data_model, options, user_function, user_loop, autorun=False)
         else:
             raise ValueError("Unknown mode: use ezUI.mode.GUI or ezUI.mode.TUI")
+
+        ezUI.require("asyncio")
+        ui.app.loop = asyncio.get_running_loop()
+        try:
+            await ui.run_async()
+        finally:
+            for task in list(ui.app.tasks):
+                task.cancel()
+        return ui
             
 if __name__ == "__main__":
     import sys
     if "--version" in sys.argv:
         print("Version: {}".format(ezUI.VERSION))
         sys.exit(0)
+
+    if "--bench" in sys.argv:
+        # Startup budget: python ezUI.py --bench [gui]
+        # import time in fresh interpreters, then time from start_ui to the first frame on screen
+        import subprocess
+        here = os.path.dirname(os.path.abspath(__file__))
+        code = ("import sys, time; t = time.perf_counter(); import ezUI; t = time.perf_counter() - t; "
+                "print(t, sum(m in sys.modules for m in ('tkinter', 'curses', 'asyncio')))")
+        runs = sorted(subprocess.check_output([sys.executable, "-c", code], cwd=here).split() for _ in range(7))
+        print("import: {:.1f} ms (median of 7), backends loaded: {}".format(float(runs[3][0]) * 1000, int(runs[3][1])))
+
+        root = ezUI.Element("window")
+        frame = ezUI.Element("frame")
+        for i in range(20):
+            frame.add_child(ezUI.Element("label", {"text": "Label {}".format(i), "pack": "top"}))
+        frame.add_child(ezUI.Element("entry", {"ezBind": "(text)", "pack": "top"}))
+        frame.add_child(ezUI.Element("optionmenu", {"name": "menu", "ezBind": "menu", "pack": "top"}))
+        root.add_child(frame)
+        data = ezUI.DataModel()
+        data.bind("text", "hello")
+        data.bind("menu", {"options": {"Option {}".format(i): True for i in range(50)}, "selected_index": 0})
+        stats = {}
+
+        def bench_loop(system, data):
+            stats.update(system.frame_stats())
+            if "first_paint_ms" in stats:
+                system.exit()
+
+        mode = ezUI.mode.GUI if "gui" in sys.argv else ezUI.mode.TUI
+        try:
+            ezUI.start_ui(root, data, mode, user_loop=bench_loop)
+        except SystemExit:
+            pass  # system.exit()
+        print("first frame: {} ms".format(stats.get("first_paint_ms")))
+        sys.exit(0)
     
     print("This module is meant to be imported, not run directly.")
@@ -48,10 +48,82 @@ def test_ui(mode):
 
     ezUI.start_ui(root_element, data_model, mode=mode, options=options, user_function=user_func)
 
+def test_relayout():
+    # TUI regression check: the same element changed on several frames in a row has to show every change
+    root_element = ezUI.Element("window")
+    frame = ezUI.Element("frame")
+    frame.add_child(ezUI.Element("label", {"text": "First", "pack": "top"}))
+    second = ezUI.Element("label", {"text": "Second", "pack": "top"})
+    frame.add_child(second)
+    root_element.add_child(frame)
+
+    steps = [
+        (lambda: second.set("visibility", "collapsed"), "Second", False),
+        (lambda: second.set("visibility", "visible"), "Second", True),
+        (lambda: second.set("text", "Changed once"), "Changed once", True),
+        (lambda: second.set("text", "Changed twice"), "Changed twice", True),
+    ]
+    done = []
+    failures = []
+
+    def user_loop(system, data):
+        if done:
+            _, text, shown = steps[len(done) - 1]
+            screen = "\n".join("".join(cell[0] for cell in row) for row in system.app.backend.canvas.buffer)
+            if (text in screen) != shown:
+                failures.append("{!r} {}".format(text, "missing" if shown else "still shown"))
+        if len(done) == len(steps):
+            system.exit()
+        steps[len(done)][0]()
+        done.append(True)
+
+    try:
+        ezUI.start_ui(root_element, ezUI.DataModel(), mode=ezUI.mode.TUI, user_loop=user_loop)
+    except SystemExit:
+        pass  # system.exit()
+    print("relayout: " + ("; ".join(failures) if failures else "ok"))
+    return not failures
+
+def test_cancel():
+    # Executor check: a thread job that a newer job for the same element took over has to see cancelled()
+    import threading
+    import time
+    data_model = ezUI.DataModel()
+    app = ezUI.UIApp(ezUI.Element("window"), data_model, ezUI.Options())
+    button = ezUI.Element("button", {"ezAsync": "true", "ezResult": "(result)"})
+    started = threading.Event()
+    seen = []
+
+    def slow_handler(element, system, data):
+        started.set()
+        for _ in range(200):
+            if system.cancelled(element):
+                seen.append("cancelled")
+                return "old"
+            time.sleep(0.005)
+        seen.append("not cancelled")
+        return "old"
+
+    app.call_handler(slow_handler, button)
+    started.wait()
+    app.call_handler(lambda element, system, data: "new", button)  # newest wins
+    while app.executor.busy() or not seen:
+        app.executor.pump()
+        time.sleep(0.01)
+    app.executor.shutdown()
+    ok = seen == ["cancelled"] and data_model.get("result") == "new"
+    print("cancel: " + ("ok" if ok else "old job saw {}, result {!r}".format(seen, data_model.get("result"))))
+    return ok
+
 if __name__ == "__main__":
     if "--tui" in sys.argv:
         test_ui(ezUI.mode.TUI)
     elif "--gui" in sys.argv:
         test_ui(ezUI.mode.GUI)
+    elif "--relayout" in sys.argv:
+        sys.exit(0 if test_relayout() else 1)
+    elif "--cancel" in sys.argv:
+        sys.exit(0 if test_cancel() else 1)
     else:
-        print("Please use uiTest.py --gui to test the GUI and uiTest.py --tui to test the TUI")
\ No newline at end of file
+        print("Please use uiTest.py --gui to test the GUI, uiTest.py --tui to test the TUI, uiTest.py --relayout to check "
+              "TUI relayouts and uiTest.py --cancel to check worker cancellation")
\ No newline at end of file